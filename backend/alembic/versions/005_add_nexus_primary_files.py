@@ -0,0 +1,38 @@
+"""Add nexus_primary_files table for cached export file resolution
+
+Revision ID: 005_add_nexus_primary_files
+Revises: 004_add_mod_build_phases
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "005_add_nexus_primary_files"
+down_revision = "004_add_mod_build_phases"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: only create if table doesn't exist
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = 'nexus_primary_files'"
+    ))
+    if result.scalar() is None:
+        op.create_table(
+            "nexus_primary_files",
+            sa.Column("game_domain", sa.String(50), primary_key=True),
+            sa.Column("nexus_mod_id", sa.Integer(), primary_key=True),
+            sa.Column("file_id", sa.Integer(), nullable=True),
+            sa.Column("file_name", sa.String(255), nullable=True),
+            sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+            sa.Column("resolved_at", sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("nexus_primary_files")
@@ -0,0 +1,91 @@
+"""Add local Nexus mod catalog with full-text and trigram indexes
+
+Revision ID: 006_add_nexus_catalog
+Revises: 005_add_nexus_primary_files
+Create Date: 2026-10-16
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "006_add_nexus_catalog"
+down_revision = "005_add_nexus_primary_files"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _table_exists(conn, name: str) -> bool:
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables WHERE table_name = :name"
+    ), {"name": name})
+    return result.scalar() is not None
+
+
+def _ensure_trigram(conn) -> bool:
+    """Create pg_trgm if this role may; managed databases often forbid it.
+
+    Runs in a savepoint so a refused CREATE EXTENSION doesn't abort the
+    rest of the migration. ModCatalog falls back to full-text search only.
+    """
+    try:
+        with conn.begin_nested():
+            conn.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except sa.exc.DBAPIError as e:
+        logger.warning("pg_trgm unavailable, skipping trigram index: %s", e.orig)
+    result = conn.execute(sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+    return result.scalar() is not None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: only create if table doesn't exist
+    if not _table_exists(conn, "nexus_catalog_mods"):
+        op.create_table(
+            "nexus_catalog_mods",
+            sa.Column("game_domain", sa.String(50), primary_key=True),
+            sa.Column("nexus_mod_id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("summary", sa.Text(), nullable=True),
+            sa.Column("author", sa.String(255), nullable=True),
+            sa.Column("version", sa.String(100), nullable=True),
+            sa.Column("endorsements", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("category", sa.String(100), nullable=True),
+            sa.Column("nexus_updated_at", sa.String(40), nullable=True),
+            sa.Column("indexed_at", sa.DateTime(), nullable=False),
+        )
+
+    if not _table_exists(conn, "nexus_catalog_state"):
+        op.create_table(
+            "nexus_catalog_state",
+            sa.Column("game_domain", sa.String(50), primary_key=True),
+            sa.Column("mod_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("high_water_updated_at", sa.String(40), nullable=True),
+            sa.Column("last_full_sync_at", sa.DateTime(), nullable=True),
+            sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+        )
+
+    # Indexes are created separately — the tables may already exist from
+    # Base.metadata.create_all, which doesn't know about these.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_nexus_catalog_mods_nexus_updated_at "
+        "ON nexus_catalog_mods (game_domain, nexus_updated_at)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_nexus_catalog_mods_fts ON nexus_catalog_mods "
+        "USING gin (to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(summary, '')))"
+    )
+    if _ensure_trigram(conn):
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_nexus_catalog_mods_name_trgm "
+            "ON nexus_catalog_mods USING gin (name gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("nexus_catalog_state")
+    op.drop_table("nexus_catalog_mods")
@@ -0,0 +1,53 @@
+"""Add depends_on to mod_build_phases for concurrent phase scheduling
+
+Revision ID: 007_add_phase_dependencies
+Revises: 006_add_nexus_catalog
+Create Date: 2026-10-17
+"""
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "007_add_phase_dependencies"
+down_revision = "006_add_nexus_catalog"
+branch_labels = None
+depends_on = None
+
+# Dependencies of the seeded phases (game slug -> phase_number -> depends_on).
+# Phases left out keep NULL, i.e. they run after the previous phase.
+_SEEDED_DEPENDENCIES = {
+    "skyrimse": {1: [], 2: [1], 3: [1], 4: [1], 5: [1], 6: [1], 7: [1, 2], 8: [1], 9: [1]},
+    "fallout4": {1: [], 2: [1], 3: [1], 4: [1, 3], 5: [1], 6: [1], 7: [1], 8: [1, 5]},
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: only add if column doesn't exist
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'mod_build_phases' AND column_name = 'depends_on'"
+    ))
+    if result.scalar() is None:
+        op.add_column(
+            "mod_build_phases",
+            sa.Column("depends_on", sa.JSON(), nullable=True),
+        )
+
+    # Backfill the seeded phases; rows someone already edited are left alone
+    for slug, phases in _SEEDED_DEPENDENCIES.items():
+        for phase_number, deps in phases.items():
+            conn.execute(sa.text("""
+                UPDATE mod_build_phases
+                SET depends_on = CAST(:deps AS json)
+                WHERE depends_on IS NULL
+                  AND phase_number = :phase_number
+                  AND game_id = (SELECT id FROM games WHERE slug = :slug)
+            """), {"deps": json.dumps(deps), "phase_number": phase_number, "slug": slug})
+
+
+def downgrade() -> None:
+    op.drop_column("mod_build_phases", "depends_on")
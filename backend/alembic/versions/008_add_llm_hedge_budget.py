@@ -0,0 +1,33 @@
+"""Add llm_hedge_budget to user_settings for hedged LLM requests
+
+Revision ID: 008_add_llm_hedge_budget
+Revises: 007_add_phase_dependencies
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "008_add_llm_hedge_budget"
+down_revision = "007_add_phase_dependencies"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: only add if column doesn't exist
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'user_settings' AND column_name = 'llm_hedge_budget'"
+    ))
+    if result.scalar() is None:
+        op.add_column(
+            "user_settings",
+            sa.Column("llm_hedge_budget", sa.Integer(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("user_settings", "llm_hedge_budget")
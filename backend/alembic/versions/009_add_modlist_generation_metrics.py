@@ -0,0 +1,33 @@
+"""Add generation_metrics to modlists for per-phase cost accounting
+
+Revision ID: 009_add_modlist_generation_metrics
+Revises: 008_add_llm_hedge_budget
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "009_add_modlist_generation_metrics"
+down_revision = "008_add_llm_hedge_budget"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: only add if column doesn't exist
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'modlists' AND column_name = 'generation_metrics'"
+    ))
+    if result.scalar() is None:
+        op.add_column(
+            "modlists",
+            sa.Column("generation_metrics", sa.JSON(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("modlists", "generation_metrics")
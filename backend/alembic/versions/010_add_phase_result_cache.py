@@ -0,0 +1,41 @@
+"""Add phase_result_cache table for warm-starting generation phases
+
+Revision ID: 010_add_phase_result_cache
+Revises: 009_add_modlist_generation_metrics
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010_add_phase_result_cache"
+down_revision = "009_add_modlist_generation_metrics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: only create if table doesn't exist
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = 'phase_result_cache'"
+    ))
+    if result.scalar() is None:
+        op.create_table(
+            "phase_result_cache",
+            sa.Column("cache_key", sa.String(64), primary_key=True),
+            sa.Column("game_id", sa.Integer(), nullable=False),
+            sa.Column("game_version", sa.String(50), nullable=False, server_default=""),
+            sa.Column("phase_number", sa.Integer(), nullable=False),
+            sa.Column("hardware_tier", sa.String(10), nullable=False),
+            sa.Column("playstyle_id", sa.Integer(), nullable=True),
+            sa.Column("output", sa.JSON(), nullable=False),
+            sa.Column("mod_updated_at", sa.JSON(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("phase_result_cache")
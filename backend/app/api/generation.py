@@ -4,6 +4,7 @@ POST /api/generation/start      — Start a new generation (background task)
 GET  /api/generation/{id}/events — SSE stream (replay + live events)
 GET  /api/generation/{id}/status — Quick polling endpoint
 POST /api/generation/{id}/resume — Resume a paused generation
+GET  /api/generation/diagnostics/providers — Shared LLM provider health
 """
 
 import asyncio
@@ -20,6 +21,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_current_user
 from app.api.modlist import save_modlist_to_db
 from app.database import async_session, get_db
+from app.llm.scoreboard import ProviderScoreboard
 from app.models.user import User
 from app.schemas.modlist import ModlistGenerateRequest
 from app.services.auth import decode_access_token
@@ -68,6 +70,7 @@ async def _run_generation_task(
     nexus_api_key: str | None = None,
     resume_from_phase: int | None = None,
     resume_session: GenerationSession | None = None,
+    hedge_budget: int | None = None,
 ) -> None:
     """Background task that runs the full generation pipeline.
 
@@ -86,6 +89,7 @@ async def _run_generation_task(
                 nexus_api_key=nexus_api_key,
                 resume_from_phase=resume_from_phase,
                 resume_session=resume_session,
+                hedge_budget=hedge_budget,
             )
 
             # Save modlist to DB
@@ -155,12 +159,25 @@ async def start_generation(
             request=request,
             user_id=str(current_user.id),
             nexus_api_key=nexus_key,
+            hedge_budget=current_user.settings.llm_hedge_budget,
         )
     )
 
     return GenerationStartResponse(generation_id=generation_id)
 
 
+@router.get("/diagnostics/providers")
+async def provider_diagnostics(
+    current_user: User = Depends(get_current_user),
+):
+    """Scoreboard of LLM provider health shared by all generations.
+
+    Per provider:model — EWMA latency and error rate, errors by type,
+    circuit breaker state and any rate-limit cooldown.
+    """
+    return {"providers": ProviderScoreboard.get_instance().snapshot()}
+
+
 @router.get("/{generation_id}/log")
 async def download_generation_log(
     generation_id: str,
@@ -361,6 +378,7 @@ async def resume_generation(
             nexus_api_key=nexus_key,
             resume_from_phase=phase_number,
             resume_session=session,
+            hedge_budget=current_user.settings.llm_hedge_budget,
         )
     )
 
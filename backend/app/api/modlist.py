@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import uuid
 
@@ -22,6 +21,7 @@ from app.services.generation import (
     generate_modlist as run_generation, GenerationResult, is_version_compatible,
 )
 from app.services.nexus_client import NexusModsClient
+from app.services.primary_files import resolve_primary_files
 from app.api.deps import get_current_user, get_current_user_optional
 
 logger = logging.getLogger(__name__)
@@ -76,6 +76,7 @@ async def save_modlist_to_db(
         ram_gb=request.ram_gb,
         vram_mb=request.vram_mb,
         llm_provider=result.llm_provider,
+        generation_metrics=result.metrics,
         user_id=user_id,
     )
     db.add(modlist)
@@ -322,7 +323,8 @@ async def export_modlist(
     """Export modlist for MO2 plugin with optional file_id resolution.
 
     If nexus_api_key is provided, resolves the primary file_id for each
-    mod via the Nexus Mods API. Otherwise, entries are returned without
+    mod via the Nexus Mods API (batched, and cached per mod in the
+    nexus_primary_files table). Otherwise, entries are returned without
     file_ids — the plugin can resolve them locally.
     """
     try:
@@ -345,26 +347,13 @@ async def export_modlist(
     )
     db_entries = entry_result.scalars().all()
 
-    # Optionally resolve file_ids via Nexus API
+    # Optionally resolve file_ids via Nexus API (cached in nexus_primary_files)
     file_id_map: dict[int, int | None] = {}
     if nexus_api_key:
-        client = NexusModsClient(nexus_api_key)
-
-        async def resolve_file_id(nexus_mod_id: int) -> tuple[int, int | None]:
-            try:
-                files = await client.get_mod_files(game.nexus_domain, nexus_mod_id)
-                if files:
-                    primary = next((f for f in files if f.get("isPrimary")), files[0])
-                    return nexus_mod_id, primary.get("fileId")
-            except Exception:
-                logger.warning(f"Failed to resolve file_id for mod {nexus_mod_id}")
-            return nexus_mod_id, None
-
         nexus_ids = [e.nexus_mod_id for e in db_entries if e.nexus_mod_id]
-        results = await asyncio.gather(
-            *(resolve_file_id(mid) for mid in nexus_ids)
+        file_id_map = await resolve_primary_files(
+            db, NexusModsClient(nexus_api_key), game.nexus_domain, nexus_ids,
         )
-        file_id_map = dict(results)
 
     entries = [
         ExportModEntry(
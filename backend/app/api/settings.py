@@ -5,7 +5,7 @@ from collections import defaultdict
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -13,6 +13,7 @@ from app.llm.registry import get_public_registry
 from app.models.user import User
 from app.models.user_settings import UserSettings
 from app.api.deps import get_current_user
+from app.services.nexus_cache import KeyValidationCache
 from app.services.nexus_client import NexusModsClient
 
 logger = logging.getLogger(__name__)
@@ -34,6 +35,7 @@ class AppSettings(BaseModel):
     email_alerts: bool = True
     mod_recommendations: bool = True
     compat_warnings: bool = True
+    llm_hedge_budget: Optional[int] = None
 
     model_config = {"from_attributes": True}
 
@@ -44,6 +46,7 @@ class AppSettingsUpdate(BaseModel):
     email_alerts: Optional[bool] = None
     mod_recommendations: Optional[bool] = None
     compat_warnings: Optional[bool] = None
+    llm_hedge_budget: Optional[int] = Field(default=None, ge=0, le=50)
 
 
 async def _get_or_create_settings(
@@ -159,7 +162,8 @@ async def validate_nexus_key(
 
     try:
         client = NexusModsClient(api_key=nexus_key)
-        user_info = await client.validate_key()
+        # Explicit check from the settings page — always hit Nexus
+        user_info = await client.validate_key(use_cache=False)
         return {
             "valid": True,
             "username": user_info.get("name"),
@@ -199,8 +203,14 @@ async def update_settings(
 
     # Nexus API key → dedicated DB column
     if "nexus_api_key" in provided:
+        if provided["nexus_api_key"] != settings_row.nexus_api_key:
+            KeyValidationCache.get_instance().invalidate(settings_row.nexus_api_key)
         settings_row.nexus_api_key = provided["nexus_api_key"]
 
+    # Hedged LLM requests per generation → dedicated DB column
+    if "llm_hedge_budget" in provided:
+        settings_row.llm_hedge_budget = provided["llm_hedge_budget"]
+
     # Notification prefs → merge into JSON column (only overwrite provided fields)
     notif_update = {k: v for k, v in provided.items() if k in _NOTIF_FIELDS}
     if notif_update:
@@ -0,0 +1,10 @@
+"""Offline record/replay benchmarking of the generation pipeline."""
+
+from .cassette import Cassette, CassetteMiss, CassetteProvider, CassetteTransport
+
+__all__ = [
+    "Cassette",
+    "CassetteMiss",
+    "CassetteProvider",
+    "CassetteTransport",
+]
@@ -0,0 +1,243 @@
+"""Record/replay cassettes for LLM providers and the Nexus API.
+
+In record mode, CassetteProvider wraps a real LLMProvider and
+CassetteTransport wraps a real httpx transport. Each request/response pair
+is captured with how long it took. In replay mode, both serve those pairs
+without a network connection. An optional `latency_scale` replays the
+recorded timings (1.0 = as recorded, 0 = instant).
+
+Requests are matched on their content: the full message list plus tools
+for an LLM turn, and the method, URL and body for Nexus. Request headers,
+including API keys, are never written. Tool results are replayed
+deterministically, so a replayed generation sends the same LLM requests
+it recorded, whatever order concurrent phases finish in. Identical
+requests are served in the order they were recorded. The cassette's
+meta records when it was made ("recorded_at"), so anything time-dependent
+(search ranking by recency) can be replayed as of that moment.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Literal
+
+import httpx
+
+from app.llm.provider import LLMProvider, ToolCallRunner
+
+logger = logging.getLogger(__name__)
+
+Mode = Literal["record", "replay"]
+
+# Response headers that no longer apply to the decoded body we store
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class CassetteMiss(RuntimeError):
+    """Replay found no recorded response for a request."""
+
+
+def request_key(data: Any) -> str:
+    """Stable hash of a JSON-able request."""
+    raw = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """Recorded interactions for one benchmark scenario, stored as JSON."""
+
+    def __init__(self, path: str | Path, mode: Mode):
+        self.path = Path(path)
+        self.mode = mode
+        self.meta: dict = {}
+        self._entries: dict[str, dict[str, list[dict]]] = {"llm": {}, "nexus": {}}
+        self._cursors: dict[tuple[str, str], int] = {}
+        self.misses: dict[str, int] = {"llm": 0, "nexus": 0}
+        if mode == "replay":
+            data = json.loads(self.path.read_text())
+            self.meta = data.get("meta", {})
+            for kind in self._entries:
+                self._entries[kind] = data.get(kind, {})
+
+    def record(self, kind: str, key: str, entry: dict) -> None:
+        self._entries[kind].setdefault(key, []).append(entry)
+
+    def next(self, kind: str, key: str) -> dict | None:
+        """Next recorded entry for a request (the last one repeats)."""
+        entries = self._entries[kind].get(key)
+        if not entries:
+            self.misses[kind] += 1
+            return None
+        index = self._cursors.get((kind, key), 0)
+        self._cursors[(kind, key)] = index + 1
+        return entries[min(index, len(entries) - 1)]
+
+    def count(self, kind: str) -> int:
+        return sum(len(entries) for entries in self._entries[kind].values())
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"meta": self.meta, **self._entries}, indent=1, sort_keys=True))
+        logger.info("Saved cassette %s (%d LLM, %d Nexus interactions)",
+                    self.path, self.count("llm"), self.count("nexus"))
+
+
+def _tool_args(arguments: str) -> dict:
+    try:
+        args = json.loads(arguments or "{}")
+    except (TypeError, ValueError):
+        return {}
+    return args if isinstance(args, dict) else {}
+
+
+class CassetteProvider(LLMProvider):
+    """Records `inner`'s turns, or replays them when there is no inner provider."""
+
+    def __init__(self, cassette: Cassette, inner: LLMProvider | None = None, latency_scale: float = 0.0):
+        if cassette.mode == "record" and inner is None:
+            raise ValueError("Recording needs a real provider to wrap")
+        self.cassette = cassette
+        self.inner = inner
+        self.latency_scale = latency_scale
+        self.provider_id = inner.provider_id if inner is not None else "cassette"
+
+    def get_model_name(self) -> str:
+        if self.inner is not None:
+            return self.inner.get_model_name()
+        return self.cassette.meta.get("model", "cassette")
+
+    async def _replay(self, key: str) -> dict:
+        entry = self.cassette.next("llm", key)
+        if entry is None:
+            raise CassetteMiss(f"No recorded LLM response for request {key[:12]}")
+        if self.latency_scale > 0:
+            await asyncio.sleep(entry["seconds"] * self.latency_scale)
+        return entry
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        key = request_key({"system": system_prompt, "user": user_prompt})
+        if self.inner is None:
+            return (await self._replay(key))["response"]
+        started = time.monotonic()
+        text = await self.inner.generate(system_prompt, user_prompt)
+        self.cassette.record("llm", key, {
+            "model": self.inner.get_model_name(),
+            "seconds": round(time.monotonic() - started, 3),
+            "response": text,
+        })
+        return text
+
+    async def complete_turn(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        runner: ToolCallRunner,
+        on_text: Callable[[str], None] | None = None,
+        on_usage: Callable[[dict], None] | None = None,
+        tool_choice: dict | None = None,
+    ) -> dict[str, Any]:
+        request = {"messages": messages, "tools": tools}
+        if tool_choice:
+            request["tool_choice"] = tool_choice
+        key = request_key(request)
+
+        if self.inner is None:
+            entry = await self._replay(key)
+            for text in entry.get("text", []):
+                if on_text:
+                    on_text(text)
+            for usage in entry.get("usage", []):
+                if on_usage:
+                    on_usage(dict(usage))
+            response = copy.deepcopy(entry["response"])
+            for tc in response.get("tool_calls") or []:
+                runner.submit(tc["function"]["name"], _tool_args(tc["function"]["arguments"]))
+            return response
+
+        texts: list[str] = []
+        usages: list[dict] = []
+
+        def tee_text(text: str) -> None:
+            texts.append(text)
+            if on_text:
+                on_text(text)
+
+        def tee_usage(usage: dict) -> None:
+            usages.append(dict(usage))
+            if on_usage:
+                on_usage(usage)
+
+        started = time.monotonic()
+        response = await self.inner.complete_turn(messages, tools, runner, tee_text, tee_usage, tool_choice)
+        self.cassette.record("llm", key, {
+            "model": self.inner.get_model_name(),
+            "seconds": round(time.monotonic() - started, 3),
+            "response": copy.deepcopy(response),
+            "text": texts,
+            "usage": usages,
+        })
+        self.cassette.meta.setdefault("model", self.inner.get_model_name())
+        return response
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records through `inner`, or replays without it."""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        inner: httpx.AsyncBaseTransport | None = None,
+        latency_scale: float = 0.0,
+    ):
+        if cassette.mode == "record" and inner is None:
+            inner = httpx.AsyncHTTPTransport()
+        self.cassette = cassette
+        self.inner = inner
+        self.latency_scale = latency_scale
+
+    @staticmethod
+    def _key(request: httpx.Request) -> str:
+        body: Any = request.content.decode("utf-8", errors="replace")
+        try:
+            body = json.loads(body) if body else None
+        except ValueError:
+            pass
+        return request_key({"method": request.method, "url": str(request.url), "body": body})
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        key = self._key(request)
+
+        if self.cassette.mode == "replay":
+            entry = self.cassette.next("nexus", key)
+            if entry is None:
+                logger.warning("Cassette miss: %s %s", request.method, request.url)
+                return httpx.Response(404, json={"errors": [{"message": "cassette miss"}]}, request=request)
+            if self.latency_scale > 0:
+                await asyncio.sleep(entry["seconds"] * self.latency_scale)
+            return httpx.Response(
+                entry["status"], headers=entry["headers"],
+                content=entry["body"].encode("utf-8"), request=request,
+            )
+
+        started = time.monotonic()
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+        self.cassette.record("nexus", key, {
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": headers,
+            "body": body.decode("utf-8", errors="replace"),
+            "seconds": round(time.monotonic() - started, 3),
+        })
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        if self.inner is not None:
+            await self.inner.aclose()
@@ -0,0 +1,234 @@
+"""Benchmark the generation pipeline against recorded cassettes.
+
+Record once against the real providers (needs network and API keys):
+
+    python -m app.benchmark.run_benchmark record --cassettes benchmarks/ \\
+        --llm-provider groq --llm-api-key $GROQ_KEY --nexus-api-key $NEXUS_KEY
+
+then replay as often as needed, offline and deterministically:
+
+    python -m app.benchmark.run_benchmark replay --cassettes benchmarks/ --repeat 3
+    python -m app.benchmark.run_benchmark replay --cassettes benchmarks/ --latency-scale 1.0
+
+Each scenario runs generate_modlist end to end on a canned request,
+against a throwaway in-memory database seeded with the standard game data.
+It reports wall time, iterations, LLM calls, tool calls and tokens.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.benchmark.cassette import Cassette, CassetteProvider, CassetteTransport
+from app.config import get_settings
+from app.database import Base
+from app.llm.provider import LLMProvider, LLMProviderFactory
+from app.models.game import Game
+from app.models.playstyle import Playstyle
+from app.schemas.modlist import ModlistGenerateRequest
+from app.seeds import run_seed
+from app.seeds.seed_data import (
+    FALLOUT4_BUILD_PHASES,
+    FALLOUT4_COMPATIBILITY,
+    FALLOUT4_MODS,
+    FALLOUT4_PLAYSTYLE_MODS,
+    SKYRIM_BUILD_PHASES,
+    SKYRIM_COMPATIBILITY,
+    SKYRIM_MODS,
+    SKYRIM_PLAYSTYLE_MODS,
+)
+from app.services.generation import PauseGeneration, generate_modlist
+from app.services.nexus_cache import KeyValidationCache, NexusResponseCache, SingleFlight
+from app.services.nexus_pool import NexusClientPool
+from app.services.nexus_rate_limiter import NexusRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Canned requests: (game slug, playstyle slug, hardware/version fields)
+SCENARIOS: dict[str, tuple[str, str, dict]] = {
+    "skyrim": ("skyrimse", "vanilla-plus", {
+        "game_version": "SE", "gpu": "NVIDIA GeForce RTX 3070", "vram_mb": 8192,
+        "cpu": "AMD Ryzen 7 5800X", "ram_gb": 32, "cpu_cores": 8, "cpu_speed_ghz": 3.8,
+        "available_storage_gb": 200,
+    }),
+    "fallout4": ("fallout4", "vanilla-plus", {
+        "game_version": "Next-Gen", "gpu": "NVIDIA GeForce RTX 2060", "vram_mb": 6144,
+        "cpu": "Intel Core i5-10400", "ram_gb": 16, "cpu_cores": 6, "cpu_speed_ghz": 2.9,
+        "available_storage_gb": 120,
+    }),
+}
+
+_SEED_DATA = {
+    "skyrimse": ("skyrimspecialedition", SKYRIM_MODS, SKYRIM_COMPATIBILITY, SKYRIM_PLAYSTYLE_MODS, SKYRIM_BUILD_PHASES),
+    "fallout4": ("fallout4", FALLOUT4_MODS, FALLOUT4_COMPATIBILITY, FALLOUT4_PLAYSTYLE_MODS, FALLOUT4_BUILD_PHASES),
+}
+
+
+async def _seed(session: AsyncSession) -> None:
+    # The seed helpers report progress on stdout; keep the report clean
+    with contextlib.redirect_stdout(io.StringIO()):
+        game_map = await run_seed.seed_games(session)
+        ps_map = await run_seed.seed_playstyles(session, game_map)
+        for slug, (domain, mods, compatibility, playstyle_mods, phases) in _SEED_DATA.items():
+            mod_map = await run_seed.seed_mods(session, mods, domain)
+            await run_seed.seed_compatibility(session, compatibility, mod_map)
+            await run_seed.seed_playstyle_mods(session, playstyle_mods, ps_map.get(slug, {}), mod_map)
+            await run_seed.seed_build_phases(session, phases, game_map.get(slug))
+    await session.commit()
+
+
+@contextlib.contextmanager
+def _isolated_nexus(transport: CassetteTransport):
+    """Route Nexus traffic through the cassette with cold, private caches."""
+    settings = get_settings()
+    saved = (
+        NexusClientPool._instance, NexusResponseCache._instance, SingleFlight._instance,
+        KeyValidationCache._instance, dict(NexusRateLimiter._limiters), settings.nexus_catalog_enabled,
+    )
+    NexusClientPool._instance = NexusClientPool(transport=transport)
+    NexusResponseCache._instance = None
+    SingleFlight._instance = None
+    KeyValidationCache._instance = None
+    NexusRateLimiter._limiters.clear()
+    # The local catalog lives in the application database, not the benchmark's
+    settings.nexus_catalog_enabled = False
+    try:
+        yield
+    finally:
+        (
+            NexusClientPool._instance, NexusResponseCache._instance, SingleFlight._instance,
+            KeyValidationCache._instance, limiters, settings.nexus_catalog_enabled,
+        ) = saved
+        NexusRateLimiter._limiters.clear()
+        NexusRateLimiter._limiters.update(limiters)
+
+
+async def run_scenario(
+    name: str,
+    cassette: Cassette,
+    providers: list[LLMProvider],
+    nexus_api_key: str,
+    latency_scale: float = 0.0,
+) -> dict:
+    """Run one scenario end to end and return its report.
+
+    Search results are ranked against the cassette's recording time, so a
+    replay sends the same tool results whenever it runs.
+    """
+    game_slug, playstyle_slug, fields = SCENARIOS[name]
+    if cassette.mode == "record":
+        cassette.meta.setdefault("recorded_at", datetime.now(timezone.utc).isoformat())
+    recorded_at = cassette.meta.get("recorded_at")
+    now = datetime.fromisoformat(recorded_at) if recorded_at else None
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    transport = CassetteTransport(cassette, latency_scale=latency_scale)
+    events: list[dict] = []
+    report: dict = {"scenario": name, "mode": cassette.mode}
+    try:
+        async with session_factory() as db:
+            await _seed(db)
+            playstyle = (await db.execute(
+                select(Playstyle).join(Game)
+                .where(Game.slug == game_slug, Playstyle.slug == playstyle_slug)
+            )).scalar_one()
+            request = ModlistGenerateRequest(game_id=playstyle.game_id, playstyle_id=playstyle.id, **fields)
+
+            with _isolated_nexus(transport):
+                started = time.monotonic()
+                try:
+                    result = await generate_modlist(
+                        db, request, event_callback=events.append, nexus_api_key=nexus_api_key,
+                        hedge_budget=0, providers=providers, now=now,
+                    )
+                    report["status"] = "complete"
+                    report["mods"] = len(result.entries)
+                    report.update((result.metrics or {}).get("totals", {}))
+                except PauseGeneration as e:
+                    report["status"] = f"paused at phase {e.phase_number}: {e.reason}"
+                report["wall_seconds"] = round(time.monotonic() - started, 3)
+                # Cancelled lookahead searches may still be in flight; let them
+                # land so recordings don't depend on when the run ended
+                await SingleFlight.get_instance().drain()
+    finally:
+        await engine.dispose()
+
+    if "iterations" not in report:
+        # Paused runs: total what the completed phases reported
+        phases = [e for e in events if e["type"] == "phase_metrics"]
+        report["iterations"] = sum(p["iterations"] for p in phases)
+        report["llm_calls"] = sum(p["llm_calls"] for p in phases)
+    report["cassette_misses"] = dict(cassette.misses)
+    return report
+
+
+def _recording_providers(args: argparse.Namespace, cassette: Cassette) -> list[LLMProvider]:
+    inner = LLMProviderFactory.create_from_request(
+        args.llm_provider, args.llm_api_key, base_url=args.llm_base_url, model=args.llm_model,
+    )
+    return [CassetteProvider(cassette, inner)]
+
+
+async def main(argv: list[str] | None = None) -> list[dict]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--cassettes", default="benchmarks", help="Directory of <scenario>.json cassettes")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay runs per scenario")
+    parser.add_argument("--latency-scale", type=float, default=0.0,
+                        help="Replay recorded latencies scaled by this factor (0 = instant)")
+    parser.add_argument("--llm-provider", default=os.environ.get("BENCH_LLM_PROVIDER", "groq"))
+    parser.add_argument("--llm-api-key", default=os.environ.get("BENCH_LLM_API_KEY", ""))
+    parser.add_argument("--llm-base-url", default=os.environ.get("BENCH_LLM_BASE_URL"))
+    parser.add_argument("--llm-model", default=os.environ.get("BENCH_LLM_MODEL"))
+    parser.add_argument("--nexus-api-key", default=os.environ.get("NEXUS_API_KEY", ""))
+    args = parser.parse_args(argv)
+
+    reports: list[dict] = []
+    for name in args.scenario or sorted(SCENARIOS):
+        path = Path(args.cassettes) / f"{name}.json"
+        if args.mode == "record":
+            cassette = Cassette(path, "record")
+            cassette.meta = {"scenario": name}
+            report = await run_scenario(name, cassette, _recording_providers(args, cassette), args.nexus_api_key)
+            cassette.save()
+            reports.append(report)
+            continue
+
+        runs = []
+        for _ in range(max(1, args.repeat)):
+            cassette = Cassette(path, "replay")
+            provider = CassetteProvider(cassette, latency_scale=args.latency_scale)
+            runs.append(await run_scenario(name, cassette, [provider], "replay", args.latency_scale))
+        report = dict(runs[-1])
+        report["wall_seconds"] = statistics.median(r["wall_seconds"] for r in runs)
+        report["runs"] = len(runs)
+        reports.append(report)
+
+    for report in reports:
+        print(json.dumps(report, sort_keys=True))
+    return reports
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main())
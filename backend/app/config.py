@@ -15,6 +15,86 @@ class Settings(BaseSettings):
 
     # Nexus Mods
     nexus_api_key: str = ""
+    # Shared connection pool (one long-lived client per API key)
+    nexus_http2: bool = True
+    nexus_pool_max_connections: int = 20
+    nexus_pool_max_keepalive: int = 10
+    nexus_pool_keepalive_expiry: float = 30.0
+    nexus_pool_idle_seconds: int = 600
+    # Per-key rate limiting (shared by every client using the same key)
+    nexus_max_concurrency: int = 10
+    nexus_rate_per_second: float = 5.0
+    nexus_rate_burst: int = 10
+    nexus_rate_reserve: int = 50  # pace evenly to reset below this many remaining
+    # Successful key validations are reused for this long
+    nexus_validation_ttl_seconds: int = 300
+    # Shared search / mod-detail response cache
+    nexus_cache_max_bytes: int = 64 * 1024 * 1024
+    nexus_cache_ttl_seconds: int = 1800
+    nexus_cache_check_updated_at: bool = True
+    # Max aliased mod(...) selections per batched GraphQL request
+    nexus_batch_size: int = 20
+    # Local full-text mod catalog searched before live Nexus
+    nexus_catalog_enabled: bool = True
+    nexus_catalog_max_age_hours: int = 24
+    nexus_catalog_min_results: int = 1
+    nexus_catalog_page_size: int = 50
+    nexus_catalog_max_pages: int = 400
+    nexus_catalog_sync_interval_hours: int = 6
+    # Top search hits whose details are prefetched while the LLM thinks
+    nexus_prefetch_top_k: int = 3
+    # search_nexus results returned to the model after local ranking
+    nexus_search_top_n: int = 8
+    # Next-phase cache warming from search_guidance / example_mods
+    nexus_lookahead_max_queries: int = 8
+    nexus_lookahead_concurrency: int = 2
+    # Resolved primary files (modlist export) are revalidated after this long
+    nexus_primary_file_ttl_hours: int = 24
+
+    # LLM tool calling: max read-only tool calls from one turn run at once
+    llm_tool_concurrency: int = 4
+    # Tool-loop history: tool results are compacted once the model has
+    # responded to them this many times, and harder when over the budget
+    llm_history_keep_turns: int = 1
+    llm_history_token_budget: int = 24000
+    # Mark the static prompt prefix and tool schemas cacheable (Anthropic)
+    llm_prompt_caching: bool = True
+    # Stream responses: thinking text arrives incrementally and tool calls
+    # start as soon as their arguments are complete
+    llm_streaming: bool = True
+    # Build phases whose dependencies are met run concurrently, up to this many
+    llm_phase_concurrency: int = 3
+    # Discovery phases replay a stored result from an earlier generation with
+    # the same game, version, hardware tier (and playstyle, where it matters)
+    # while it is younger than this and none of its mods changed on Nexus
+    phase_cache_enabled: bool = True
+    phase_cache_ttl_hours: int = 72
+    # Express mode: predicted searches per phase and candidates shown to the
+    # model, which picks from them in a single call
+    express_max_queries: int = 6
+    express_candidate_limit: int = 25
+    # Hedged requests per generation when a slow turn is also sent to the
+    # next provider (0 = off); users can override this in their settings
+    llm_hedge_budget: int = 0
+    # Hedge after the primary's p95 turn latency, or this default until
+    # enough turns are recorded, but never sooner than the minimum
+    llm_hedge_default_delay_seconds: float = 10.0
+    llm_hedge_min_delay_seconds: float = 2.0
+    # Provider scoreboard (shared across generations): EWMA smoothing, the
+    # expected turn latency assumed for providers without samples, circuit
+    # breaker threshold/open period and the cooldown after a rate limit
+    llm_scoreboard_ewma_alpha: float = 0.3
+    llm_expected_latency_seconds: float = 10.0
+    llm_circuit_failure_threshold: int = 3
+    llm_circuit_open_seconds: float = 120.0
+    llm_rate_limit_cooldown_seconds: float = 30.0
+    # Shared LLM SDK clients per (provider, base URL, key): httpx pool
+    # limits, and when idle/surplus clients are closed
+    llm_pool_max_connections: int = 20
+    llm_pool_max_keepalive: int = 10
+    llm_pool_keepalive_expiry: float = 60.0
+    llm_pool_max_clients: int = 32
+    llm_pool_idle_seconds: int = 900
 
     # Custom Mod Source
     custom_source_api_url: str = ""
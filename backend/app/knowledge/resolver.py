@@ -8,6 +8,7 @@ import logging
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Literal
 
 logger = logging.getLogger(__name__)
 
@@ -145,12 +146,20 @@ def _get_game_methodology(game_slug: str) -> GameMethodology | None:
         return None
 
 
-def get_methodology_context(game_slug: str, phase_number: int) -> str:
+def get_methodology_context(
+    game_slug: str,
+    phase_number: int,
+    scope: Literal["all", "universal", "phase"] = "all",
+) -> str:
     """Return methodology text relevant to a specific game and phase.
 
     Args:
         game_slug: "skyrimse" or "fallout4"
         phase_number: The current phase number (1-based)
+        scope: "universal" returns only the principles and universal
+            sections (identical for every phase, so it can sit in a cached
+            prompt prefix), "phase" only the sections targeting this phase,
+            "all" both.
 
     Returns:
         A formatted string block to inject into the system prompt,
@@ -164,18 +173,23 @@ def get_methodology_context(game_slug: str, phase_number: int) -> str:
     relevant = [
         s
         for s in methodology.sections
-        if s.is_universal or phase_number in s.phases
+        if (s.is_universal and scope != "phase")
+        or (not s.is_universal and phase_number in s.phases and scope != "universal")
     ]
 
-    parts = [methodology.universal_principles]
+    parts = [] if scope == "phase" else [methodology.universal_principles]
 
     for section in relevant:
         parts.append(section.content)
 
+    if not parts:
+        return ""
+
     methodology_block = "\n\n".join(parts)
 
+    title = "PHASE METHODOLOGY" if scope == "phase" else "REFERENCE METHODOLOGY"
     return (
-        "\nREFERENCE METHODOLOGY (community best practices — "
+        f"\n{title} (community best practices — "
         "use this knowledge when selecting and evaluating mods):\n"
         f"{methodology_block}"
     )
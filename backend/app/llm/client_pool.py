@@ -0,0 +1,169 @@
+"""Process-wide cache of LLM SDK clients.
+
+Every generation and resume used to build a fresh AsyncOpenAI or
+AsyncAnthropic client, each with its own connection pool, so back-to-back
+generations paid for new TLS handshakes to the same provider. The pool
+hands out one client per (provider, base URL, API key), built on an
+explicitly configured httpx pool, and closes clients once they've been
+idle for `llm_pool_idle_seconds` and on application shutdown. When the
+cache exceeds `llm_pool_max_clients`, the least recently used clients
+leave the registry but are only closed once they too have gone idle: a
+generation may still be streaming a turn on them.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def client_key(kind: str, provider_id: str, base_url: str | None, api_key: str) -> str:
+    """Non-reversible cache key; raw API keys are never held as dict keys."""
+    raw = "\0".join((kind, provider_id, base_url or "", api_key))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMClientPool:
+    """Registry of shared SDK clients, bounded by size and idle time."""
+
+    _instance: "LLMClientPool | None" = None
+
+    def __init__(self):
+        self._clients: dict[str, Any] = {}
+        # Clients pushed out by the size cap, closed once idle
+        self._retiring: dict[str, Any] = {}
+        # Last use and running turns, for both registered and retiring clients
+        self._last_used: dict[str, float] = {}
+        self._in_use: dict[str, int] = {}
+        # Background closes of evicted clients; held so they aren't collected mid-close
+        self._closing: set[asyncio.Task] = set()
+
+    @classmethod
+    def get_instance(cls) -> "LLMClientPool":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _limits(self) -> httpx.Limits:
+        settings = get_settings()
+        return httpx.Limits(
+            max_connections=settings.llm_pool_max_connections,
+            max_keepalive_connections=settings.llm_pool_max_keepalive,
+            keepalive_expiry=settings.llm_pool_keepalive_expiry,
+        )
+
+    def openai(self, provider_id: str, base_url: str, api_key: str):
+        """Shared AsyncOpenAI client for an OpenAI-compatible endpoint."""
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        key = client_key("openai", provider_id, base_url, api_key)
+        return self._get(key, lambda: AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(limits=self._limits()),
+        )), key
+
+    def anthropic(self, provider_id: str, api_key: str):
+        """Shared AsyncAnthropic client."""
+        from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+        key = client_key("anthropic", provider_id, None, api_key)
+        return self._get(key, lambda: AsyncAnthropic(
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(limits=self._limits()),
+        )), key
+
+    def _get(self, key: str, build) -> Any:
+        self._evict(key)
+        client = self._clients.get(key)
+        if client is None and key in self._retiring:
+            client = self._clients[key] = self._retiring.pop(key)
+        if client is None or client.is_closed():
+            client = build()
+            self._clients[key] = client
+            logger.debug("Opened LLM client %s", key)
+        self._last_used[key] = time.monotonic()
+        return client
+
+    def touch(self, key: str) -> None:
+        """Mark a client as recently used."""
+        if key in self._last_used:
+            self._last_used[key] = time.monotonic()
+
+    @contextmanager
+    def in_use(self, key: str | None) -> Iterator[None]:
+        """Hold a client open for the duration of a model call."""
+        if key is None:
+            yield
+            return
+        self.touch(key)
+        self._in_use[key] = self._in_use.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            if self._in_use.get(key):
+                self._in_use[key] -= 1
+            self.touch(key)
+
+    def _is_idle(self, key: str, now: float) -> bool:
+        idle_seconds = get_settings().llm_pool_idle_seconds
+        return not self._in_use.get(key) and now - self._last_used.get(key, now) > idle_seconds
+
+    def _evict(self, wanted: str | None = None) -> None:
+        """Close idle clients, then retire the least recently used above the cap.
+
+        `wanted` is the key about to be handed out; it is never retired.
+        """
+        now = time.monotonic()
+        for key in [k for k in self._retiring if self._is_idle(k, now)]:
+            self._close_later(key, self._retiring.pop(key))
+        for key in [k for k in self._clients if self._is_idle(k, now)]:
+            self._close_later(key, self._clients.pop(key))
+        overflow = len(self._clients) + (wanted not in self._clients) - get_settings().llm_pool_max_clients
+        if overflow > 0:
+            by_age = sorted((k for k in self._clients if k != wanted), key=self._last_used.get)
+            for key in by_age[:overflow]:
+                # Not idle, so a generation may be mid-turn on it; new
+                # requests for the key revive it from _retiring.
+                self._retiring[key] = self._clients.pop(key)
+                logger.debug("Retired LLM client %s", key)
+
+    def _close_later(self, key: str, client: Any) -> None:
+        self._last_used.pop(key, None)
+        self._in_use.pop(key, None)
+        if not client.is_closed():
+            # Closed in the background so _get() needn't be async
+            try:
+                task = asyncio.get_running_loop().create_task(client.close())
+            except RuntimeError:
+                pass
+            else:
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+        logger.debug("Evicted LLM client %s", key)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def close(self) -> None:
+        """Close every pooled client. Called on application shutdown."""
+        clients = [*self._clients.values(), *self._retiring.values()]
+        self._clients.clear()
+        self._retiring.clear()
+        self._last_used.clear()
+        self._in_use.clear()
+        for client in clients:
+            if not client.is_closed():
+                await client.close()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if clients:
+            logger.info("Closed %d pooled LLM client(s)", len(clients))
@@ -0,0 +1,158 @@
+"""Hedged LLM turns across a user's configured providers.
+
+Without hedging, a fallback provider only gets a turn after the primary
+fails outright, so one slow response stalls the whole phase. With a hedge
+budget, HedgedProvider sends a turn to the next provider as well when the
+primary hasn't answered within a delay derived from its recent p95 turn
+latency. The first completion wins and the other request is cancelled.
+
+Tool calls are safe to race: each racer gets its own ToolCallRunner, and
+modlist-mutating calls only run once the winning turn is collected, so the
+loser can at most have issued read-only lookups.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable
+
+from app.config import get_settings
+from app.llm.latency import LatencyTracker
+from app.llm.provider import LLMProvider, ToolCallRunner, ToolHandler
+
+logger = logging.getLogger(__name__)
+
+
+class HedgeBudget:
+    """How many hedged requests a generation may still send."""
+
+    def __init__(self, total: int):
+        self.remaining = max(0, total)
+        self.spent = 0
+
+    def try_spend(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        self.spent += 1
+        return True
+
+
+class HedgedProvider(LLMProvider):
+    """Runs each turn on `primary`, hedging slow turns onto a backup."""
+
+    def __init__(
+        self,
+        primary: LLMProvider,
+        backups: list[LLMProvider],
+        budget: HedgeBudget,
+        on_event: Callable[[dict], None] | None = None,
+    ):
+        self.primary = primary
+        self.backups = list(backups)
+        self.budget = budget
+        self.on_event = on_event
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        return await self.primary.generate(system_prompt, user_prompt)
+
+    async def complete_turn(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        runner: ToolCallRunner,
+        on_text: Callable[[str], None] | None = None,
+        on_usage: Callable[[dict], None] | None = None,
+        tool_choice: dict | None = None,
+    ) -> dict[str, Any]:
+        return await self.primary.complete_turn(messages, tools, runner, on_text, on_usage, tool_choice)
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary before hedging."""
+        settings = get_settings()
+        p95 = LatencyTracker.get_instance().percentile(self.primary.get_model_name(), 95)
+        delay = p95 if p95 is not None else settings.llm_hedge_default_delay_seconds
+        return max(settings.llm_hedge_min_delay_seconds, delay)
+
+    async def run_turn(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        tool_handlers: dict[str, ToolHandler],
+        on_text: Callable[[str], None] | None = None,
+        on_usage: Callable[[dict], None] | None = None,
+        tool_choice: dict | None = None,
+    ) -> tuple[dict[str, Any], ToolCallRunner]:
+        started = time.monotonic()
+        primary = asyncio.ensure_future(
+            self.primary.run_turn(messages, tools, tool_handlers, on_text, on_usage, tool_choice)
+        )
+        if not self.backups or self.budget.remaining <= 0:
+            return await primary
+
+        delay = self.hedge_delay()
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self.budget.try_spend():
+            return await primary
+
+        backup = self.backups[0]
+        # The hedge's reasoning is only shown if its answer is the one used
+        hedge_text: list[str] = []
+        hedge = asyncio.ensure_future(
+            backup.run_turn(messages, tools, tool_handlers, hedge_text.append, on_usage, tool_choice)
+        )
+        logger.info(
+            "Hedging %s onto %s after %.1fs",
+            self.primary.get_model_name(), backup.get_model_name(), delay,
+        )
+
+        winner: asyncio.Future | None = None
+        pending = {primary, hedge}
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary when both finish in the same tick
+                for task in (primary, hedge):
+                    if task in done and not task.cancelled() and task.exception() is None:
+                        winner = task
+                        break
+        finally:
+            for task in (primary, hedge):
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None:
+                    task.result()[1].cancel()
+
+        if winner is hedge:
+            # A primary that lost still counts as a (censored) slow sample
+            LatencyTracker.get_instance().record(
+                self.primary.get_model_name(), time.monotonic() - started,
+            )
+            if on_text:
+                for text in hedge_text:
+                    on_text(text)
+        elif hedge.done() and not hedge.cancelled() and hedge.exception() is not None:
+            # Don't keep hedging onto a provider that is failing
+            self.backups.remove(backup)
+
+        if self.on_event is not None:
+            self.on_event({
+                "primary": self.primary.get_model_name(),
+                "backup": backup.get_model_name(),
+                "delay": round(delay, 2),
+                "winner": (
+                    None if winner is None
+                    else (self.primary if winner is primary else backup).get_model_name()
+                ),
+                "elapsed": round(time.monotonic() - started, 2),
+                "budget_remaining": self.budget.remaining,
+            })
+        if winner is None:
+            # Both failed: surface the primary's error for failover handling
+            raise primary.exception()
+        return winner.result()
+
+    def get_model_name(self) -> str:
+        return self.primary.get_model_name()
@@ -0,0 +1,166 @@
+"""Bounded message history for the LLM tool-calling loop.
+
+Every iteration of generate_with_tools resends the whole conversation, so
+stale search payloads and mod descriptions would otherwise make each
+request larger than the last. ToolHistory compacts a tool result once the
+model has responded to it: a search payload shrinks to the results the
+model went on to use (plus the other IDs), and long string fields in other
+results are trimmed. Per-item outcomes of bulk tools (entries with a
+"status" or "error") are kept as they are, since the model needs them to
+retry what failed. When the history is still over the token budget, tool
+results are compacted regardless of age and old assistant text is
+shortened.
+
+The loop keeps its history in the OpenAI layout whatever the provider.
+Messages are only rewritten, never removed, so every tool call keeps its
+matching tool result.
+"""
+
+import json
+import logging
+from typing import Any, Iterator
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Compacted string fields keep this many characters
+_FIELD_CHARS = 160
+# Old assistant text is cut to this many characters under budget pressure
+_TEXT_CHARS = 300
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """Rough token count (~4 characters per token) of a message list."""
+    return sum(len(json.dumps(m.get("content") or "", default=str)) + len(json.dumps(
+        m.get("tool_calls") or [], default=str)) for m in messages) // 4
+
+
+def _shorten(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > _FIELD_CHARS:
+        return value[:_FIELD_CHARS] + "…"
+    return value
+
+
+def _mod_ids(value: Any, key: str = "") -> set[int]:
+    """Mod IDs referenced in tool-call arguments (any *mod_id / *mod_ids key)."""
+    if isinstance(value, dict):
+        found: set[int] = set()
+        for k, v in value.items():
+            found |= _mod_ids(v, k)
+        return found
+    if isinstance(value, list):
+        # mod_ids arrays and the entry objects of bulk tools
+        return set().union(*(_mod_ids(v, key) for v in value))
+    if "mod_id" in key and isinstance(value, int) and not isinstance(value, bool):
+        return {value}
+    return set()
+
+
+def compact_tool_result(content: str, used_ids: set[int]) -> str:
+    """Shrink one tool result the model has already acted on."""
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return _shorten(content)
+    if not isinstance(data, dict) or data.get("compacted"):
+        return content
+
+    results = data.get("results")
+    if isinstance(results, list):
+        results = [r for r in results if isinstance(r, dict)]
+        outcomes = [r for r in results if "status" in r or "error" in r]
+        found = [r for r in results if r not in outcomes]
+        compacted = {k: _shorten(v) for k, v in data.items() if k != "results"}
+        compacted.update({
+            "compacted": True,
+            "used": [
+                {"mod_id": r.get("mod_id"), "name": r.get("name")}
+                for r in found if r.get("mod_id") in used_ids
+            ],
+            "other_mod_ids": [r.get("mod_id") for r in found if r.get("mod_id") not in used_ids],
+        })
+        if outcomes:
+            compacted["outcomes"] = outcomes
+        return json.dumps(compacted)
+
+    compacted = {k: _shorten(v) for k, v in data.items()}
+    if compacted == data:
+        return content
+    compacted["compacted"] = True
+    return json.dumps(compacted)
+
+
+class ToolHistory:
+    """Keeps one tool loop's message list within a rolling token budget.
+
+    `messages` is the (OpenAI-format) list the provider sends; compact()
+    rewrites it in place before each request.
+    """
+
+    def __init__(
+        self,
+        messages: list[dict],
+        token_budget: int | None = None,
+        keep_turns: int | None = None,
+    ):
+        settings = get_settings()
+        self.messages = messages
+        self.token_budget = token_budget if token_budget is not None else settings.llm_history_token_budget
+        self.keep_turns = max(1, keep_turns if keep_turns is not None else settings.llm_history_keep_turns)
+
+    def _is_assistant(self, msg: dict) -> bool:
+        return msg.get("role") == "assistant"
+
+    def _call_args(self, msg: dict) -> Iterator[Any]:
+        for call in msg.get("tool_calls") or []:
+            try:
+                yield json.loads(call["function"]["arguments"])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def compact(self) -> int:
+        """Compact acted-on tool results (and more, if over budget).
+
+        Returns the estimated token count after compaction.
+        """
+        # Turn number of each message = index of the assistant message it follows
+        turns: list[int] = []
+        turn = -1
+        for msg in self.messages:
+            if self._is_assistant(msg):
+                turn += 1
+            turns.append(turn)
+        last_turn = turn
+        if last_turn < 0:
+            return estimate_tokens(self.messages)
+
+        # Mod IDs the model used in each turn's tool calls
+        used_by_turn: dict[int, set[int]] = {}
+        for msg, t in zip(self.messages, turns):
+            if self._is_assistant(msg):
+                used_by_turn[t] = set().union(*(_mod_ids(args) for args in self._call_args(msg)))
+
+        def compact_results(min_age: int) -> None:
+            for msg, t in zip(self.messages, turns):
+                if last_turn - t < min_age:
+                    continue
+                used = set().union(*(ids for u, ids in used_by_turn.items() if u > t))
+                if msg.get("role") == "tool" and isinstance(msg.get("content"), str):
+                    msg["content"] = compact_tool_result(msg["content"], used)
+
+        compact_results(self.keep_turns)
+        tokens = estimate_tokens(self.messages)
+        if tokens > self.token_budget:
+            # Everything the model has seen at least once
+            compact_results(1)
+            for msg, t in zip(self.messages, turns):
+                text = msg.get("content")
+                if self._is_assistant(msg) and t < last_turn and isinstance(text, str):
+                    if len(text) > _TEXT_CHARS:
+                        msg["content"] = text[:_TEXT_CHARS] + "…"
+            tokens = estimate_tokens(self.messages)
+            if tokens > self.token_budget:
+                logger.debug("History still ~%d tokens after compaction (budget %d)",
+                             tokens, self.token_budget)
+        return tokens
@@ -0,0 +1,36 @@
+"""Rolling per-model latency samples for LLM turns.
+
+Every completed tool-loop turn records how long the model call took;
+hedging derives its delay from the p95 of these samples.
+"""
+
+import math
+from collections import deque
+
+
+class LatencyTracker:
+    """Recent turn latencies (seconds) per model name, process-wide."""
+
+    _instance: "LatencyTracker | None" = None
+
+    def __init__(self, window: int = 50, min_samples: int = 5):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    @classmethod
+    def get_instance(cls) -> "LatencyTracker":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def record(self, model: str, seconds: float) -> None:
+        self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, model: str, pct: float = 95.0) -> float | None:
+        """Nearest-rank percentile, or None until min_samples are recorded."""
+        samples = sorted(self._samples.get(model, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = max(1, math.ceil(pct / 100 * len(samples)))
+        return samples[rank - 1]
@@ -1,61 +1,255 @@
+import asyncio
 import json
 import logging
+import time
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Awaitable
 
 from openai import AsyncOpenAI
 
+from app.config import get_settings
+from app.llm.client_pool import LLMClientPool
+from app.llm.history import ToolHistory
+from app.llm.latency import LatencyTracker
+from app.llm.scoreboard import ProviderScoreboard, provider_key
+
 logger = logging.getLogger(__name__)
 
 ToolHandler = Callable[..., Awaitable[str]]
 
 
+def read_only(handler: ToolHandler) -> ToolHandler:
+    """Mark a tool handler as side-effect-free.
+
+    Read-only tools called in the same LLM turn may run concurrently;
+    unmarked tools are treated as state-mutating and run one at a time.
+    """
+    handler.read_only = True
+    return handler
+
+
+async def _invoke_tool(tool_handlers: dict[str, ToolHandler], name: str, args: dict) -> str:
+    handler = tool_handlers.get(name)
+    if not handler:
+        return json.dumps({"error": f"Unknown tool: {name}"})
+    try:
+        return await handler(**args)
+    except Exception as e:
+        logger.error(f"Tool {name} failed: {e}")
+        return json.dumps({"error": str(e)})
+
+
+class ToolCallRunner:
+    """Runs one LLM turn's tool calls as they arrive; results in call order.
+
+    Read-only calls start as soon as they are submitted (at most
+    `llm_tool_concurrency` at once) unless a state-mutating call precedes
+    them. A mutating call waits for every earlier call and for close(),
+    which the provider calls once the model's response is complete, so an
+    interrupted stream never half-applies modlist changes.
+    """
+
+    def __init__(self, tool_handlers: dict[str, ToolHandler], max_concurrency: int | None = None):
+        limit = max_concurrency if max_concurrency is not None else get_settings().llm_tool_concurrency
+        self.tool_handlers = tool_handlers
+        self._semaphore = asyncio.Semaphore(max(1, limit))
+        self._closed = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._barrier: asyncio.Task | None = None  # latest mutating call
+
+    def submit(self, name: str, args: dict) -> None:
+        is_read_only = getattr(self.tool_handlers.get(name), "read_only", False)
+        earlier = list(self._tasks)
+        barrier = self._barrier
+
+        async def run() -> str:
+            if is_read_only:
+                if barrier is not None:
+                    await asyncio.wait({barrier})
+                async with self._semaphore:
+                    return await _invoke_tool(self.tool_handlers, name, args)
+            await self._closed.wait()
+            if earlier:
+                await asyncio.wait(earlier)
+            return await _invoke_tool(self.tool_handlers, name, args)
+
+        task = asyncio.ensure_future(run())
+        if not is_read_only:
+            self._barrier = task
+        self._tasks.append(task)
+
+    def close(self) -> None:
+        """The turn's tool calls are all submitted; let mutating calls run."""
+        self._closed.set()
+
+    async def results(self) -> list[str]:
+        self.close()
+        return list(await asyncio.gather(*self._tasks))
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+
+async def execute_tool_calls(
+    calls: list[tuple[str, dict]],
+    tool_handlers: dict[str, ToolHandler],
+    max_concurrency: int | None = None,
+) -> list[str]:
+    """Execute one turn's tool calls and return results in call order.
+
+    Consecutive read-only calls run concurrently (at most
+    `llm_tool_concurrency` at once). A state-mutating call waits for the
+    read-only calls before it and runs alone, so the model's intended
+    order is kept wherever it matters.
+    """
+    runner = ToolCallRunner(tool_handlers, max_concurrency)
+    for name, args in calls:
+        runner.submit(name, args)
+    return await runner.results()
+
+
+def _parse_args(arguments: str | None) -> dict:
+    try:
+        args = json.loads(arguments or "{}")
+    except json.JSONDecodeError:
+        return {}
+    return args if isinstance(args, dict) else {}
+
+
+class _TextBuffer:
+    """Coalesces streamed text deltas into sentence-sized on_text calls."""
+
+    def __init__(self, on_text: Callable[[str], None] | None, min_chars: int = 80):
+        self.on_text = on_text
+        self.min_chars = min_chars
+        self._parts: list[str] = []
+        self._size = 0
+
+    def add(self, delta: str) -> None:
+        if not self.on_text or not delta:
+            return
+        self._parts.append(delta)
+        self._size += len(delta)
+        if "\n" in delta or (self._size >= self.min_chars and delta.rstrip().endswith((".", "!", "?", ":"))):
+            self.flush()
+
+    def flush(self) -> None:
+        text = "".join(self._parts).strip()
+        self._parts.clear()
+        self._size = 0
+        if text and self.on_text:
+            self.on_text(text)
+
+
+def _join_system_messages(messages: list[dict]) -> list[dict]:
+    """Fold all system messages into one leading system message, in order.
+
+    Prompt builders send a static prefix and a dynamic suffix as separate
+    system messages; OpenAI-compatible APIs get them as one string that
+    starts with the byte-identical prefix, which their prefix caches key on.
+    """
+    system = [m["content"] for m in messages if m["role"] == "system"]
+    rest = [m for m in messages if m["role"] != "system"]
+    if len(system) <= 1:
+        return list(messages)
+    return [{"role": "system", "content": "\n\n".join(system)}, *rest]
+
+
+def _openai_usage(response: Any) -> dict | None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "input_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "cached_tokens": (getattr(details, "cached_tokens", 0) or 0) if details else 0,
+        "cache_write_tokens": 0,
+    }
+
+
+def _anthropic_usage(usage: Any) -> dict | None:
+    if usage is None:
+        return None
+    cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+    written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    return {
+        # input_tokens excludes cache reads/writes; report the whole prompt
+        "input_tokens": (getattr(usage, "input_tokens", 0) or 0) + cached + written,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        "cached_tokens": cached,
+        "cache_write_tokens": written,
+    }
+
+
+def _report_usage(model: str, usage: dict | None, on_usage: Callable[[dict], None] | None) -> None:
+    if usage is None:
+        return
+    logger.info("LLM call (%s): %d input tokens (%d cached), %d output tokens",
+                model, usage["input_tokens"], usage["cached_tokens"], usage["output_tokens"])
+    if on_usage:
+        on_usage(usage)
+
+
 class LLMProvider(ABC):
-    """Abstract base for LLM providers."""
+    """Abstract base for LLM providers.
+
+    Subclasses implement complete_turn, one model call on an OpenAI-format
+    conversation; the tool-calling loop in generate_with_tools is shared,
+    so a turn can be handed to any provider mid-conversation.
+    """
+
+    # Registry id the provider was built from (set by LLMProviderFactory)
+    provider_id: str = "custom"
+    # LLMClientPool entry of a shared SDK client, if the provider uses one
+    pool_key: str | None = None
 
     @abstractmethod
     async def generate(self, system_prompt: str, user_prompt: str) -> str:
         pass
 
     @abstractmethod
-    async def generate_with_tools(
+    async def complete_turn(
         self,
         messages: list[dict],
         tools: list[dict],
-        tool_handlers: dict[str, ToolHandler],
-        max_iterations: int = 15,
+        runner: ToolCallRunner,
         on_text: Callable[[str], None] | None = None,
-    ) -> list[dict]:
-        """Run a tool-calling loop. Returns the full message history.
-
-        Args:
-            on_text: Optional callback invoked when the LLM produces text content.
-                     Used for streaming 'thinking' events to the frontend.
+        on_usage: Callable[[dict], None] | None = None,
+        tool_choice: dict | None = None,
+    ) -> dict[str, Any]:
+        """Make one model call and return the assistant message (OpenAI format).
+
+        Each tool call is submitted to `runner`, in order, as soon as its
+        arguments are known. `tool_choice` (OpenAI format, e.g.
+        {"type": "function", "function": {"name": "select_mods"}}) forces
+        the model to call that tool.
         """
         pass
 
-    @abstractmethod
-    def get_model_name(self) -> str:
-        pass
-
-
-class OpenAICompatibleProvider(LLMProvider):
-    """Provider for any OpenAI-compatible API (Ollama, Groq, Together, HuggingFace)."""
-
-    def __init__(self, base_url: str, api_key: str, model: str):
-        self.client = AsyncOpenAI(base_url=base_url, api_key=api_key)
-        self.model = model
-
-    async def generate(self, system_prompt: str, user_prompt: str) -> str:
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3,
-        )
-        return response.choices[0].message.content or ""
+    async def run_turn(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        tool_handlers: dict[str, ToolHandler],
+        on_text: Callable[[str], None] | None = None,
+        on_usage: Callable[[dict], None] | None = None,
+        tool_choice: dict | None = None,
+    ) -> tuple[dict[str, Any], ToolCallRunner]:
+        """complete_turn with a fresh runner, recording the turn's latency."""
+        runner = ToolCallRunner(tool_handlers)
+        started = time.monotonic()
+        try:
+            with LLMClientPool.get_instance().in_use(self.pool_key):
+                assistant_msg = await self.complete_turn(messages, tools, runner, on_text, on_usage, tool_choice)
+        except BaseException:
+            runner.cancel()
+            raise
+        elapsed = time.monotonic() - started
+        LatencyTracker.get_instance().record(self.get_model_name(), elapsed)
+        ProviderScoreboard.get_instance().record_success(provider_key(self), elapsed)
+        return assistant_msg, runner
 
     async def generate_with_tools(
         self,
@@ -64,54 +258,54 @@ class OpenAICompatibleProvider(LLMProvider):
         tool_handlers: dict[str, ToolHandler],
         max_iterations: int = 15,
         on_text: Callable[[str], None] | None = None,
+        on_usage: Callable[[dict], None] | None = None,
+        on_turn: Callable[[dict], None] | None = None,
     ) -> list[dict]:
-        """Run a tool-calling loop until the LLM stops calling tools or we hit max_iterations."""
+        """Run a tool-calling loop until the LLM stops calling tools or we hit
+        max_iterations. Returns the full (OpenAI-format) message history.
+
+        System messages are concatenated in order; put the part that is
+        identical across calls first so provider prompt caches can hit.
+
+        Args:
+            on_text: Optional callback invoked when the LLM produces text content.
+                     Used for streaming 'thinking' events to the frontend.
+            on_usage: Optional callback invoked after each API call with
+                      input/output/cached token counts.
+            on_turn: Optional callback invoked after each iteration with the
+                     model's response time, the extra time spent waiting for
+                     tool results, and the number of tool calls.
+        """
         messages = list(messages)  # don't mutate caller's list
+        history = ToolHistory(messages)
         consecutive_text_only = 0
 
         for iteration in range(max_iterations):
-            logger.info(f"Tool-calling iteration {iteration + 1}/{max_iterations}")
-
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=tools,
-                temperature=0.3,
-            )
-
-            choice = response.choices[0]
-            assistant_msg: dict[str, Any] = {"role": "assistant"}
-
-            if choice.message.content:
-                assistant_msg["content"] = choice.message.content
-                if on_text:
-                    on_text(choice.message.content)
-
-            if choice.message.tool_calls:
-                assistant_msg["tool_calls"] = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments,
-                        },
-                    }
-                    for tc in choice.message.tool_calls
-                ]
-
+            logger.info(f"Tool-calling iteration {iteration + 1}/{max_iterations} ({self.get_model_name()})")
+            # Shrink tool results the model has already acted on
+            tokens = history.compact()
+            logger.debug("Request history: ~%d tokens", tokens)
+
+            # Tool calls start executing while the response is still arriving
+            started = time.monotonic()
+            assistant_msg, runner = await self.run_turn(messages, tools, tool_handlers, on_text, on_usage)
+            responded = time.monotonic()
             messages.append(assistant_msg)
+            tool_calls = assistant_msg.get("tool_calls")
 
             # No tool calls — the LLM may be thinking or genuinely done.
             # Allow up to 2 consecutive text-only responses before stopping,
             # because models often emit analysis text between tool calls.
-            if not choice.message.tool_calls:
+            if not tool_calls:
+                if on_turn:
+                    on_turn({"llm_seconds": responded - started, "tool_wait_seconds": 0.0, "tool_calls": 0})
                 consecutive_text_only += 1
                 if consecutive_text_only >= 2:
                     logger.info("LLM finished (2 consecutive text-only responses)")
                     break
                 logger.info("Text-only response, continuing loop (attempt %d/2)", consecutive_text_only)
-                # Nudge the model to continue using tools
+                # Nudge the model to continue using tools (also keeps
+                # user/assistant turns alternating for Anthropic)
                 messages.append({
                     "role": "user",
                     "content": "Continue — use the tools to search for and add mods.",
@@ -120,27 +314,18 @@ class OpenAICompatibleProvider(LLMProvider):
 
             consecutive_text_only = 0
 
-            # Execute each tool call
-            for tc in choice.message.tool_calls:
-                fn_name = tc.function.name
-                try:
-                    args = json.loads(tc.function.arguments)
-                except json.JSONDecodeError:
-                    args = {}
-
-                handler = tool_handlers.get(fn_name)
-                if handler:
-                    try:
-                        result = await handler(**args)
-                    except Exception as e:
-                        logger.error(f"Tool {fn_name} failed: {e}")
-                        result = json.dumps({"error": str(e)})
-                else:
-                    result = json.dumps({"error": f"Unknown tool: {fn_name}"})
-
+            # Collect the turn's tool results (read-only ones ran concurrently)
+            results = await runner.results()
+            if on_turn:
+                on_turn({
+                    "llm_seconds": responded - started,
+                    "tool_wait_seconds": time.monotonic() - responded,
+                    "tool_calls": len(tool_calls),
+                })
+            for tc, result in zip(tool_calls, results):
                 messages.append({
                     "role": "tool",
-                    "tool_call_id": tc.id,
+                    "tool_call_id": tc["id"],
                     "content": result,
                 })
         else:
@@ -148,17 +333,221 @@ class OpenAICompatibleProvider(LLMProvider):
 
         return messages
 
+    @abstractmethod
+    def get_model_name(self) -> str:
+        pass
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Provider for any OpenAI-compatible API (Ollama, Groq, Together, HuggingFace)."""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str,
+        stream: bool | None = None,
+        client: AsyncOpenAI | None = None,
+    ):
+        self.client = client or AsyncOpenAI(base_url=base_url, api_key=api_key)
+        self.model = model
+        self.stream = stream if stream is not None else get_settings().llm_streaming
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.3,
+        )
+        return response.choices[0].message.content or ""
+
+    async def complete_turn(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        runner: ToolCallRunner,
+        on_text: Callable[[str], None] | None = None,
+        on_usage: Callable[[dict], None] | None = None,
+        tool_choice: dict | None = None,
+    ) -> dict[str, Any]:
+        messages = _join_system_messages(messages)
+        extra = {"tool_choice": tool_choice} if tool_choice else {}
+        if self.stream:
+            return await self._complete_streaming(messages, tools, runner, on_text, on_usage, extra)
+
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            tools=tools,
+            temperature=0.3,
+            **extra,
+        )
+        _report_usage(self.model, _openai_usage(response), on_usage)
+
+        message = response.choices[0].message
+        assistant_msg: dict[str, Any] = {"role": "assistant"}
+
+        if message.content:
+            assistant_msg["content"] = message.content
+            if on_text:
+                on_text(message.content)
+
+        if message.tool_calls:
+            assistant_msg["tool_calls"] = [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments,
+                    },
+                }
+                for tc in message.tool_calls
+            ]
+            for tc in message.tool_calls:
+                runner.submit(tc.function.name, _parse_args(tc.function.arguments))
+
+        return assistant_msg
+
+    async def _complete_streaming(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        runner: ToolCallRunner,
+        on_text: Callable[[str], None] | None,
+        on_usage: Callable[[dict], None] | None,
+        extra: dict,
+    ) -> dict[str, Any]:
+        """Streaming variant of complete_turn; `extra` holds optional request fields.
+
+        Text deltas go to on_text as they arrive. A tool call is submitted
+        once the next one starts (or the stream ends), i.e. as soon as its
+        arguments are complete, so Nexus lookups overlap the rest of the
+        model's output.
+        """
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            tools=tools,
+            temperature=0.3,
+            stream=True,
+            # Without this the server sends no usage at all when streaming
+            stream_options={"include_usage": True},
+            **extra,
+        )
+        text = _TextBuffer(on_text)
+        content: list[str] = []
+        calls: dict[int, dict] = {}
+        submitted = 0
+        usage = None
+
+        def submit_until(index: int) -> None:
+            nonlocal submitted
+            for i in sorted(calls)[submitted:]:
+                if i >= index:
+                    break
+                runner.submit(calls[i]["name"], _parse_args(calls[i]["arguments"]))
+                submitted += 1
+
+        async for chunk in stream:
+            # Usage arrives on a final chunk with an empty choices list
+            if getattr(chunk, "usage", None):
+                usage = _openai_usage(chunk)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content.append(delta.content)
+                text.add(delta.content)
+            for tc in delta.tool_calls or []:
+                index = tc.index
+                if index is None:
+                    # Some servers omit the index; a new id starts a new call
+                    known = [c["id"] for c in calls.values()]
+                    index = len(calls) if (tc.id and tc.id not in known) or not calls else max(calls)
+                if index not in calls:
+                    submit_until(index)
+                    calls[index] = {"id": "", "name": "", "arguments": ""}
+                call = calls[index]
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function is not None:
+                    call["name"] += tc.function.name or ""
+                    call["arguments"] += tc.function.arguments or ""
+
+        submit_until(max(calls, default=-1) + 1)
+        text.flush()
+        _report_usage(self.model, usage, on_usage)
+
+        assistant_msg: dict[str, Any] = {"role": "assistant"}
+        if content:
+            assistant_msg["content"] = "".join(content)
+        if calls:
+            assistant_msg["tool_calls"] = [
+                {
+                    "id": calls[i]["id"],
+                    "type": "function",
+                    "function": {"name": calls[i]["name"], "arguments": calls[i]["arguments"]},
+                }
+                for i in sorted(calls)
+            ]
+        return assistant_msg
+
     def get_model_name(self) -> str:
         return self.model
 
 
+def _to_anthropic_messages(messages: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Convert an OpenAI-format conversation to Anthropic (system, messages).
+
+    Each system message becomes its own system block; consecutive tool
+    results are grouped into one user message of tool_result blocks.
+    """
+    system: list[dict] = []
+    converted: list[dict] = []
+    for msg in messages:
+        role = msg["role"]
+        if role == "system":
+            system.append({"type": "text", "text": msg["content"]})
+        elif role == "assistant":
+            blocks: list[dict] = []
+            if msg.get("content"):
+                blocks.append({"type": "text", "text": msg["content"]})
+            for tc in msg.get("tool_calls") or []:
+                blocks.append({
+                    "type": "tool_use",
+                    "id": tc["id"],
+                    "name": tc["function"]["name"],
+                    "input": _parse_args(tc["function"]["arguments"]),
+                })
+            converted.append({"role": "assistant", "content": blocks})
+        elif role == "tool":
+            result = {"type": "tool_result", "tool_use_id": msg["tool_call_id"], "content": msg["content"]}
+            previous = converted[-1] if converted else None
+            if (
+                previous is not None and previous["role"] == "user"
+                and isinstance(previous["content"], list)
+                and previous["content"] and previous["content"][0].get("type") == "tool_result"
+            ):
+                previous["content"].append(result)
+            else:
+                converted.append({"role": "user", "content": [result]})
+        else:
+            converted.append({"role": role, "content": msg["content"]})
+    return system, converted
+
+
 class AnthropicProvider(LLMProvider):
     """Provider for Anthropic's Claude API (native Messages API)."""
 
-    def __init__(self, api_key: str, model: str):
+    def __init__(self, api_key: str, model: str, stream: bool | None = None, client=None):
         from anthropic import AsyncAnthropic
-        self.client = AsyncAnthropic(api_key=api_key)
+        self.client = client or AsyncAnthropic(api_key=api_key)
         self.model = model
+        self.stream = stream if stream is not None else get_settings().llm_streaming
 
     async def generate(self, system_prompt: str, user_prompt: str) -> str:
         response = await self.client.messages.create(
@@ -170,22 +559,16 @@ class AnthropicProvider(LLMProvider):
         )
         return response.content[0].text
 
-    async def generate_with_tools(
+    async def complete_turn(
         self,
         messages: list[dict],
         tools: list[dict],
-        tool_handlers: dict[str, ToolHandler],
-        max_iterations: int = 15,
+        runner: ToolCallRunner,
         on_text: Callable[[str], None] | None = None,
-    ) -> list[dict]:
-        # Extract system prompt and convert messages
-        system = ""
-        anthropic_messages = []
-        for msg in messages:
-            if msg["role"] == "system":
-                system = msg["content"]
-            else:
-                anthropic_messages.append({"role": msg["role"], "content": msg["content"]})
+        on_usage: Callable[[dict], None] | None = None,
+        tool_choice: dict | None = None,
+    ) -> dict[str, Any]:
+        system, anthropic_messages = _to_anthropic_messages(messages)
 
         # Convert OpenAI tool format to Anthropic format
         anthropic_tools = []
@@ -197,79 +580,125 @@ class AnthropicProvider(LLMProvider):
                 "input_schema": fn.get("parameters", {"type": "object", "properties": {}}),
             })
 
-        msgs = list(anthropic_messages)
-        consecutive_text_only = 0
-        for iteration in range(max_iterations):
-            logger.info(f"[Anthropic] Tool-calling iteration {iteration + 1}/{max_iterations}")
-
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=4096,
-                system=system,
-                messages=msgs,
-                tools=anthropic_tools,
-                temperature=0.3,
-            )
-
-            # Convert response content blocks to serializable dicts
-            assistant_content = []
-            for block in response.content:
-                if block.type == "text":
-                    assistant_content.append({"type": "text", "text": block.text})
-                    if on_text:
-                        on_text(block.text)
-                elif block.type == "tool_use":
-                    assistant_content.append({
-                        "type": "tool_use",
-                        "id": block.id,
-                        "name": block.name,
-                        "input": block.input,
-                    })
-            msgs.append({"role": "assistant", "content": assistant_content})
-
-            # Extract tool use blocks
-            tool_uses = [b for b in response.content if b.type == "tool_use"]
-            if not tool_uses:
-                consecutive_text_only += 1
-                if consecutive_text_only >= 2:
-                    logger.info("[Anthropic] LLM finished (2 consecutive text-only responses)")
-                    break
-                logger.info("[Anthropic] Text-only response, continuing loop (attempt %d/2)", consecutive_text_only)
-                # Nudge the model to continue using tools (also satisfies
-                # Anthropic's requirement that messages alternate user/assistant)
-                msgs.append({
-                    "role": "user",
-                    "content": "Continue — use the tools to search for and add mods.",
-                })
-                continue
-
-            consecutive_text_only = 0
-
-            # Execute tools and build Anthropic-format tool results
-            tool_results = []
-            for tu in tool_uses:
-                handler = tool_handlers.get(tu.name)
-                if handler:
-                    try:
-                        result = await handler(**tu.input)
-                    except Exception as e:
-                        logger.error(f"Tool {tu.name} failed: {e}")
-                        result = json.dumps({"error": str(e)})
-                else:
-                    result = json.dumps({"error": f"Unknown tool: {tu.name}"})
-
-                tool_results.append({
-                    "type": "tool_result",
-                    "tool_use_id": tu.id,
-                    "content": result,
+        # Cache breakpoints: tool schemas, then each system block (static
+        # prefix, then the per-phase suffix reused across the loop's turns)
+        if get_settings().llm_prompt_caching:
+            for block in [*anthropic_tools[-1:], *system[:3]]:
+                block["cache_control"] = {"type": "ephemeral"}
+
+        request = {
+            "model": self.model,
+            "max_tokens": 4096,
+            "system": system or "",
+            "messages": anthropic_messages,
+            "tools": anthropic_tools,
+            "temperature": 0.3,
+        }
+        if tool_choice:
+            request["tool_choice"] = {"type": "tool", "name": tool_choice["function"]["name"]}
+        if self.stream:
+            blocks = await self._complete_streaming(request, runner, on_text, on_usage)
+        else:
+            blocks = await self._complete(request, runner, on_text, on_usage)
+
+        # Back to OpenAI format for the shared history
+        assistant_msg: dict[str, Any] = {"role": "assistant"}
+        text = "\n".join(b["text"] for b in blocks if b["type"] == "text" and b["text"])
+        if text:
+            assistant_msg["content"] = text
+        tool_uses = [b for b in blocks if b["type"] == "tool_use"]
+        if tool_uses:
+            assistant_msg["tool_calls"] = [
+                {
+                    "id": b["id"],
+                    "type": "function",
+                    "function": {"name": b["name"], "arguments": json.dumps(b["input"])},
+                }
+                for b in tool_uses
+            ]
+        return assistant_msg
+
+    async def _complete(
+        self,
+        request: dict,
+        runner: ToolCallRunner,
+        on_text: Callable[[str], None] | None,
+        on_usage: Callable[[dict], None] | None,
+    ) -> list[dict]:
+        """One API call. Returns the content blocks; tool_use blocks are
+        submitted to `runner` in order."""
+        response = await self.client.messages.create(**request)
+        _report_usage(self.model, _anthropic_usage(getattr(response, "usage", None)), on_usage)
+
+        # Convert response content blocks to serializable dicts
+        blocks = []
+        for block in response.content:
+            if block.type == "text":
+                blocks.append({"type": "text", "text": block.text})
+                if on_text:
+                    on_text(block.text)
+            elif block.type == "tool_use":
+                blocks.append({
+                    "type": "tool_use",
+                    "id": block.id,
+                    "name": block.name,
+                    "input": block.input,
                 })
+                runner.submit(block.name, block.input)
+        return blocks
 
-            # Anthropic expects all tool results in a single user message
-            msgs.append({"role": "user", "content": tool_results})
-        else:
-            logger.warning(f"[Anthropic] Hit max iterations ({max_iterations})")
+    async def _complete_streaming(
+        self,
+        request: dict,
+        runner: ToolCallRunner,
+        on_text: Callable[[str], None] | None,
+        on_usage: Callable[[dict], None] | None,
+    ) -> list[dict]:
+        """Streaming variant of _complete.
 
-        return msgs
+        Text deltas go to on_text as they arrive; a tool_use block is
+        submitted at its content_block_stop, as soon as its input JSON is
+        complete.
+        """
+        stream = await self.client.messages.create(**request, stream=True)
+        text = _TextBuffer(on_text)
+        blocks: dict[int, dict] = {}
+        partial_json: dict[int, list[str]] = {}
+        usage = None
+        output_tokens = 0
+
+        async for event in stream:
+            if event.type == "message_start":
+                usage = _anthropic_usage(getattr(event.message, "usage", None))
+            elif event.type == "content_block_start":
+                block = event.content_block
+                if block.type == "text":
+                    blocks[event.index] = {"type": "text", "text": block.text or ""}
+                elif block.type == "tool_use":
+                    blocks[event.index] = {"type": "tool_use", "id": block.id, "name": block.name, "input": {}}
+                    partial_json[event.index] = []
+            elif event.type == "content_block_delta":
+                block = blocks.get(event.index)
+                if block is None:
+                    continue
+                if event.delta.type == "text_delta":
+                    block["text"] += event.delta.text
+                    text.add(event.delta.text)
+                elif event.delta.type == "input_json_delta":
+                    partial_json[event.index].append(event.delta.partial_json)
+            elif event.type == "content_block_stop":
+                block = blocks.get(event.index)
+                if block is not None and block["type"] == "tool_use":
+                    block["input"] = _parse_args("".join(partial_json[event.index]))
+                    runner.submit(block["name"], block["input"])
+            elif event.type == "message_delta":
+                output_tokens = getattr(event.usage, "output_tokens", 0) or 0
+
+        text.flush()
+        if usage is not None:
+            usage["output_tokens"] = output_tokens
+        _report_usage(self.model, usage, on_usage)
+        return [blocks[i] for i in sorted(blocks)]
 
     def get_model_name(self) -> str:
         return self.model
@@ -290,10 +719,13 @@ class LLMProviderFactory:
         model = entry["model"]
 
         if entry["type"] == "anthropic":
-            return AnthropicProvider(api_key="", model=model)
-        return OpenAICompatibleProvider(
-            base_url=entry["base_url"], api_key="", model=model,
-        )
+            provider: LLMProvider = AnthropicProvider(api_key="", model=model)
+        else:
+            provider = OpenAICompatibleProvider(
+                base_url=entry["base_url"], api_key="", model=model,
+            )
+        provider.provider_id = provider_name
+        return provider
 
     @staticmethod
     def create_from_request(
@@ -311,22 +743,41 @@ class LLMProviderFactory:
 
         entry = get_provider(provider_id)
 
+        # SDK clients (and their warm connections) are shared across
+        # generations using the same provider, endpoint and key
+        pool = LLMClientPool.get_instance()
+
         if entry:
             actual_model = model or entry["model"]
             if entry["type"] == "anthropic":
-                return AnthropicProvider(api_key=api_key, model=actual_model)
-            return OpenAICompatibleProvider(
-                base_url=base_url or entry["base_url"],
-                api_key=api_key,
-                model=actual_model,
-            )
+                client, pool_key = pool.anthropic(provider_id, api_key)
+                provider: LLMProvider = AnthropicProvider(
+                    api_key=api_key, model=actual_model, client=client,
+                )
+            else:
+                actual_url = base_url or entry["base_url"]
+                client, pool_key = pool.openai(provider_id, actual_url, api_key)
+                provider = OpenAICompatibleProvider(
+                    base_url=actual_url,
+                    api_key=api_key,
+                    model=actual_model,
+                    client=client,
+                )
+            provider.provider_id = provider_id
+            provider.pool_key = pool_key
+            return provider
 
         # Custom / unknown provider — requires base_url
         if base_url:
-            return OpenAICompatibleProvider(
+            client, pool_key = pool.openai(provider_id, base_url, api_key)
+            provider = OpenAICompatibleProvider(
                 base_url=base_url,
                 api_key=api_key,
                 model=model or "default",
+                client=client,
             )
+            provider.provider_id = provider_id
+            provider.pool_key = pool_key
+            return provider
 
         raise ValueError(f"Unknown provider '{provider_id}' and no base_url supplied")
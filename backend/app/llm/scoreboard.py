@@ -0,0 +1,168 @@
+"""Process-wide LLM provider health, shared by every generation.
+
+Each generation used to learn about a degraded provider on its own, paying
+a full timeout (or rate-limit error) before failing over. The scoreboard
+keeps, per provider and model:
+
+- an EWMA of turn latency and of the error rate, giving an expected time
+  to a successful turn that provider ordering is based on;
+- error counts by classify_error type;
+- a cooldown after a rate limit;
+- a circuit breaker that opens after consecutive failures, lets a single
+  probe through once the open period ends (half-open), and closes again
+  on success.
+
+Errors tied to the user's own key (auth, quota) are counted but neither
+trip the breaker nor cool the provider down for everyone else.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from app.config import get_settings
+
+if TYPE_CHECKING:
+    from app.llm.provider import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+# Per-key failures: one user's bad key says nothing about the provider
+_KEY_ERRORS = {"auth_error", "token_limit"}
+
+
+def provider_key(llm: "LLMProvider") -> str:
+    return f"{llm.provider_id}:{llm.get_model_name()}"
+
+
+@dataclass
+class ProviderHealth:
+    ewma_latency: float | None = None
+    ewma_error_rate: float = 0.0
+    successes: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    opened_at: float | None = None  # circuit open (or half-open) since
+    probe_started: float | None = None  # half-open trial call in flight
+
+    def circuit(self, now: float, open_seconds: float) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if now - self.opened_at < open_seconds else "half_open"
+
+
+class ProviderScoreboard:
+    """Latency, error and circuit state per provider:model, process-wide."""
+
+    _instance: "ProviderScoreboard | None" = None
+
+    def __init__(self):
+        settings = get_settings()
+        self.alpha = settings.llm_scoreboard_ewma_alpha
+        self.failure_threshold = settings.llm_circuit_failure_threshold
+        self.open_seconds = settings.llm_circuit_open_seconds
+        self.rate_limit_cooldown = settings.llm_rate_limit_cooldown_seconds
+        self.default_latency = settings.llm_expected_latency_seconds
+        self._health: dict[str, ProviderHealth] = {}
+
+    @classmethod
+    def get_instance(cls) -> "ProviderScoreboard":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _get(self, key: str) -> ProviderHealth:
+        return self._health.setdefault(key, ProviderHealth())
+
+    def record_success(self, key: str, seconds: float) -> None:
+        health = self._get(key)
+        health.successes += 1
+        health.ewma_latency = (
+            seconds if health.ewma_latency is None
+            else self.alpha * seconds + (1 - self.alpha) * health.ewma_latency
+        )
+        health.ewma_error_rate *= 1 - self.alpha
+        health.consecutive_failures = 0
+        health.probe_started = None
+        if health.opened_at is not None:
+            logger.info("Circuit closed for %s", key)
+            health.opened_at = None
+
+    def record_failure(self, key: str, error_type: str) -> None:
+        health = self._get(key)
+        health.errors[error_type] = health.errors.get(error_type, 0) + 1
+        if error_type in _KEY_ERRORS:
+            return
+        now = time.monotonic()
+        health.ewma_error_rate = self.alpha + (1 - self.alpha) * health.ewma_error_rate
+        health.consecutive_failures += 1
+        if error_type == "rate_limit":
+            health.cooldown_until = now + self.rate_limit_cooldown
+        state = health.circuit(now, self.open_seconds)
+        if state == "half_open" or (state == "closed" and health.consecutive_failures >= self.failure_threshold):
+            logger.warning("Circuit opened for %s after %d failures (%s)",
+                           key, health.consecutive_failures, error_type)
+            health.opened_at = now
+        health.probe_started = None
+
+    def available(self, key: str, claim: bool = False) -> bool:
+        """Whether calls to `key` should be attempted now.
+
+        A half-open circuit admits one probe at a time; `claim` takes it.
+        """
+        health = self._health.get(key)
+        if health is None:
+            return True
+        now = time.monotonic()
+        if now < health.cooldown_until:
+            return False
+        state = health.circuit(now, self.open_seconds)
+        if state == "open":
+            return False
+        if state == "half_open":
+            # A probe that never reported back (cancelled) expires
+            if health.probe_started is not None and now - health.probe_started < self.open_seconds:
+                return False
+            if claim:
+                health.probe_started = now
+        return True
+
+    def expected_latency(self, key: str) -> float:
+        """Expected seconds to a successful turn (latency over success rate)."""
+        health = self._health.get(key)
+        if health is None or health.ewma_latency is None:
+            latency = self.default_latency
+        else:
+            latency = health.ewma_latency
+        error_rate = health.ewma_error_rate if health is not None else 0.0
+        return latency / max(0.1, 1 - error_rate)
+
+    def order(self, providers: list["LLMProvider"]) -> list["LLMProvider"]:
+        """Available providers by expected latency, then unavailable ones.
+
+        Ties keep the given order, so the user's preference still decides
+        between providers the scoreboard knows nothing about.
+        """
+        return sorted(providers, key=lambda p: (
+            not self.available(provider_key(p)),
+            self.expected_latency(provider_key(p)),
+        ))
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            key: {
+                "circuit": health.circuit(now, self.open_seconds),
+                "available": self.available(key),
+                "ewma_latency": round(health.ewma_latency, 3) if health.ewma_latency is not None else None,
+                "error_rate": round(health.ewma_error_rate, 3),
+                "expected_latency": round(self.expected_latency(key), 3),
+                "successes": health.successes,
+                "errors": dict(health.errors),
+                "consecutive_failures": health.consecutive_failures,
+                "cooldown_remaining": round(max(0.0, health.cooldown_until - now), 1),
+            }
+            for key, health in sorted(self._health.items())
+        }
@@ -10,6 +10,9 @@ from sqlalchemy import select, text
 from app.api import specs, games, modlist, settings, auth, stats, generation
 from app.config import get_settings
 from app.database import engine, async_session, Base
+from app.llm.client_pool import LLMClientPool
+from app.services.mod_catalog import run_catalog_sync_loop
+from app.services.nexus_pool import NexusClientPool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -70,8 +73,12 @@ async def lifespan(app: FastAPI):
         logger.exception("Database init failed — app will start without data")
 
     cleanup_task = asyncio.create_task(_run_account_cleanup_loop())
+    catalog_task = asyncio.create_task(run_catalog_sync_loop())
     yield
     cleanup_task.cancel()
+    catalog_task.cancel()
+    await NexusClientPool.get_instance().close()
+    await LLMClientPool.get_instance().close()
 
 
 app = FastAPI(
@@ -10,6 +10,9 @@ from app.models.user_oauth_provider import UserOAuthProvider
 from app.models.refresh_token import RefreshToken
 from app.models.email_verification import EmailVerification
 from app.models.mod_build_phase import ModBuildPhase
+from app.models.nexus_primary_file import NexusPrimaryFile
+from app.models.nexus_catalog import NexusCatalogMod, NexusCatalogState
+from app.models.phase_result_cache import PhaseResultCache
 
 __all__ = [
     "Game",
@@ -25,4 +28,8 @@ __all__ = [
     "RefreshToken",
     "EmailVerification",
     "ModBuildPhase",
+    "NexusPrimaryFile",
+    "NexusCatalogMod",
+    "NexusCatalogState",
+    "PhaseResultCache",
 ]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Boolean, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -10,8 +10,10 @@ class ModBuildPhase(Base):
     """Defines an ordered phase for building a modlist for a specific game.
 
     Each game has its own set of phases (e.g., Skyrim has 10 phases from
-    Essentials to Compatibility Patches). The AI generation pipeline
-    iterates through phases in order, using phase-specific prompts and rules.
+    Essentials to Compatibility Patches). The AI generation pipeline runs
+    each phase once the phases listed in `depends_on` have finished, so
+    independent phases run concurrently. NULL depends_on means "after the
+    previous phase"; the final patch phase always waits for every other one.
     """
 
     __tablename__ = "mod_build_phases"
@@ -26,3 +28,4 @@ class ModBuildPhase(Base):
     example_mods: Mapped[str] = mapped_column(Text, default="")
     is_playstyle_driven: Mapped[bool] = mapped_column(Boolean, default=False)
     max_mods: Mapped[int] = mapped_column(Integer, default=5)
+    depends_on: Mapped[list[int] | None] = mapped_column(JSON, nullable=True)
@@ -25,6 +25,8 @@ class Modlist(Base):
         nullable=True,
     )
     llm_provider: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Per-phase token/latency/tool-call accounting from the generation run
+    generation_metrics: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
     entries: Mapped[list["ModlistEntry"]] = relationship(back_populates="modlist")
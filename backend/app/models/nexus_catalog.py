@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class NexusCatalogMod(Base):
+    """Local copy of a game's Nexus mod listing, searched before live Nexus.
+
+    Full-text (tsvector) and trigram indexes over name/summary are
+    Postgres-only and live in the alembic migration, so the model itself
+    stays portable.
+    """
+
+    __tablename__ = "nexus_catalog_mods"
+
+    game_domain: Mapped[str] = mapped_column(String(50), primary_key=True)
+    nexus_mod_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(255))
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    author: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    version: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    endorsements: Mapped[int] = mapped_column(Integer, default=0)
+    category: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Nexus' own updatedAt, kept as returned (ISO 8601) for incremental sync
+    nexus_updated_at: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    indexed_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
+
+
+class NexusCatalogState(Base):
+    """Sync progress for one game's catalog."""
+
+    __tablename__ = "nexus_catalog_state"
+
+    game_domain: Mapped[str] = mapped_column(String(50), primary_key=True)
+    mod_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Newest updatedAt ingested — incremental syncs stop once they reach it
+    high_water_updated_at: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    last_full_sync_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class NexusPrimaryFile(Base):
+    """Resolved primary download file for a Nexus mod.
+
+    Filled by modlist export so repeated exports of the same mods don't
+    re-query Nexus. Rows older than `nexus_primary_file_ttl_hours` are
+    revalidated on the next export that needs them.
+    """
+
+    __tablename__ = "nexus_primary_files"
+
+    game_domain: Mapped[str] = mapped_column(String(50), primary_key=True)
+    nexus_mod_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # file_id is None when the mod has no files (hidden, archived, etc.)
+    file_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    file_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    resolved_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
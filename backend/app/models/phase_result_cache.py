@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class PhaseResultCache(Base):
+    """A build phase's output, replayed by later generations with the same inputs.
+
+    Keyed by a hash of game, game version, phase number, hardware tier and
+    (for playstyle-driven phases) playstyle. Rows older than
+    `phase_cache_ttl_hours`, or whose mods have been updated on Nexus since
+    they were stored, are discarded and the phase runs live again.
+    """
+
+    __tablename__ = "phase_result_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    game_id: Mapped[int] = mapped_column(Integer)
+    game_version: Mapped[str] = mapped_column(String(50), default="")
+    phase_number: Mapped[int] = mapped_column(Integer)
+    hardware_tier: Mapped[str] = mapped_column(String(10))
+    # None when the phase (and every phase it depends on) ignores playstyle
+    playstyle_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # {"modlist": [...], "patches": [...], "knowledge_flags": [...]} the phase added
+    output: Mapped[dict] = mapped_column(JSON)
+    # Nexus updatedAt of every mod in `output` when it was stored
+    mod_updated_at: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, JSON, String
+from sqlalchemy import ForeignKey, Integer, JSON, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -49,6 +49,9 @@ class UserSettings(Base):
     # Notification preferences: {"email_alerts": true, "mod_recommendations": true, ...}
     notification_prefs: Mapped[dict] = mapped_column(JSON, default=dict)
 
+    # Hedged LLM requests allowed per generation; NULL = server default
+    llm_hedge_budget: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow, onupdate=datetime.utcnow
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel
 import uuid
 
@@ -22,6 +24,9 @@ class ModlistGenerateRequest(BaseModel):
     available_storage_gb: int | None = None
     # User-supplied LLM credentials — tried in order, falls back on failure
     llm_credentials: list[LLMCredential] = []
+    # "agentic": a tool-calling loop per phase; "express": one call per phase
+    # picking from locally gathered candidates (falls back to agentic)
+    mode: Literal["agentic", "express"] = "agentic"
 
 
 class ModEntry(BaseModel):
@@ -189,9 +189,13 @@ async def seed_build_phases(
                 ModBuildPhase.phase_number == phase_data["phase_number"],
             )
         )
-        if not existing.scalar_one_or_none():
+        phase = existing.scalar_one_or_none()
+        if not phase:
             phase = ModBuildPhase(game_id=game_id, **phase_data)
             session.add(phase)
+        elif phase.depends_on is None and phase_data.get("depends_on") is not None:
+            # Phases seeded before dependencies existed
+            phase.depends_on = phase_data["depends_on"]
     await session.flush()
     print(f"  Phases: {len(phase_list)}")
 
@@ -240,6 +244,56 @@ async def _apply_migrations(conn) -> None:
     except Exception:
         pass
 
+    # Add depends_on to mod_build_phases for the phase DAG scheduler
+    try:
+        await conn.execute(text(
+            "ALTER TABLE mod_build_phases ADD COLUMN IF NOT EXISTS depends_on JSON"
+        ))
+        print("  Migration: added mod_build_phases.depends_on")
+    except Exception:
+        pass
+
+    # Add llm_hedge_budget to user_settings for hedged LLM requests
+    try:
+        await conn.execute(text(
+            "ALTER TABLE user_settings ADD COLUMN IF NOT EXISTS llm_hedge_budget INTEGER"
+        ))
+        print("  Migration: added user_settings.llm_hedge_budget")
+    except Exception:
+        pass
+
+    # Add generation_metrics to modlists for per-phase token/latency accounting
+    try:
+        await conn.execute(text(
+            "ALTER TABLE modlists ADD COLUMN IF NOT EXISTS generation_metrics JSON"
+        ))
+        print("  Migration: added modlists.generation_metrics")
+    except Exception:
+        pass
+
+    # Catalog search indexes (see app.services.mod_catalog). pg_trgm may not
+    # be creatable on managed databases; the savepoint keeps that failure
+    # from aborting the rest of this transaction.
+    try:
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_nexus_catalog_mods_fts ON nexus_catalog_mods "
+            "USING gin (to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(summary, '')))"
+        ))
+        print("  Migration: added nexus_catalog_mods full-text index")
+    except Exception:
+        pass
+    try:
+        async with conn.begin_nested():
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        print(f"  Migration: pg_trgm unavailable, skipping trigram index ({e})")
+    else:
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_nexus_catalog_mods_name_trgm "
+            "ON nexus_catalog_mods USING gin (name gin_trgm_ops)"
+        ))
+        print("  Migration: added nexus_catalog_mods trigram index")
+
 
 async def main():
     print("Creating database tables...")
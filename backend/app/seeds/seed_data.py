@@ -570,6 +570,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "SKSE, Address Library for SKSE Plugins, SSE Engine Fixes, Unofficial Skyrim Special Edition Patch, PapyrusUtil",
         "is_playstyle_driven": False,
         "max_mods": 5,
+        "depends_on": [],
     },
     {
         "phase_number": 2,
@@ -589,6 +590,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "SkyUI, MCM Helper, A Quality World Map, SkyHUD, moreHUD, TrueHUD",
         "is_playstyle_driven": False,
         "max_mods": 4,
+        "depends_on": [1],
     },
     {
         "phase_number": 3,
@@ -608,6 +610,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "Scrambled Bugs, Assorted mesh fixes, Unofficial Material Fix, powerofthree's Tweaks, Landscape Fixes For Grass Mods",
         "is_playstyle_driven": False,
         "max_mods": 5,
+        "depends_on": [1],
     },
     {
         "phase_number": 4,
@@ -629,6 +632,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "Static Mesh Improvement Mod, Skyrim Realistic Overhaul, Cathedral Landscapes, Majestic Mountains, RUSTIC CLOTHING",
         "is_playstyle_driven": False,
         "max_mods": 8,
+        "depends_on": [1],
     },
     {
         "phase_number": 5,
@@ -648,6 +652,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "XP32 Maximum Skeleton Special Extended, Dynamic Animation Replacer, Nemesis Unlimited Behavior Engine, Realistic Ragdolls and Force",
         "is_playstyle_driven": True,
         "max_mods": 4,
+        "depends_on": [1],
     },
     {
         "phase_number": 6,
@@ -667,6 +672,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "Immersive Sounds - Compendium, Audio Overhaul Skyrim, Sounds of Skyrim Complete, Musical Lore",
         "is_playstyle_driven": False,
         "max_mods": 3,
+        "depends_on": [1],
     },
     {
         "phase_number": 7,
@@ -692,6 +698,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "Ordinator, Apocalypse Magic, Wildcat Combat, Campfire, Frostfall, iNeed, Morrowloot Ultimate, CBBE, Growl",
         "is_playstyle_driven": True,
         "max_mods": 10,
+        "depends_on": [1, 2],
     },
     {
         "phase_number": 8,
@@ -711,6 +718,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "JK's Skyrim, Dawn of Skyrim, The Great Cities, Immersive College of Winterhold, Solitude Expansion",
         "is_playstyle_driven": True,
         "max_mods": 4,
+        "depends_on": [1],
     },
     {
         "phase_number": 9,
@@ -733,6 +741,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "Cathedral Weathers, Obsidian Weathers, Rudy ENB, Silent Horizons ENB, Lux, Window Shadows",
         "is_playstyle_driven": False,
         "max_mods": 3,
+        "depends_on": [1],
     },
     {
         "phase_number": 10,
@@ -755,6 +764,7 @@ SKYRIM_BUILD_PHASES = [
         "example_mods": "Bash Patch, Conflict Resolution Patch, various mod-specific patches",
         "is_playstyle_driven": False,
         "max_mods": 8,
+        "depends_on": None,  # waits for every other phase
     },
 ]
 
@@ -777,6 +787,7 @@ FALLOUT4_BUILD_PHASES = [
         "example_mods": "F4SE, Address Library for F4SE Plugins, High FPS Physics Fix, Buffout 4",
         "is_playstyle_driven": False,
         "max_mods": 5,
+        "depends_on": [],
     },
     {
         "phase_number": 2,
@@ -796,6 +807,7 @@ FALLOUT4_BUILD_PHASES = [
         "example_mods": "Unofficial Fallout 4 Patch, Buffout 4, Weapon Mod Fixes, Sprint Stuttering Fix, Previsibines Repair Pack",
         "is_playstyle_driven": False,
         "max_mods": 6,
+        "depends_on": [1],
     },
     {
         "phase_number": 3,
@@ -814,6 +826,7 @@ FALLOUT4_BUILD_PHASES = [
         "example_mods": "DEF_UI, FallUI, Full Dialogue Interface, Better Console, Extended Dialogue Interface",
         "is_playstyle_driven": False,
         "max_mods": 4,
+        "depends_on": [1],
     },
     {
         "phase_number": 4,
@@ -833,6 +846,7 @@ FALLOUT4_BUILD_PHASES = [
         "example_mods": "Classic Holstered Weapons, Bullet Counted Reload, Faster Workbench Exit, Simple Offence Suppression, Unlimited Survival Mode",
         "is_playstyle_driven": True,
         "max_mods": 5,
+        "depends_on": [1, 3],
     },
     {
         "phase_number": 5,
@@ -854,6 +868,7 @@ FALLOUT4_BUILD_PHASES = [
         "example_mods": "Vivid Fallout, FlaconOil's Retexture Project, Targeted Textures, Enhanced Vanilla Water",
         "is_playstyle_driven": False,
         "max_mods": 5,
+        "depends_on": [1],
     },
     {
         "phase_number": 6,
@@ -877,6 +892,7 @@ FALLOUT4_BUILD_PHASES = [
         "example_mods": "Loot Logic and Reduction, Encounter Zone Recalculation, Legendaries They Can Use, Who's The General, SPARS",
         "is_playstyle_driven": True,
         "max_mods": 8,
+        "depends_on": [1],
     },
     {
         "phase_number": 7,
@@ -896,6 +912,7 @@ FALLOUT4_BUILD_PHASES = [
         "example_mods": "You And What Army 2, Tales from the Commonwealth, Depravity, Outcasts and Remnants, Nuka-World Reborn",
         "is_playstyle_driven": True,
         "max_mods": 4,
+        "depends_on": [1],
     },
     {
         "phase_number": 8,
@@ -918,6 +935,7 @@ FALLOUT4_BUILD_PHASES = [
         "example_mods": "Lightweight Lighting, Fallout 4 Particle Patch, NAC X, True Storms, Ultra Interior Lighting",
         "is_playstyle_driven": False,
         "max_mods": 4,
+        "depends_on": [1, 5],
     },
     {
         "phase_number": 9,
@@ -939,5 +957,6 @@ FALLOUT4_BUILD_PHASES = [
         "example_mods": "Various mod-specific patches, combined patch files",
         "is_playstyle_driven": False,
         "max_mods": 6,
+        "depends_on": None,  # waits for every other phase
     },
 ]
@@ -29,3 +29,8 @@ class NexusServerError(Exception):
 class NexusExhaustedError(Exception):
     """All retry attempts for a Nexus API call failed."""
     pass
+
+
+class ExpressSelectionError(Exception):
+    """An express-mode answer failed local validation; the phase falls back to the agentic loop."""
+    pass
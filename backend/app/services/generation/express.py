@@ -0,0 +1,124 @@
+"""Express generation: one structured LLM call per discovery phase.
+
+The agentic loop costs 20-40 model round trips per phase. In express mode
+the candidates for a phase are gathered locally instead: the phase's
+example mods and "Focus on: ..." topics are searched through the same
+catalog / shared Nexus cache path search_nexus uses (usually already warm
+from lookahead), and the hits are ranked and filtered like search_nexus
+results. The model then answers once with a select_mods call naming its
+picks from that list; the call is forced through the provider's
+tool_choice, and a plain-text answer is still parsed as a fallback.
+
+The answer is validated locally: every pick must be a candidate, picked
+once, with a load order, and the phase's mod limit must be respected.
+Anything else raises ExpressSelectionError and the pipeline runs the
+agentic loop for that phase instead.
+"""
+
+import asyncio
+import json
+import logging
+
+from app.config import get_settings
+from app.models.mod_build_phase import ModBuildPhase
+
+from .exceptions import ExpressSelectionError
+from .handlers import search_mods
+from .lookahead import extract_phase_queries
+from .ranking import rank_search_results
+from .session import GenerationSession
+
+logger = logging.getLogger(__name__)
+
+
+async def gather_candidates(
+    session: GenerationSession,
+    phase: ModBuildPhase,
+    max_queries: int | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """Search a phase's predicted queries and return the best hits, ranked."""
+    settings = get_settings()
+    max_queries = max_queries if max_queries is not None else settings.express_max_queries
+    limit = limit if limit is not None else settings.express_candidate_limit
+    examples, topics = extract_phase_queries(phase)
+    queries = (examples + topics)[:max(1, max_queries)] or [phase.name]
+    semaphore = asyncio.Semaphore(max(1, settings.nexus_lookahead_concurrency))
+
+    async def search(query: str) -> list[dict]:
+        async with semaphore:
+            return await search_mods(session, query)
+
+    hits: dict[int, dict] = {}
+    for query, found in zip(queries, await asyncio.gather(
+        *(search(q) for q in queries), return_exceptions=True,
+    )):
+        if isinstance(found, BaseException):
+            logger.debug("Express candidate search '%s' failed: %s", query, found)
+            continue
+        for mod in found:
+            hits.setdefault(mod["modId"], mod)
+
+    ranked, _ = rank_search_results(
+        session, list(hits.values()), top_n=limit, now=session.ranking_now,
+    )
+    for mod in ranked:
+        session.author_cache.setdefault(mod["modId"], mod.get("author", "Unknown"))
+    return ranked
+
+
+def parse_selection(message: dict) -> dict | None:
+    """The select_mods arguments of an assistant message (or a JSON text answer)."""
+    for call in message.get("tool_calls") or []:
+        if call["function"]["name"] == "select_mods":
+            try:
+                return json.loads(call["function"]["arguments"] or "{}")
+            except ValueError:
+                return None
+    text = message.get("content") or ""
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return None
+    try:
+        return json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+
+
+def validate_selection(selection: dict | None, candidates: list[dict], max_mods: int) -> list[dict]:
+    """Turn a select_mods answer into modlist entries, or raise ExpressSelectionError."""
+    if not isinstance(selection, dict) or not isinstance(selection.get("mods"), list):
+        raise ExpressSelectionError("no select_mods answer")
+    picks = selection["mods"]
+    if not picks:
+        raise ExpressSelectionError("no mods selected")
+    if len(picks) > max_mods:
+        raise ExpressSelectionError(f"{len(picks)} mods selected, limit is {max_mods}")
+
+    by_id = {c["modId"]: c for c in candidates}
+    entries: list[dict] = []
+    for pick in picks:
+        mod_id = pick.get("mod_id") if isinstance(pick, dict) else None
+        if mod_id not in by_id:
+            raise ExpressSelectionError(f"mod {mod_id} is not a candidate")
+        if any(e["nexus_mod_id"] == mod_id for e in entries):
+            raise ExpressSelectionError(f"mod {mod_id} selected twice")
+        if not isinstance(pick.get("load_order"), int):
+            raise ExpressSelectionError(f"mod {mod_id} has no load_order")
+        mod = by_id[mod_id]
+        entries.append({
+            "nexus_mod_id": mod_id,
+            "name": mod["name"],
+            "author": mod.get("author", ""),
+            "summary": (mod.get("summary") or "")[:200],
+            "reason": str(pick.get("reason") or ""),
+            "load_order": pick["load_order"],
+            "estimated_size_mb": 0,
+            "is_patch": False,
+        })
+    return sorted(entries, key=lambda e: e["load_order"])
+
+
+async def accept_selection(**_: object) -> str:
+    """select_mods handler: the answer is read from the assistant message."""
+    return json.dumps({"status": "received"})
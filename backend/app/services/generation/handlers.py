@@ -9,13 +9,29 @@ import json
 import logging
 from typing import Callable
 
+from app.llm.provider import read_only
 from app.services.nexus_client import NexusAPIError
+from app.services.nexus_rate_limiter import NexusRateLimiter
 
 from .exceptions import NexusExhaustedError
+from .prefetch import DetailPrefetcher
+from .ranking import rank_search_results
 from .session import GenerationSession, strip_html
+from .tools import BULK_MAX_ITEMS
 
 logger = logging.getLogger(__name__)
 
+# Fields of one bulk entry and their types; the first four are required
+_MOD_FIELDS = {
+    "mod_id": int, "name": str, "reason": str, "load_order": int,
+    "author": str, "summary": str, "estimated_size_mb": int,
+}
+_PATCH_FIELDS = {
+    "mod_id": int, "name": str, "reason": str, "load_order": int,
+    "patches_mods": list, "author": str,
+}
+_REQUIRED = ("mod_id", "name", "reason", "load_order")
+
 
 def emit(callback: Callable[[dict], None] | None, event_type: str, data: dict, debug_data: dict | None = None) -> None:
     """Emit an event if a callback is provided.
@@ -35,10 +51,14 @@ async def retry_nexus(
     coro_fn: Callable,
     max_retries: int = 3,
     event_callback: Callable[[dict], None] | None = None,
+    limiter: NexusRateLimiter | None = None,
 ) -> object:
     """Retry a Nexus API call with exponential backoff.
 
     Handles rate limits (429) and server errors (5xx) by retrying.
+    With a limiter, a 429 waits for the Retry-After/reset time Nexus
+    reported instead of a fixed backoff; the limiter holds every caller
+    on the key for that long, so the retry itself doesn't sleep.
     NexusAPIError (GraphQL errors) are NOT retried — they indicate
     query/auth problems, not transient failures.
     If all retries fail, raises NexusExhaustedError so the LLM can
@@ -55,14 +75,20 @@ async def retry_nexus(
             status = e.response.status_code
             if status == 429:
                 if attempt < max_retries - 1:
-                    wait = 2 ** attempt * 5  # 5s, 10s, 20s
+                    wait = limiter.cooldown_remaining() if limiter else 0.0
+                    if not wait:
+                        wait = 2 ** attempt * 5  # 5s, 10s, 20s
                     emit(event_callback, "retrying", {
                         "reason": "nexus_rate_limit",
-                        "wait_seconds": wait,
+                        "wait_seconds": round(wait, 1),
                         "attempt": attempt + 1,
                         "max_attempts": max_retries,
                     })
-                    await asyncio.sleep(wait)
+                    if limiter:
+                        emit(event_callback, "nexus_budget", limiter.snapshot())
+                        limiter.block_for(wait)
+                    else:
+                        await asyncio.sleep(wait)
                     continue
             elif status >= 500:
                 if attempt < max_retries - 1:
@@ -92,29 +118,154 @@ async def retry_nexus(
     raise NexusExhaustedError("All Nexus retries failed")
 
 
+async def warm_description_cache(
+    session: GenerationSession,
+    mod_ids: list[int],
+    event_callback: Callable[[dict], None] | None = None,
+) -> int:
+    """Batch-fetch descriptions for mods the model is about to review.
+
+    Used before the patch phase so that get_mod_description calls are
+    answered from session.description_cache instead of one Nexus round
+    trip each. Returns the number of descriptions added. Failures are
+    logged and ignored — the per-mod handler still fetches on demand.
+    """
+    wanted = [m for m in dict.fromkeys(mod_ids) if m and m not in session.description_cache]
+    if not wanted:
+        return 0
+    try:
+        details = await retry_nexus(
+            lambda: session.nexus.get_mods_details_batch(session.game_domain, wanted),
+            event_callback=event_callback,
+            limiter=session.nexus.rate_limiter,
+        )
+    except Exception as e:
+        logger.warning(f"Batch description prefetch failed: {e}")
+        return 0
+
+    added = 0
+    for mod_id, mod in details.items():
+        if not mod:
+            continue
+        session.description_cache[mod_id] = strip_html(mod.get("description") or "")
+        session.author_cache.setdefault(mod_id, mod.get("author", "Unknown"))
+        added += 1
+    logger.debug("Prefetched %d/%d mod descriptions in batch", added, len(wanted))
+    return added
+
+
+async def search_mods(
+    session: GenerationSession,
+    query: str,
+    sort_by: str = "endorsements",
+    event_callback: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Search the local mod catalog first, falling back to live Nexus.
+
+    The catalog answers when it is fresh and has matches; otherwise the
+    query goes to Nexus with retries.
+    """
+    if session.catalog is not None:
+        results = await session.catalog.search(session.game_domain, query, sort_by=sort_by)
+        if results is not None:
+            return results
+    return await retry_nexus(
+        lambda: session.nexus.search_mods(session.game_domain, query, sort_by=sort_by),
+        event_callback=event_callback,
+        limiter=session.nexus.rate_limiter,
+    )
+
+
+def _item_id(item: object) -> object:
+    return item.get("mod_id") if isinstance(item, dict) else item
+
+
+def _entry_error(item: object, fields: dict[str, type]) -> str | None:
+    """Why one bulk entry is invalid, or None if it can be added."""
+    if not isinstance(item, dict):
+        return "expected an object"
+    missing = [f for f in _REQUIRED if f not in item]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    for field, kind in fields.items():
+        value = item.get(field)
+        if field in item and (not isinstance(value, kind) or isinstance(value, bool)):
+            return f"{field} must be {'an integer' if kind is int else f'a {kind.__name__}'}"
+    if not item["name"].strip():
+        return "name is empty"
+    if "patches_mods" in item and not all(isinstance(m, str) for m in item["patches_mods"]):
+        return "patches_mods must be a list of mod names"
+    return None
+
+
+def _check_bulk(items: object, check: Callable[[object], str | None]) -> list[tuple[object, str | None]]:
+    """Pair each item of a bulk call with its error, or None if it is valid.
+
+    Items past BULK_MAX_ITEMS and repeats of an earlier mod ID are errors
+    too; the rest are judged by `check`.
+    """
+    if not isinstance(items, list):
+        items = [items]
+    seen: set = set()
+    checked = []
+    for index, item in enumerate(items):
+        if index >= BULK_MAX_ITEMS:
+            error = f"over the per-call limit of {BULK_MAX_ITEMS}"
+        else:
+            error = check(item)
+        if error is None:
+            if _item_id(item) in seen:
+                error = "duplicate in this call"
+            seen.add(_item_id(item))
+        checked.append((item, error))
+    return checked
+
+
+def finish_prefetch(
+    session: GenerationSession,
+    event_callback: Callable[[dict], None] | None = None,
+) -> None:
+    """Cancel a phase's outstanding detail prefetches and report their metrics."""
+    prefetcher = session.prefetcher
+    if prefetcher is None:
+        return
+    prefetcher.cancel()
+    stats = prefetcher.stats()
+    logger.debug("Detail prefetch metrics: %s", stats)
+    emit(event_callback, "prefetch_metrics", {}, debug_data=stats)
+    session.prefetcher = None
+
+
 def build_phase1_handlers(
     session: GenerationSession,
     event_callback: Callable[[dict], None] | None = None,
 ) -> dict:
-    """Build tool handler functions for discovery phases (search + add mods)."""
+    """Build tool handler functions for discovery phases (search + add mods).
+
+    Lookups are marked @read_only so the provider may run several from one
+    turn concurrently; modlist mutations stay serialized. Search hits are
+    ranked locally and only the best are returned; each search starts a
+    background prefetch of its top hits' details.
+    """
+    if session.prefetcher is None:
+        session.prefetcher = DetailPrefetcher()
 
+    @read_only
     async def search_nexus(query: str, sort_by: str = "endorsements") -> str:
         emit(event_callback, "searching", {"query": query})
         try:
-            results = await retry_nexus(
-                lambda: session.nexus.search_mods(session.game_domain, query, sort_by=sort_by),
-                event_callback=event_callback,
-            )
+            results = await search_mods(session, query, sort_by, event_callback)
         except Exception as e:
             logger.warning(f"Nexus search failed after retries: {e}")
             return json.dumps({"error": "Search temporarily unavailable. Try a different query."})
 
+        ranked, filtered = rank_search_results(session, results, now=session.ranking_now)
         mods = []
-        for m in results[:15]:
+        for m in ranked:
             author = m.get("author", "Unknown")
             mod_id = m["modId"]
             session.author_cache[mod_id] = author
-            mods.append({
+            mod = {
                 "mod_id": mod_id,
                 "name": m["name"],
                 "author": author,
@@ -122,21 +273,37 @@ def build_phase1_handlers(
                 "endorsements": m.get("endorsements", 0),
                 "category": m.get("modCategory", {}).get("name", ""),
                 "updated": m.get("updatedAt", ""),
-            })
+            }
+            known = session.known_mods.get(mod_id)
+            if known and known["performance_impact"]:
+                mod["impact"] = known["performance_impact"]
+            if known and known["vram_requirement_mb"]:
+                mod["vram_mb"] = known["vram_requirement_mb"]
+            mods.append(mod)
         all_names = [m["name"] for m in mods]
         logger.debug("Search '%s' returned %d results: %s", query, len(mods), all_names)
         emit(event_callback, "search_results", {
             "count": len(mods),
             "sample_names": all_names[:5],
         }, debug_data={"all_names": all_names})
-        return json.dumps({"results": mods, "count": len(mods)})
-
+        # The model usually reads the top hits next — fetch them while it thinks
+        session.prefetcher.schedule(session, [m["mod_id"] for m in mods])
+        payload = {"results": mods, "count": len(mods)}
+        if filtered["already_added"]:
+            payload["already_in_modlist"] = filtered["already_added"]
+        if filtered["incompatible"]:
+            payload["skipped_incompatible"] = filtered["incompatible"]
+        return json.dumps(payload)
+
+    @read_only
     async def get_mod_details(mod_id: int) -> str:
         emit(event_callback, "reading_mod", {"mod_id": mod_id})
+        await session.prefetcher.wait_for(mod_id)
         try:
             details = await retry_nexus(
                 lambda: session.nexus.get_mod_details(session.game_domain, mod_id),
                 event_callback=event_callback,
+                limiter=session.nexus.rate_limiter,
             )
         except Exception as e:
             logger.warning(f"Nexus get_mod_details failed after retries: {e}")
@@ -144,25 +311,56 @@ def build_phase1_handlers(
 
         if not details:
             return json.dumps({"error": f"Mod {mod_id} not found"})
-        desc_html = details.get("description") or ""
-        desc_text = strip_html(desc_html)
+        return json.dumps(describe(details))
+
+    @read_only
+    async def get_mods_details(mod_ids: list[int]) -> str:
+        checked = _check_bulk(mod_ids, lambda m: (
+            None if isinstance(m, int) and not isinstance(m, bool) else "expected a mod ID"
+        ))
+        wanted = [mod_id for mod_id, error in checked if error is None]
+        for mod_id in wanted:
+            emit(event_callback, "reading_mod", {"mod_id": mod_id})
+        await asyncio.gather(*(session.prefetcher.wait_for(m) for m in wanted))
+        try:
+            details = await retry_nexus(
+                lambda: session.nexus.get_mods_details_batch(session.game_domain, wanted),
+                event_callback=event_callback,
+                limiter=session.nexus.rate_limiter,
+            ) if wanted else {}
+        except Exception as e:
+            logger.warning(f"Nexus get_mods_details failed after retries: {e}")
+            return json.dumps({"error": "Could not fetch these mods. Try again with fewer IDs."})
+
+        results = []
+        for mod_id, error in checked:
+            if error is None and details.get(mod_id):
+                results.append(describe(details[mod_id]))
+            else:
+                results.append({"mod_id": mod_id, "error": error or "not found"})
+        return json.dumps({"results": results, "count": len(results)})
+
+    def describe(details: dict) -> dict:
+        """A mod's details for the model; caches its description and author."""
+        mod_id = details["modId"]
+        desc_text = strip_html(details.get("description") or "")
         session.description_cache[mod_id] = desc_text
         author = details.get("author", "Unknown")
         session.author_cache[mod_id] = author
-        return json.dumps({
-            "mod_id": details["modId"],
+        return {
+            "mod_id": mod_id,
             "name": details["name"],
             "author": author,
             "summary": details.get("summary", ""),
             "description": desc_text,
             "endorsements": details.get("endorsements", 0),
             "category": details.get("modCategory", {}).get("name", ""),
-        })
+        }
 
-    async def add_to_modlist(
+    def add_entry(
         mod_id: int, name: str, reason: str, load_order: int,
         author: str = "", summary: str = "", estimated_size_mb: int = 0,
-    ) -> str:
+    ) -> None:
         resolved_author = author or session.author_cache.get(mod_id, "")
         entry = {
             "nexus_mod_id": mod_id,
@@ -183,12 +381,40 @@ def build_phase1_handlers(
             "reason": reason,
             "load_order": load_order,
         })
+
+    async def add_to_modlist(
+        mod_id: int, name: str, reason: str, load_order: int,
+        author: str = "", summary: str = "", estimated_size_mb: int = 0,
+    ) -> str:
+        add_entry(mod_id, name, reason, load_order, author, summary, estimated_size_mb)
         return json.dumps({
             "status": "added",
             "name": name,
             "current_count": len(session.modlist),
         })
 
+    async def add_mods_to_modlist(mods: list[dict]) -> str:
+        present = {e.get("nexus_mod_id") for e in session.modlist}
+
+        def check(item: object) -> str | None:
+            error = _entry_error(item, _MOD_FIELDS)
+            if error is None and item["mod_id"] in present:
+                return "already in the modlist"
+            return error
+
+        results = []
+        for item, error in _check_bulk(mods, check):
+            if error:
+                results.append({"mod_id": _item_id(item), "status": "error", "error": error})
+                continue
+            add_entry(**{k: v for k, v in item.items() if k in _MOD_FIELDS})
+            results.append({"mod_id": item["mod_id"], "status": "added", "name": item["name"]})
+        return json.dumps({
+            "results": results,
+            "added": sum(r["status"] == "added" for r in results),
+            "current_count": len(session.modlist),
+        })
+
     async def finalize() -> str:
         session.finalized = True
         return json.dumps({
@@ -199,7 +425,9 @@ def build_phase1_handlers(
     return {
         "search_nexus": search_nexus,
         "get_mod_details": get_mod_details,
+        "get_mods_details": get_mods_details,
         "add_to_modlist": add_to_modlist,
+        "add_mods_to_modlist": add_mods_to_modlist,
         "finalize": finalize,
     }
 
@@ -210,6 +438,7 @@ def build_phase2_handlers(
 ) -> dict:
     """Build tool handler functions for the compatibility patches phase."""
 
+    @read_only
     async def get_mod_description(mod_id: int) -> str:
         emit(event_callback, "reading_mod", {"mod_id": mod_id})
         if mod_id in session.description_cache:
@@ -218,6 +447,7 @@ def build_phase2_handlers(
             details = await retry_nexus(
                 lambda: session.nexus.get_mod_details(session.game_domain, mod_id),
                 event_callback=event_callback,
+                limiter=session.nexus.rate_limiter,
             )
         except Exception as e:
             logger.warning(f"Nexus get_mod_details failed after retries: {e}")
@@ -229,13 +459,11 @@ def build_phase2_handlers(
         session.description_cache[mod_id] = desc_text
         return json.dumps({"mod_id": mod_id, "description": desc_text})
 
+    @read_only
     async def search_patches(query: str) -> str:
         emit(event_callback, "searching", {"query": query})
         try:
-            results = await retry_nexus(
-                lambda: session.nexus.search_mods(session.game_domain, query, sort_by="endorsements"),
-                event_callback=event_callback,
-            )
+            results = await search_mods(session, query, "endorsements", event_callback)
         except Exception as e:
             logger.warning(f"Nexus search_patches failed after retries: {e}")
             return json.dumps({"error": "Patch search temporarily unavailable."})
@@ -260,10 +488,10 @@ def build_phase2_handlers(
         }, debug_data={"all_names": all_patch_names})
         return json.dumps({"results": patches, "count": len(patches)})
 
-    async def add_patch(
+    def add_patch_entry(
         mod_id: int, name: str, patches_mods: list[str], reason: str,
         load_order: int, author: str = "",
-    ) -> str:
+    ) -> None:
         resolved_author = author or session.author_cache.get(mod_id, "")
         entry = {
             "nexus_mod_id": mod_id,
@@ -282,8 +510,37 @@ def build_phase2_handlers(
             "name": name,
             "patches_mods": patches_mods,
         })
+
+    async def add_patch(
+        mod_id: int, name: str, patches_mods: list[str], reason: str,
+        load_order: int, author: str = "",
+    ) -> str:
+        add_patch_entry(mod_id, name, patches_mods, reason, load_order, author)
         return json.dumps({"status": "patch_added", "name": name})
 
+    async def add_patches(patches: list[dict]) -> str:
+        present = {e.get("nexus_mod_id") for e in session.patches}
+
+        def check(item: object) -> str | None:
+            error = _entry_error(item, _PATCH_FIELDS)
+            if error is None and "patches_mods" not in item:
+                return "missing patches_mods"
+            if error is None and item["mod_id"] in present:
+                return "already added"
+            return error
+
+        results = []
+        for item, error in _check_bulk(patches, check):
+            if error:
+                results.append({"mod_id": _item_id(item), "status": "error", "error": error})
+                continue
+            add_patch_entry(**{k: v for k, v in item.items() if k in _PATCH_FIELDS})
+            results.append({"mod_id": item["mod_id"], "status": "patch_added", "name": item["name"]})
+        return json.dumps({
+            "results": results,
+            "added": sum(r["status"] == "patch_added" for r in results),
+        })
+
     async def flag_user_knowledge(
         mod_a: str, mod_b: str, issue: str, severity: str = "warning",
     ) -> str:
@@ -314,6 +571,7 @@ def build_phase2_handlers(
         "get_mod_description": get_mod_description,
         "search_patches": search_patches,
         "add_patch": add_patch,
+        "add_patches": add_patches,
         "flag_user_knowledge": flag_user_knowledge,
         "finalize_review": finalize_review,
     }
@@ -0,0 +1,103 @@
+"""Phase lookahead: warm Nexus caches for the next phase while one runs.
+
+Each ModBuildPhase's `example_mods` and the "Focus on: ..." list in its
+`search_guidance` predict the first searches the model will make in that
+phase. While phase N's LLM loop runs, PhaseLookahead resolves those
+queries for phase N+1 in the background, through the same catalog/shared
+cache path search_nexus uses, and batch-fetches the details of the top hit
+for each example mod. Phase N+1 then starts with warm caches.
+
+Lookahead is optional work: it stops issuing requests while the key's
+rate budget is constrained and is cancelled when generation ends.
+"""
+
+import asyncio
+import logging
+import re
+
+from app.config import get_settings
+from app.models.mod_build_phase import ModBuildPhase
+
+from .handlers import search_mods
+from .session import GenerationSession
+
+logger = logging.getLogger(__name__)
+
+_FOCUS_RE = re.compile(r"Focus on:\s*(.+?)(?:\.(?:\s|$)|$)", re.IGNORECASE | re.DOTALL)
+
+
+def _split_list(text: str, conjunctions: bool = True) -> list[str]:
+    """Split "a, b, and c" into ["a", "b", "c"], dropping parentheticals."""
+    text = re.sub(r"\([^)]*\)", "", text)
+    parts = re.split(r",|\band\b|\bor\b" if conjunctions else ",", text)
+    return [" ".join(p.split()) for p in parts if p.strip()]
+
+
+def extract_phase_queries(phase: ModBuildPhase) -> tuple[list[str], list[str]]:
+    """Predict a phase's searches: (example mod names, guidance topics)."""
+    examples = [name for name in _split_list(phase.example_mods or "", conjunctions=False) if len(name) > 2]
+    topics: list[str] = []
+    for match in _FOCUS_RE.finditer(phase.search_guidance or ""):
+        topics.extend(t for t in _split_list(match.group(1)) if 2 < len(t) <= 40)
+    seen = {e.lower() for e in examples}
+    topics = [t for t in dict.fromkeys(topics) if t.lower() not in seen]
+    return list(dict.fromkeys(examples)), topics
+
+
+class PhaseLookahead:
+    """Runs at most one background warm-up for an upcoming phase at a time."""
+
+    def __init__(self, max_queries: int | None = None, concurrency: int | None = None):
+        settings = get_settings()
+        self.max_queries = max_queries if max_queries is not None else settings.nexus_lookahead_max_queries
+        self.concurrency = concurrency if concurrency is not None else settings.nexus_lookahead_concurrency
+        self._task: asyncio.Task | None = None
+        self._phase_number: int | None = None
+
+    def start(self, session: GenerationSession, phase: ModBuildPhase) -> None:
+        """Begin warming caches for `phase` (no-op if already warming it).
+
+        A warm-up still running for another phase is cancelled first.
+        """
+        if self.max_queries <= 0 or self._phase_number == phase.phase_number:
+            return
+        self.cancel()
+        self._phase_number = phase.phase_number
+        self._task = asyncio.ensure_future(self._warm(session, phase))
+        self._task.add_done_callback(self._done)
+
+    async def _warm(self, session: GenerationSession, phase: ModBuildPhase) -> dict:
+        examples, topics = extract_phase_queries(phase)
+        queries = (examples + topics)[:self.max_queries]
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        stats = {"phase": phase.phase_number, "searched": 0, "skipped": 0, "details": 0}
+        example_hits: list[int] = []
+
+        async def resolve(query: str) -> None:
+            async with semaphore:
+                if session.nexus.rate_limiter.is_constrained():
+                    stats["skipped"] += 1
+                    return
+                results = await search_mods(session, query)
+                stats["searched"] += 1
+                if query in examples and results:
+                    example_hits.append(results[0]["modId"])
+
+        await asyncio.gather(*(resolve(q) for q in queries), return_exceptions=True)
+
+        wanted = [m for m in dict.fromkeys(example_hits) if m not in session.description_cache]
+        if wanted and not session.nexus.rate_limiter.is_constrained():
+            details = await session.nexus.get_mods_details_batch(session.game_domain, wanted)
+            stats["details"] = sum(1 for d in details.values() if d)
+        logger.debug("Lookahead for phase %d: %s", phase.phase_number, stats)
+        return stats
+
+    def _done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Phase lookahead failed: %s", task.exception())
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._phase_number = None
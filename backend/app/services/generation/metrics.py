@@ -0,0 +1,95 @@
+"""Per-phase token, latency and tool-call accounting.
+
+PhaseMetrics collects what one phase's LLM loop cost: token usage as
+reported by the provider (input, output, cached), model response time per
+iteration, tool calls by name with the time spent in their handlers
+(mostly Nexus lookups), and how long the loop sat waiting on tool results
+after the model had answered. Tool handlers start while responses are
+still streaming, so handler time and LLM time overlap; tool_wait_seconds
+is the part of the tool time that was not hidden.
+
+The summary is emitted as a `phase_metrics` event and stored with the
+modlist, giving a baseline for tuning max_iterations, prompt size and
+provider ordering.
+"""
+
+import functools
+import time
+
+from app.llm.provider import ToolHandler
+
+_TOKEN_FIELDS = ("input_tokens", "output_tokens", "cached_tokens")
+
+
+class PhaseMetrics:
+    """Accumulates one phase's usage across iterations and provider attempts."""
+
+    def __init__(self, phase_number: int, name: str):
+        self.phase_number = phase_number
+        self.name = name
+        self.started = time.monotonic()
+        self.tokens = dict.fromkeys(_TOKEN_FIELDS, 0)
+        self.llm_calls = 0
+        self.turn_seconds: list[float] = []
+        self.tool_wait_seconds = 0.0
+        self.tool_calls: dict[str, int] = {}
+        self.tool_seconds: dict[str, float] = {}
+        self.attempts = 0
+
+    def on_usage(self, usage: dict) -> None:
+        self.llm_calls += 1
+        for key in _TOKEN_FIELDS:
+            self.tokens[key] += usage.get(key) or 0
+
+    def on_turn(self, turn: dict) -> None:
+        self.turn_seconds.append(turn["llm_seconds"])
+        self.tool_wait_seconds += turn["tool_wait_seconds"]
+
+    def wrap_handlers(self, handlers: dict[str, ToolHandler]) -> dict[str, ToolHandler]:
+        """Handlers that count calls and time themselves (read_only is kept)."""
+        return {name: self._timed(name, handler) for name, handler in handlers.items()}
+
+    def _timed(self, name: str, handler: ToolHandler) -> ToolHandler:
+        @functools.wraps(handler)
+        async def timed(*args, **kwargs) -> str:
+            started = time.monotonic()
+            try:
+                return await handler(*args, **kwargs)
+            finally:
+                self.tool_calls[name] = self.tool_calls.get(name, 0) + 1
+                self.tool_seconds[name] = self.tool_seconds.get(name, 0.0) + time.monotonic() - started
+        return timed
+
+    def summary(self, provider: str | None = None) -> dict:
+        turns = sorted(self.turn_seconds)
+        return {
+            "number": self.phase_number,
+            "phase": self.name,
+            "provider": provider,
+            "attempts": self.attempts,
+            "iterations": len(turns),
+            "llm_calls": self.llm_calls,
+            **self.tokens,
+            "wall_seconds": round(time.monotonic() - self.started, 3),
+            "llm_seconds": round(sum(turns), 3),
+            "max_turn_seconds": round(turns[-1], 3) if turns else 0.0,
+            "tool_seconds": round(sum(self.tool_seconds.values()), 3),
+            "tool_wait_seconds": round(self.tool_wait_seconds, 3),
+            "tool_calls": dict(sorted(self.tool_calls.items())),
+            "tool_seconds_by_name": {k: round(v, 3) for k, v in sorted(self.tool_seconds.items())},
+        }
+
+
+def total_metrics(phases: list[dict]) -> dict:
+    """Generation-wide totals of per-phase summaries."""
+    totals: dict = {key: sum(p.get(key, 0) for p in phases) for key in (
+        *_TOKEN_FIELDS, "llm_calls", "iterations",
+    )}
+    for key in ("llm_seconds", "tool_seconds", "tool_wait_seconds"):
+        totals[key] = round(sum(p.get(key, 0.0) for p in phases), 3)
+    tool_calls: dict[str, int] = {}
+    for phase in phases:
+        for name, count in phase.get("tool_calls", {}).items():
+            tool_calls[name] = tool_calls.get(name, 0) + count
+    totals["tool_calls"] = dict(sorted(tool_calls.items()))
+    return totals
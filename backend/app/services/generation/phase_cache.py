@@ -0,0 +1,191 @@
+"""Warm-start generation from cached phase results.
+
+Framework and essentials phases (SKSE, Address Library, USSEP, Buffout 4,
+...) come out nearly the same every time for a given game and version, yet
+each generation spends a full LLM tool loop on them. PhaseCache stores what
+a discovery phase added in the phase_result_cache table, keyed by game,
+game version, phase number, hardware tier and, when the phase or one it
+depends on is playstyle-driven, the playstyle. A later generation with the
+same inputs replays the stored output instead of calling an LLM.
+
+An entry is used only while it is younger than `phase_cache_ttl_hours` and
+every mod in it still has the Nexus updatedAt recorded when it was stored;
+a mod that was updated, hidden or removed sends the phase back to the LLM.
+Cache reads and writes use their own DB session on the generation's engine,
+so a failed write can't expire the objects the pipeline is working with;
+failures are logged and never fail a generation.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.phase_result_cache import PhaseResultCache
+
+from .session import GenerationSession, strip_html
+
+logger = logging.getLogger(__name__)
+
+
+def phase_cache_key(
+    game_id: int,
+    game_version: str | None,
+    phase_number: int,
+    hardware_tier: str,
+    playstyle_id: int | None,
+) -> str:
+    """Stable hash of everything a cached phase result depends on."""
+    raw = json.dumps([game_id, game_version or "", phase_number, hardware_tier, playstyle_id])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def phase_output(phase_session: GenerationSession, base: GenerationSession) -> dict:
+    """What a forked phase session added on top of the base it started from."""
+    return {
+        "modlist": phase_session.modlist[len(base.modlist):],
+        "patches": phase_session.patches[len(base.patches):],
+        "knowledge_flags": phase_session.knowledge_flags[len(base.knowledge_flags):],
+    }
+
+
+def _mod_ids(output: dict) -> list[int]:
+    return [
+        e["nexus_mod_id"] for e in output.get("modlist", []) + output.get("patches", [])
+        if e.get("nexus_mod_id")
+    ]
+
+
+class PhaseCache:
+    """Loads and stores one generation's cached phase results."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        session: GenerationSession,
+        game_id: int,
+        game_version: str | None,
+        hardware_tier: str,
+        playstyle_id: int,
+        playstyle_phases: set[int],
+    ):
+        self.bind = db.bind
+        self.session = session
+        self.game_id = game_id
+        self.game_version = game_version or ""
+        self.hardware_tier = hardware_tier
+        self.playstyle_id = playstyle_id
+        # Phases whose output depends on the playstyle (directly or via a dependency)
+        self.playstyle_phases = playstyle_phases
+
+    def _playstyle_for(self, phase_number: int) -> int | None:
+        return self.playstyle_id if phase_number in self.playstyle_phases else None
+
+    def key(self, phase_number: int) -> str:
+        return phase_cache_key(
+            self.game_id, self.game_version, phase_number,
+            self.hardware_tier, self._playstyle_for(phase_number),
+        )
+
+    async def load(self, phase_numbers: list[int]) -> dict[int, dict]:
+        """Fresh cached outputs for the given phases, by phase number.
+
+        Expired entries and entries with changed mods are deleted. The
+        freshness check fetches every cached mod's details in one batch,
+        which also fills the session's description/author caches.
+        """
+        keys = {self.key(n): n for n in phase_numbers}
+        if not keys:
+            return {}
+        try:
+            async with AsyncSession(self.bind, expire_on_commit=False) as db:
+                return await self._load(db, keys)
+        except Exception as e:
+            logger.warning("Phase cache lookup failed, running phases live: %s", e)
+            return {}
+
+    async def _load(self, db: AsyncSession, keys: dict[str, int]) -> dict[int, dict]:
+        result = await db.execute(
+            select(PhaseResultCache).where(PhaseResultCache.cache_key.in_(keys))
+        )
+        rows = list(result.scalars().all())
+        if not rows:
+            return {}
+
+        cutoff = datetime.utcnow() - timedelta(hours=get_settings().phase_cache_ttl_hours)
+        stale = {r.cache_key for r in rows if r.created_at < cutoff}
+        live = [r for r in rows if r.cache_key not in stale]
+        mod_ids = [m for r in live for m in _mod_ids(r.output)]
+        details = await self.session.nexus.get_mods_details_batch(
+            self.session.game_domain, mod_ids,
+        ) if mod_ids else {}
+
+        for mod_id, mod in details.items():
+            if mod:
+                self.session.description_cache[mod_id] = strip_html(mod.get("description") or "")
+                self.session.author_cache.setdefault(mod_id, mod.get("author", "Unknown"))
+
+        fresh: dict[int, dict] = {}
+        for row in live:
+            changed = [
+                m for m in _mod_ids(row.output)
+                if not details.get(m)
+                or details[m].get("updatedAt") != row.mod_updated_at.get(str(m))
+            ]
+            if changed:
+                logger.info("Phase %d cache entry is stale, mods changed on Nexus: %s",
+                            row.phase_number, changed)
+                stale.add(row.cache_key)
+            else:
+                fresh[row.phase_number] = row.output
+
+        if stale:
+            await db.execute(
+                delete(PhaseResultCache).where(PhaseResultCache.cache_key.in_(stale))
+            )
+            await db.commit()
+        return fresh
+
+    async def store(self, outputs: dict[int, dict]) -> int:
+        """Save phase outputs, with their mods' current Nexus updatedAt.
+
+        Outputs with a mod whose updatedAt is unknown are skipped. Returns
+        the number of entries written.
+        """
+        outputs = {n: o for n, o in outputs.items() if _mod_ids(o)}
+        if not outputs:
+            return 0
+        try:
+            details = await self.session.nexus.get_mods_details_batch(
+                self.session.game_domain, [m for o in outputs.values() for m in _mod_ids(o)],
+            )
+            stored = 0
+            async with AsyncSession(self.bind, expire_on_commit=False) as db:
+                for phase_number, output in outputs.items():
+                    updated_at = {
+                        str(m): (details.get(m) or {}).get("updatedAt") for m in _mod_ids(output)
+                    }
+                    if not all(updated_at.values()):
+                        continue
+                    await db.merge(PhaseResultCache(
+                        cache_key=self.key(phase_number),
+                        game_id=self.game_id,
+                        game_version=self.game_version,
+                        phase_number=phase_number,
+                        hardware_tier=self.hardware_tier,
+                        playstyle_id=self._playstyle_for(phase_number),
+                        output=output,
+                        mod_updated_at=updated_at,
+                        created_at=datetime.utcnow(),
+                    ))
+                    stored += 1
+                await db.commit()
+            logger.debug("Cached %d phase result(s)", stored)
+            return stored
+        except Exception as e:
+            logger.warning("Storing phase results failed: %s", e)
+            return 0
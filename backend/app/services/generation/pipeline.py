@@ -3,14 +3,20 @@
 Contains the phased agentic generation loop and the legacy two-phase fallback.
 """
 
+import asyncio
 import logging
+import time
+from datetime import datetime
 from typing import Callable
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.llm.hedging import HedgeBudget, HedgedProvider
 from app.llm.provider import LLMProvider, LLMProviderFactory
 from app.llm.registry import get_provider
+from app.llm.scoreboard import ProviderScoreboard, provider_key
 from app.models.compatibility import CompatibilityRule
 from app.models.game import Game
 from app.models.mod import Mod
@@ -18,26 +24,42 @@ from app.models.mod_build_phase import ModBuildPhase
 from app.models.playstyle import Playstyle
 from app.models.playstyle_mod import PlaystyleMod
 from app.schemas.modlist import ModlistGenerateRequest
+from app.services.mod_catalog import ModCatalog
 from app.services.nexus_client import NexusModsClient
 from app.services.tier_classifier import classify_hardware_tier
 
-from .exceptions import PauseGeneration
-from .handlers import build_phase1_handlers, build_phase2_handlers, emit
+from .exceptions import ExpressSelectionError, PauseGeneration
+from .express import accept_selection, gather_candidates, parse_selection, validate_selection
+from .handlers import (
+    build_phase1_handlers,
+    build_phase2_handlers,
+    emit,
+    finish_prefetch,
+    warm_description_cache,
+)
+from .lookahead import PhaseLookahead
+from .metrics import PhaseMetrics, total_metrics
+from .phase_cache import PhaseCache, phase_output
+from .ranking import load_known_mods
 from .prompts import (
     LEGACY_DISCOVERY_PROMPT,
     LEGACY_PATCH_REVIEW_PROMPT,
     build_hardware_context,
+    build_express_user_msg,
     build_patch_phase_prompt,
     build_phase_prompt,
     build_phase_user_msg,
     classify_error,
 )
 from .session import GenerationResult, GenerationSession
-from .tools import PHASE1_TOOLS, PHASE2_TOOLS
+from .tools import EXPRESS_TOOL_CHOICE, EXPRESS_TOOLS, PHASE1_TOOLS, PHASE2_TOOLS
 from .version import TIER_MIN_VRAM, VERSION_NOTES, is_version_compatible
 
 logger = logging.getLogger(__name__)
 
+# Reported as the provider of phases replayed from the phase cache
+_CACHED_PROVIDER = "phase-cache"
+
 # VRAM budget percentages by hardware tier
 _TIER_VRAM_PCT = {"low": 0.60, "mid": 0.70, "high": 0.80, "ultra": 0.85}
 
@@ -78,6 +100,42 @@ def _compute_budgets(
     return tier_info, vram_budget, storage_budget_gb
 
 
+def resolve_phase_dependencies(phase_list: list[ModBuildPhase]) -> dict[int, set[int]]:
+    """Map each phase number to the phase numbers it has to wait for.
+
+    NULL depends_on keeps the old sequential order (the previous phase); the
+    final patch phase waits for all others. References to unknown or later
+    phases are dropped, so the graph is always acyclic.
+    """
+    numbers = [p.phase_number for p in phase_list]
+    dependencies: dict[int, set[int]] = {}
+    for index, phase in enumerate(phase_list):
+        number = phase.phase_number
+        if index == len(phase_list) - 1:
+            dependencies[number] = set(numbers[:-1])
+        elif phase.depends_on is None:
+            dependencies[number] = {numbers[index - 1]} if index else set()
+        else:
+            valid = {d for d in phase.depends_on if d in numbers[:index]}
+            if len(valid) != len(set(phase.depends_on)):
+                logger.warning("Phase %d: ignoring invalid dependencies %s",
+                               number, sorted(set(phase.depends_on) - valid))
+            dependencies[number] = valid
+    return dependencies
+
+
+def _ancestors(dependencies: dict[int, set[int]], phase_number: int) -> set[int]:
+    """Every phase that `phase_number` transitively depends on."""
+    seen: set[int] = set()
+    stack = list(dependencies.get(phase_number, ()))
+    while stack:
+        dep = stack.pop()
+        if dep not in seen:
+            seen.add(dep)
+            stack.extend(dependencies.get(dep, ()))
+    return seen
+
+
 async def generate_modlist(
     db: AsyncSession,
     request: ModlistGenerateRequest,
@@ -85,12 +143,18 @@ async def generate_modlist(
     nexus_api_key: str | None = None,
     resume_from_phase: int | None = None,
     resume_session: GenerationSession | None = None,
+    hedge_budget: int | None = None,
+    providers: list[LLMProvider] | None = None,
+    now: datetime | None = None,
 ) -> GenerationResult:
     """Generate a modlist using the phased agentic pipeline.
 
-    Iterates through game-specific build phases from the DB. Each phase runs
-    its own LLM tool-calling loop with focused prompts. The final phase always
-    handles compatibility patches.
+    Runs the game-specific build phases from the DB as a dependency graph:
+    each phase runs its own LLM tool-calling loop with focused prompts once
+    the phases it depends on are done, and independent phases run
+    concurrently. The final phase always handles compatibility patches.
+    With request.mode "express", each discovery phase first tries a single
+    structured call over locally gathered candidates (see express.py).
 
     Args:
         db: Database session
@@ -99,50 +163,44 @@ async def generate_modlist(
         nexus_api_key: API key for Nexus Mods
         resume_from_phase: If resuming, which phase number to start from
         resume_session: If resuming, the restored GenerationSession
+        hedge_budget: Hedged LLM requests allowed (None = server default)
+        providers: Providers to use instead of those built from
+            request.llm_credentials (e.g. record/replay benchmarks)
+        now: Time search results are ranked against (None = current time;
+            benchmark replays pin it to when the cassette was recorded)
     """
-    game = await db.get(Game, request.game_id)
-    playstyle = await db.get(Playstyle, request.playstyle_id)
-    if not game or not playstyle:
-        raise ValueError("Invalid game or playstyle ID")
-
-    game_version = request.game_version
-    tier_info, vram_budget, storage_budget_gb = _compute_budgets(request)
-    version_notes = VERSION_NOTES.get(game_version or "", "No specific version selected.")
-    hardware_context = build_hardware_context(request, tier_info, vram_budget, storage_budget_gb)
+    # Create or restore Nexus client; validate the key while the game,
+    # playstyle and phases load instead of after them
+    nexus = NexusModsClient(api_key=nexus_api_key)
+    validation = asyncio.create_task(nexus.validate_key())
 
-    # Load ordered phases for this game
-    result = await db.execute(
-        select(ModBuildPhase)
-        .where(ModBuildPhase.game_id == request.game_id)
-        .order_by(ModBuildPhase.phase_number)
-    )
-    phase_list = result.scalars().all()
+    try:
+        game = await db.get(Game, request.game_id)
+        playstyle = await db.get(Playstyle, request.playstyle_id)
+        if not game or not playstyle:
+            raise ValueError("Invalid game or playstyle ID")
+
+        # Load ordered phases for this game
+        result = await db.execute(
+            select(ModBuildPhase)
+            .where(ModBuildPhase.game_id == request.game_id)
+            .order_by(ModBuildPhase.phase_number)
+        )
+        phase_list = result.scalars().all()
+    except BaseException:
+        validation.cancel()
+        raise
 
     # If no phases in DB, fall back to legacy two-phase pipeline
     if not phase_list:
-        return await _generate_legacy(db, request, event_callback, nexus_api_key=nexus_api_key)
-
-    providers_to_try = _build_provider_list(request)
-
-    # Notify frontend which providers are available
-    emit(event_callback, "providers_ready", {
-        "providers": [
-            {
-                "provider_id": p.provider_id,
-                "name": (get_provider(p.provider_id) or {}).get("name", p.provider_id),
-                "model": p.get_model_name(),
-            }
-            for p in providers_to_try
-        ],
-        "count": len(providers_to_try),
-    })
-
-    # Create or restore Nexus client and session
-    nexus = NexusModsClient(api_key=nexus_api_key)
+        validation.cancel()
+        return await _generate_legacy(
+            db, request, event_callback, nexus_api_key=nexus_api_key, providers=providers, now=now,
+        )
 
     # Validate Nexus API key before running phases of empty searches
     try:
-        nexus_user = await nexus.validate_key()
+        nexus_user = await validation
         logger.info("Nexus API key validated: user=%s premium=%s",
                      nexus_user.get("name"), nexus_user.get("is_premium"))
         emit(event_callback, "nexus_validated", {
@@ -156,43 +214,182 @@ async def generate_modlist(
         })
         raise ValueError(f"Nexus API key validation failed: {e}")
 
+    game_version = request.game_version
+    tier_info, vram_budget, storage_budget_gb = _compute_budgets(request)
+    version_notes = VERSION_NOTES.get(game_version or "", "No specific version selected.")
+    hardware_context = build_hardware_context(request, tier_info, vram_budget, storage_budget_gb)
+
+    providers_to_try = providers or _build_provider_list(request)
+
+    # Notify frontend which providers are available
+    emit(event_callback, "providers_ready", {
+        "providers": [
+            {
+                "provider_id": p.provider_id,
+                "name": (get_provider(p.provider_id) or {}).get("name", p.provider_id),
+                "model": p.get_model_name(),
+            }
+            for p in providers_to_try
+        ],
+        "count": len(providers_to_try),
+    })
+
     if resume_session:
         session = resume_session
         session.nexus = nexus
     else:
         session = GenerationSession(game_domain=game.nexus_domain, nexus=nexus)
+    if get_settings().nexus_catalog_enabled:
+        session.catalog = ModCatalog.get_instance()
+    session.game_version = game_version
+    session.vram_budget_mb = vram_budget
+    session.known_mods = await load_known_mods(db, game.nexus_domain)
+    session.ranking_now = now
 
     total_phases = len(phase_list)
+    patch_phase_number = phase_list[-1].phase_number
     last_successful_provider = providers_to_try[0]
     # Permanent failure types — these providers won't recover mid-generation
     _PERMANENT_ERRORS = {"auth_error", "token_limit"}
     exhausted_providers: set[str] = set()
+    scoreboard = ProviderScoreboard.get_instance()
+    # Slow turns may also be sent to the next provider, up to this many times
+    hedges = HedgeBudget(hedge_budget if hedge_budget is not None else get_settings().llm_hedge_budget)
+
+    def _on_hedge(data: dict) -> None:
+        emit(event_callback, "llm_hedge", data)
+
+    # Token/latency/tool accounting of each completed phase
+    phase_metrics: dict[int, dict] = {}
+    # Express mode: discovery phases try one select_mods call before the loop
+    express = request.mode == "express"
+    express_phases: set[int] = set()
+
+    def complete_phase(
+        phase: ModBuildPhase, phase_session: GenerationSession, provider: str,
+        metrics: PhaseMetrics, **flags: bool,
+    ) -> None:
+        """Report a finished phase (flags such as cached=True go on phase_complete)."""
+        emit(event_callback, "phase_complete", {
+            "phase": phase.name,
+            "number": phase.phase_number,
+            "mod_count": len(phase_session.modlist),
+            "patch_count": len(phase_session.patches),
+            "provider": provider,
+            **flags,
+        })
+        emit(event_callback, "nexus_budget", session.nexus.rate_limiter.snapshot())
+        phase_metrics[phase.phase_number] = metrics.summary(provider)
+        emit(event_callback, "phase_metrics", phase_metrics[phase.phase_number])
+
+        logger.info(
+            f"Phase {phase.phase_number} complete: "
+            f"{len(phase_session.modlist)} mods, {len(phase_session.patches)} patches "
+            f"(provider: {provider})"
+        )
+        logger.debug("Modlist after phase %d: %s",
+                     phase.phase_number,
+                     [m["name"] for m in phase_session.modlist])
+
+    async def run_express(
+        phase: ModBuildPhase, phase_session: GenerationSession, llm: LLMProvider,
+        metrics: PhaseMetrics,
+    ) -> bool:
+        """Fill a discovery phase with one select_mods call over local candidates.
+
+        Returns False (after an express_fallback event) when there are no
+        candidates, the call fails or the answer doesn't validate, so the
+        agentic loop runs instead.
+        """
+        def _on_usage(usage: dict) -> None:
+            metrics.on_usage(usage)
+            emit(event_callback, "llm_usage", {
+                "number": phase.phase_number,
+                "provider": llm.get_model_name(),
+                **usage,
+            })
 
-    # ── Phased generation loop ──
-    for phase in phase_list:
-        if resume_from_phase and phase.phase_number < resume_from_phase:
-            continue
+        try:
+            candidates = await gather_candidates(phase_session, phase)
+            if not candidates:
+                raise ExpressSelectionError("no candidates found")
+            prompt_prefix, prompt_suffix = build_phase_prompt(
+                phase, game, playstyle, game_version, version_notes,
+                hardware_context, phase_session, total_phases, express=True,
+            )
+            messages = [
+                {"role": "system", "content": prompt_prefix},
+                {"role": "system", "content": prompt_suffix},
+                {"role": "user", "content": build_express_user_msg(
+                    phase, playstyle, game, game_version, candidates, phase_session,
+                )},
+            ]
+            metrics.attempts += 1
+            started = time.monotonic()
+            message, runner = await llm.run_turn(
+                messages, EXPRESS_TOOLS, {"select_mods": accept_selection},
+                on_usage=_on_usage, tool_choice=EXPRESS_TOOL_CHOICE,
+            )
+            await runner.results()
+            metrics.on_turn({
+                "llm_seconds": time.monotonic() - started,
+                "tool_wait_seconds": 0.0,
+                "tool_calls": len(message.get("tool_calls") or []),
+            })
+            entries = validate_selection(parse_selection(message), candidates, phase.max_mods)
+        except Exception as e:
+            if not isinstance(e, ExpressSelectionError):
+                error_type, _ = classify_error(llm, e)
+                scoreboard.record_failure(provider_key(llm), error_type)
+            logger.info("Phase %d express selection unusable (%s) — running the agentic loop",
+                        phase.phase_number, e)
+            emit(event_callback, "express_fallback", {
+                "number": phase.phase_number,
+                "reason": str(e)[:200],
+            })
+            return False
+
+        for entry in entries:
+            phase_session.modlist.append(entry)
+            emit(event_callback, "mod_added", {
+                "mod_id": entry["nexus_mod_id"],
+                "name": entry["name"],
+                "reason": entry["reason"],
+                "load_order": entry["load_order"],
+            })
+        phase_session.finalized = True
+        emit(event_callback, "express_selection", {
+            "number": phase.phase_number,
+            "candidates": len(candidates),
+            "selected": len(entries),
+        })
+        return True
 
-        is_patch_phase = (phase.phase_number == phase_list[-1].phase_number)
+    async def run_phase(
+        phase: ModBuildPhase, phase_session: GenerationSession, slot: int,
+    ) -> tuple[str | None, list[str]]:
+        """Run one phase's LLM loop with provider failover.
+
+        Returns the model that completed it, or None and the errors.
+        """
+        nonlocal last_successful_provider
+        is_patch_phase = phase.phase_number == patch_phase_number
 
         # Build the provider order for this phase:
-        # 1. Last successful provider first (likely to keep working)
-        # 2. Skip permanently-exhausted providers
-        phase_providers = [
+        # 1. Skip permanently-exhausted providers
+        # 2. Fastest expected turn first, per the shared scoreboard; providers
+        #    with an open circuit are skipped unless nothing else is left
+        # 3. Concurrent phases start on different providers (one slot each)
+        candidates = scoreboard.order([
             p for p in providers_to_try
             if p.get_model_name() not in exhausted_providers
-        ]
-        if not phase_providers:
-            raise PauseGeneration(
-                reason="All LLM providers are exhausted",
-                phase_number=phase.phase_number,
-                phase_name=phase.name,
-                session_snapshot=session.to_snapshot(),
-            )
-        # Move last successful provider to front
-        if last_successful_provider in phase_providers:
-            phase_providers.remove(last_successful_provider)
-            phase_providers.insert(0, last_successful_provider)
+        ])
+        if not candidates:
+            return None, ["All LLM providers are exhausted"]
+        healthy = [p for p in candidates if scoreboard.available(provider_key(p))]
+        phase_providers = healthy or candidates
+        shift = slot % len(phase_providers)
+        phase_providers = phase_providers[shift:] + phase_providers[:shift]
 
         emit(event_callback, "phase_start", {
             "phase": phase.name,
@@ -200,33 +397,56 @@ async def generate_modlist(
             "total_phases": total_phases,
             "is_patch_phase": is_patch_phase,
             "provider": phase_providers[0].get_model_name(),
+            "slot": slot,
         })
 
-        phase_succeeded = False
         provider_errors: list[str] = []
+        metrics = PhaseMetrics(phase.phase_number, phase.name)
+
+        if express and not is_patch_phase:
+            llm = phase_providers[0]
+            if await run_express(phase, phase_session, llm, metrics):
+                last_successful_provider = llm
+                express_phases.add(phase.phase_number)
+                complete_phase(phase, phase_session, llm.get_model_name(), metrics, express=True)
+                return llm.get_model_name(), provider_errors
 
         for i, llm in enumerate(phase_providers):
+            if llm.get_model_name() in exhausted_providers:
+                continue  # exhausted by a concurrent phase
+            if not scoreboard.available(provider_key(llm), claim=True) and healthy:
+                continue  # circuit opened (or probe taken) since the phase started
             try:
-                session.finalized = False
+                phase_session.finalized = False
+                metrics.attempts += 1
 
                 if is_patch_phase:
-                    system_prompt = build_patch_phase_prompt(
-                        phase, game, game_version, session, total_phases,
+                    # Review needs every mod's page — fetch them in a few batched requests
+                    await warm_description_cache(
+                        phase_session,
+                        [m["nexus_mod_id"] for m in phase_session.modlist if m.get("nexus_mod_id")],
+                        event_callback,
+                    )
+                    prompt_prefix, prompt_suffix = build_patch_phase_prompt(
+                        phase, game, game_version, phase_session, total_phases,
                     )
                     user_msg = "Review the modlist above for compatibility patches."
                     tools = PHASE2_TOOLS
-                    handlers = build_phase2_handlers(session, event_callback)
+                    handlers = build_phase2_handlers(phase_session, event_callback)
                 else:
-                    system_prompt = build_phase_prompt(
+                    prompt_prefix, prompt_suffix = build_phase_prompt(
                         phase, game, playstyle, game_version, version_notes,
-                        hardware_context, session, total_phases,
+                        hardware_context, phase_session, total_phases,
                     )
                     user_msg = build_phase_user_msg(phase, playstyle, game, game_version)
                     tools = PHASE1_TOOLS
-                    handlers = build_phase1_handlers(session, event_callback)
+                    handlers = build_phase1_handlers(phase_session, event_callback)
 
+                # Static prefix first, byte-identical across phases, so provider
+                # prompt caches can reuse it
                 messages = [
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": prompt_prefix},
+                    {"role": "system", "content": prompt_suffix},
                     {"role": "user", "content": user_msg},
                 ]
 
@@ -239,44 +459,49 @@ async def generate_modlist(
                     logger.debug("LLM reasoning: %s", text)
                     emit(event_callback, "thinking", {"text": text[:200]}, debug_data={"full_text": text})
 
-                await llm.generate_with_tools(
+                def _on_usage(usage: dict, model: str = llm.get_model_name()) -> None:
+                    metrics.on_usage(usage)
+                    emit(event_callback, "llm_usage", {
+                        "number": phase.phase_number,
+                        "provider": model,
+                        **usage,
+                    })
+
+                # With a hedge budget, slow turns also go to the next provider
+                backups = [
+                    p for p in phase_providers[i + 1:] + phase_providers[:i]
+                    if p.get_model_name() not in exhausted_providers
+                ]
+                turn_llm = llm
+                if hedges.remaining > 0 and backups:
+                    turn_llm = HedgedProvider(llm, backups, hedges, on_event=_on_hedge)
+
+                await turn_llm.generate_with_tools(
                     messages=messages,
                     tools=tools,
-                    tool_handlers=handlers,
+                    tool_handlers=metrics.wrap_handlers(handlers),
                     max_iterations=phase.max_mods * 3 + 10,
                     on_text=_on_text,
+                    on_usage=_on_usage,
+                    on_turn=metrics.on_turn,
                 )
 
-                phase_succeeded = True
                 last_successful_provider = llm
-                session.completed_phases.append(phase.phase_number)
 
-                if not session.finalized:
+                if not phase_session.finalized:
                     logger.warning(
                         f"Phase {phase.phase_number} ({phase.name}) ended without "
                         f"finalize() — LLM may have hit max iterations or stopped early"
                     )
 
-                emit(event_callback, "phase_complete", {
-                    "phase": phase.name,
-                    "number": phase.phase_number,
-                    "mod_count": len(session.modlist),
-                    "patch_count": len(session.patches),
-                    "provider": llm.get_model_name(),
-                })
-
-                logger.info(
-                    f"Phase {phase.phase_number} complete: "
-                    f"{len(session.modlist)} mods, {len(session.patches)} patches "
-                    f"(provider: {llm.get_model_name()})"
-                )
-                logger.debug("Modlist after phase %d: %s",
-                             phase.phase_number,
-                             [m["name"] for m in session.modlist])
-                break
+                finish_prefetch(phase_session, event_callback)
+                complete_phase(phase, phase_session, llm.get_model_name(), metrics)
+                return llm.get_model_name(), provider_errors
 
             except Exception as e:
+                finish_prefetch(phase_session)
                 error_type, friendly = classify_error(llm, e)
+                scoreboard.record_failure(provider_key(llm), error_type)
                 logger.warning(
                     f"Provider {llm.get_model_name()} failed on phase "
                     f"{phase.phase_number} ({error_type}): {e}"
@@ -307,16 +532,158 @@ async def generate_modlist(
                         "to_provider": remaining[0].get_model_name(),
                     })
 
-                continue
+        return None, provider_errors
 
-        if not phase_succeeded:
-            error_summary = "; ".join(provider_errors)
-            raise PauseGeneration(
-                reason=error_summary,
-                phase_number=phase.phase_number,
-                phase_name=phase.name,
-                session_snapshot=session.to_snapshot(),
+    async def replay_phase(
+        phase: ModBuildPhase, phase_session: GenerationSession, slot: int, output: dict,
+    ) -> tuple[str | None, list[str]]:
+        """Add a phase's cached result from an earlier generation, without an LLM."""
+        emit(event_callback, "phase_start", {
+            "phase": phase.name,
+            "number": phase.phase_number,
+            "total_phases": total_phases,
+            "is_patch_phase": False,
+            "provider": _CACHED_PROVIDER,
+            "slot": slot,
+            "cached": True,
+        })
+        for entry in output.get("modlist", []):
+            phase_session.modlist.append(dict(entry))
+            emit(event_callback, "mod_added", {
+                "mod_id": entry.get("nexus_mod_id"),
+                "name": entry.get("name"),
+                "reason": entry.get("reason"),
+                "load_order": entry.get("load_order"),
+            })
+        phase_session.patches.extend(dict(e) for e in output.get("patches", []))
+        phase_session.knowledge_flags.extend(output.get("knowledge_flags", []))
+        phase_session.finalized = True
+        complete_phase(
+            phase, phase_session, _CACHED_PROVIDER,
+            PhaseMetrics(phase.phase_number, phase.name), cached=True,
+        )
+        return _CACHED_PROVIDER, []
+
+    # ── Phase DAG scheduler ──
+    # A phase starts once its dependencies are done, up to llm_phase_concurrency
+    # at a time. Each runs on a fork of the session seeded with its
+    # dependencies' output (merged in phase order), so what it sees doesn't
+    # depend on which sibling finished first; outputs are merged into the
+    # session in phase order at the end, dropping cross-phase duplicates.
+    dependencies = resolve_phase_dependencies(phase_list)
+    done = set(session.completed_phases)
+    if resume_from_phase:
+        done |= {p.phase_number for p in phase_list if p.phase_number < resume_from_phase}
+    pending = [p for p in phase_list if p.phase_number not in done]
+
+    # Discovery phases with a fresh result from an earlier generation with
+    # the same inputs are replayed instead of run; the patch phase always
+    # reviews the final modlist live
+    phase_cache: PhaseCache | None = None
+    warm: dict[int, dict] = {}
+    if get_settings().phase_cache_enabled:
+        by_number = {p.phase_number: p for p in phase_list}
+        playstyle_phases = {
+            p.phase_number for p in phase_list
+            if p.is_playstyle_driven or any(
+                by_number[a].is_playstyle_driven for a in _ancestors(dependencies, p.phase_number)
             )
+        }
+        phase_cache = PhaseCache(
+            db, session, game.id, game_version, tier_info["tier"], playstyle.id, playstyle_phases,
+        )
+        warm = await phase_cache.load(
+            [p.phase_number for p in pending if p.phase_number != patch_phase_number]
+        )
+        if warm:
+            emit(event_callback, "phase_cache", {"phases": sorted(warm)})
+    outputs: dict[int, tuple[GenerationSession, GenerationSession]] = {}
+    # task -> (phase, provider slot, phase session, the base it was forked from)
+    running: dict[asyncio.Task, tuple[ModBuildPhase, int, GenerationSession, GenerationSession]] = {}
+    failures: dict[int, list[str]] = {}
+    max_parallel = max(1, get_settings().llm_phase_concurrency)
+
+    def phase_base(phase_number: int) -> GenerationSession:
+        base = session.fork()
+        for dep in sorted(_ancestors(dependencies, phase_number)):
+            if dep in outputs:
+                base.merge(*outputs[dep])
+        return base
+
+    # While phases run, the next waiting discovery phase's likely searches
+    # are resolved in the background
+    lookahead = PhaseLookahead()
+    try:
+        while pending or running:
+            if not failures:
+                for phase in list(pending):
+                    if len(running) >= max_parallel:
+                        break
+                    if not dependencies[phase.phase_number] <= done:
+                        continue
+                    pending.remove(phase)
+                    used = {entry[1] for entry in running.values()}
+                    slot = next(s for s in range(max_parallel) if s not in used)
+                    base = phase_base(phase.phase_number)
+                    phase_session = base.fork()
+                    if phase.phase_number in warm:
+                        run = replay_phase(phase, phase_session, slot, warm[phase.phase_number])
+                    else:
+                        run = run_phase(phase, phase_session, slot)
+                    task = asyncio.create_task(run)
+                    running[task] = (phase, slot, phase_session, base)
+
+                upcoming = next((p for p in pending if p.phase_number != patch_phase_number), None)
+                if upcoming is not None:
+                    lookahead.start(session, upcoming)
+
+            if not running:
+                break
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(finished, key=lambda t: running[t][0].phase_number):
+                phase, _, phase_session, base = running.pop(task)
+                completed_by, errors = task.result()
+                if completed_by is None:
+                    failures[phase.phase_number] = errors
+                    continue
+                outputs[phase.phase_number] = (phase_session, base)
+                done.add(phase.phase_number)
+    finally:
+        lookahead.cancel()
+        for task in running:
+            task.cancel()
+
+    for phase_number in sorted(outputs):
+        duplicates = session.merge(*outputs[phase_number])
+        session.completed_phases.append(phase_number)
+        session.phase_metrics.append(phase_metrics[phase_number])
+        if duplicates:
+            logger.info("Phase %d: dropped %d mods already added by another phase: %s",
+                        phase_number, len(duplicates), [d["name"] for d in duplicates])
+            emit(event_callback, "duplicates_removed", {
+                "number": phase_number,
+                "names": [d["name"] for d in duplicates],
+            })
+
+    if phase_cache is not None:
+        # Discovery phases the agentic loop finished cleanly warm-start the
+        # next generation
+        await phase_cache.store({
+            n: phase_output(*outputs[n]) for n in outputs
+            if n != patch_phase_number and n not in warm and n not in express_phases
+            and outputs[n][0].finalized
+        })
+
+    if failures:
+        # Resume from the lowest phase that hasn't completed; completed_phases
+        # covers the ones after it that did
+        paused = next(p for p in phase_list if p.phase_number not in done)
+        raise PauseGeneration(
+            reason="; ".join(failures.get(paused.phase_number) or next(iter(failures.values()))),
+            phase_number=paused.phase_number,
+            phase_name=paused.name,
+            session_snapshot=session.to_snapshot(),
+        )
 
     # ── All phases complete ──
     all_entries = session.modlist + session.patches
@@ -324,6 +691,10 @@ async def generate_modlist(
         entries=all_entries,
         knowledge_flags=session.knowledge_flags,
         llm_provider=last_successful_provider.get_model_name(),
+        metrics={
+            "phases": session.phase_metrics,
+            "totals": total_metrics(session.phase_metrics),
+        },
     )
 
 
@@ -332,6 +703,8 @@ async def _generate_legacy(
     request: ModlistGenerateRequest,
     event_callback: Callable[[dict], None] | None = None,
     nexus_api_key: str | None = None,
+    providers: list[LLMProvider] | None = None,
+    now: datetime | None = None,
 ) -> GenerationResult:
     """Legacy two-phase pipeline for games without DB-defined phases."""
     game = await db.get(Game, request.game_id)
@@ -344,9 +717,15 @@ async def _generate_legacy(
     version_notes = VERSION_NOTES.get(game_version or "", "No specific version selected.")
 
     nexus = NexusModsClient(api_key=nexus_api_key)
-    session = GenerationSession(game_domain=game.nexus_domain, nexus=nexus)
+    session = GenerationSession(
+        game_domain=game.nexus_domain, nexus=nexus,
+        game_version=game_version, vram_budget_mb=vram_budget,
+        known_mods=await load_known_mods(db, game.nexus_domain), ranking_now=now,
+    )
+    if get_settings().nexus_catalog_enabled:
+        session.catalog = ModCatalog.get_instance()
 
-    providers_to_try = _build_provider_list(request)
+    providers_to_try = providers or _build_provider_list(request)
 
     emit(event_callback, "providers_ready", {
         "providers": [
@@ -409,6 +788,7 @@ async def _generate_legacy(
                 on_text=_on_text,
             )
 
+            finish_prefetch(session, event_callback)
             emit(event_callback, "phase_complete", {
                 "phase": "Discovery",
                 "number": 1,
@@ -429,6 +809,11 @@ async def _generate_legacy(
                 )
 
                 session.finalized = False
+                await warm_description_cache(
+                    session,
+                    [m["nexus_mod_id"] for m in session.modlist if m.get("nexus_mod_id")],
+                    event_callback,
+                )
 
                 emit(event_callback, "phase_start", {
                     "phase": "Patch Review",
@@ -0,0 +1,106 @@
+"""Speculative mod-detail prefetch for the discovery phases.
+
+After search_nexus returns, the model usually reads two to five of the top
+hits next turn. DetailPrefetcher fetches the top `nexus_prefetch_top_k`
+results' details in one batched request while the LLM is still thinking,
+filling the shared detail cache and session.description_cache, so the
+following get_mod_details calls resolve without a Nexus round trip.
+
+Prefetches are skipped while the key's rate budget is constrained and are
+cancelled at the end of each phase; hit rate and wasted fetches are
+reported as debug metrics.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from app.config import get_settings
+
+from .session import strip_html
+
+if TYPE_CHECKING:
+    from .session import GenerationSession
+
+logger = logging.getLogger(__name__)
+
+
+class DetailPrefetcher:
+    """Background fetches of mod details the model is likely to ask for."""
+
+    def __init__(self, top_k: int | None = None):
+        self.top_k = top_k if top_k is not None else get_settings().nexus_prefetch_top_k
+        self._pending: dict[int, asyncio.Task] = {}
+        self._unused: set[int] = set()  # prefetched, not yet asked for
+        self.requested = 0
+        self.hits = 0
+        self.cancelled = 0
+        self.skipped_constrained = 0
+
+    def schedule(self, session: "GenerationSession", mod_ids: list[int]) -> None:
+        """Start prefetching the first top_k of mod_ids that aren't known yet."""
+        if self.top_k <= 0:
+            return
+        if session.nexus.rate_limiter.is_constrained():
+            self.skipped_constrained += 1
+            return
+        wanted = [
+            m for m in mod_ids[:self.top_k]
+            if m not in session.description_cache and m not in self._pending
+        ]
+        if not wanted:
+            return
+        task = asyncio.ensure_future(self._fetch(session, wanted))
+        for mod_id in wanted:
+            self._pending[mod_id] = task
+        self.requested += len(wanted)
+        task.add_done_callback(lambda t, ids=wanted: self._forget(ids, t))
+
+    async def _fetch(self, session: "GenerationSession", mod_ids: list[int]) -> None:
+        details = await session.nexus.get_mods_details_batch(session.game_domain, mod_ids)
+        for mod_id, mod in details.items():
+            if not mod:
+                continue
+            session.description_cache[mod_id] = strip_html(mod.get("description") or "")
+            session.author_cache.setdefault(mod_id, mod.get("author", "Unknown"))
+            self._unused.add(mod_id)
+
+    def _forget(self, mod_ids: list[int], task: asyncio.Task) -> None:
+        for mod_id in mod_ids:
+            if self._pending.get(mod_id) is task:
+                del self._pending[mod_id]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.debug("Detail prefetch failed for %s: %s", mod_ids, task.exception())
+
+    async def wait_for(self, mod_id: int) -> bool:
+        """Wait for an in-flight prefetch of mod_id. True if it was prefetched."""
+        task = self._pending.get(mod_id)
+        if task is not None:
+            # The prefetch failing or being cancelled just means a live fetch
+            await asyncio.wait({task})
+        if mod_id in self._unused:
+            self._unused.discard(mod_id)
+            self.hits += 1
+            return True
+        return False
+
+    def cancel(self) -> None:
+        """Cancel prefetches still in flight (end of phase)."""
+        tasks = set(self._pending.values())
+        for task in tasks:
+            task.cancel()
+        self.cancelled += len(self._pending)
+        self._pending.clear()
+
+    def stats(self) -> dict:
+        return {
+            "requested": self.requested,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.requested, 3) if self.requested else 0.0,
+            "wasted": len(self._unused),
+            "cancelled": self.cancelled,
+            "skipped_constrained": self.skipped_constrained,
+        }
+
@@ -18,6 +18,29 @@ from .session import GenerationSession
 logger = logging.getLogger(__name__)
 
 
+_AGENTIC_INSTRUCTIONS = """INSTRUCTIONS:
+1. Search for mods using varied, specific terms related to the current phase's focus.
+2. Use get_mods_details to read about mods BEFORE adding them — pass several
+   candidates in one call rather than reading them one at a time. Check:
+   - Compatibility with {game_version} game version
+   - Performance impact relative to the user's hardware
+   - Whether it actually fits the current phase's purpose
+3. Stay within the current phase's mod limit (fewer is fine if quality is high).
+4. Add all the mods you chose in one add_mods_to_modlist call, setting load_order
+   based on each mod's position within the phase.
+5. Call finalize() when you are done with the phase."""
+
+_EXPRESS_INSTRUCTIONS = """INSTRUCTIONS:
+1. Choose mods ONLY from the candidate list in the user message, by mod_id.
+2. Check each candidate's summary, impact and VRAM. Check:
+   - Compatibility with {game_version} game version
+   - Performance impact relative to the user's hardware
+   - Whether it actually fits the current phase's purpose
+3. Stay within the current phase's mod limit (fewer is fine if quality is high).
+4. Set load_order based on the mod's position within the phase.
+5. Answer with exactly one select_mods call listing your picks."""
+
+
 def build_phase_prompt(
     phase: ModBuildPhase,
     game: Game,
@@ -27,8 +50,16 @@ def build_phase_prompt(
     hardware_context: str,
     session: GenerationSession,
     total_phases: int,
-) -> str:
-    """Build a focused system prompt for a single build phase."""
+    express: bool = False,
+) -> tuple[str, str]:
+    """Build a focused system prompt for a single build phase.
+
+    Returns (prefix, suffix). The prefix holds everything that is the same
+    for every discovery phase of a generation, so providers can cache it;
+    the phase-specific and modlist-dependent text goes in the suffix.
+    With `express`, the instructions are for picking from a candidate list
+    in one select_mods call instead of searching.
+    """
 
     mods_so_far = ""
     if session.modlist:
@@ -48,17 +79,24 @@ directly support this playstyle. Prioritize mods that enhance the {playstyle.nam
 PLAYSTYLE: {playstyle.name} (for context — this phase is not heavily playstyle-driven,
 but keep the overall experience in mind)."""
 
-    methodology_context = get_methodology_context(game.slug, phase.phase_number)
-
-    return f"""You are an expert {game.name} mod curator working on Phase {phase.phase_number}/{total_phases}: "{phase.name}".
+    instructions = (_EXPRESS_INSTRUCTIONS if express else _AGENTIC_INSTRUCTIONS).format(
+        game_version=game_version or "the user's",
+    )
+    prefix = f"""You are an expert {game.name} mod curator building a modlist one phase at a time.
 
 GAME: {game.name} ({game_version or "Unknown"} edition)
 {version_notes}
 
 {hardware_context}
 
+PLAYSTYLE: {playstyle.name}
+{get_methodology_context(game.slug, phase.phase_number, scope="universal")}
+
+{instructions}"""
+
+    suffix = f"""You are now working on Phase {phase.phase_number}/{total_phases}: "{phase.name}".
 {playstyle_context}
-{methodology_context}
+{get_methodology_context(game.slug, phase.phase_number, scope="phase")}
 
 ── PHASE {phase.phase_number}: {phase.name} ──
 {phase.description}
@@ -72,15 +110,9 @@ RULES FOR THIS PHASE:
 {f"EXAMPLE MODS (for reference — verify these exist and are current before adding):{chr(10)}{phase.example_mods}" if phase.example_mods else ""}
 {mods_so_far}
 
-INSTRUCTIONS:
-1. Search for mods using varied, specific terms related to this phase's focus.
-2. Use get_mod_details to read about a mod BEFORE adding it. Check:
-   - Compatibility with {game_version or "the user's"} game version
-   - Performance impact relative to the user's hardware
-   - Whether it actually fits this phase's purpose
-3. Add up to {phase.max_mods} mods for this phase (fewer is fine if quality is high).
-4. Set load_order based on the mod's position within this phase.
-5. Call finalize() when you are done with this phase."""
+Add up to {phase.max_mods} mods for this phase."""
+
+    return prefix, suffix
 
 
 def build_patch_phase_prompt(
@@ -89,33 +121,26 @@ def build_patch_phase_prompt(
     game_version: str | None,
     session: GenerationSession,
     total_phases: int,
-) -> str:
-    """Build system prompt for the final compatibility patches phase."""
+) -> tuple[str, str]:
+    """Build system prompt for the final compatibility patches phase.
+
+    Returns (prefix, suffix) like build_phase_prompt: the review process is
+    static, the phase text and the modlist under review are not.
+    """
     modlist_summary = "\n".join(
         f"  {i+1}. {m['name']} (Nexus ID: {m['nexus_mod_id']}) — {m.get('reason', '')}"
         for i, m in enumerate(session.modlist)
     )
 
-    methodology_context = get_methodology_context(game.slug, phase.phase_number)
-
-    return f"""You are reviewing a {game.name} ({game_version or "Unknown"} edition) modlist for compatibility.
-
-This is Phase {phase.phase_number}/{total_phases}: "{phase.name}".
-{methodology_context}
-
-THE MODLIST TO REVIEW:
-{modlist_summary}
-
-{phase.search_guidance}
-
-RULES:
-{phase.rules}
+    prefix = f"""You are reviewing a {game.name} ({game_version or "Unknown"} edition) modlist for compatibility.
+{get_methodology_context(game.slug, phase.phase_number, scope="universal")}
 
 PROCESS:
 1. For each potential conflict pair, FIRST use get_mod_description to check if the
    mod page mentions patches or compatibility notes.
 2. If the description doesn't mention a patch, use search_patches to search Nexus.
-3. If you find a patch, use add_patch with correct load_order (patches load AFTER the mods they patch).
+3. Collect the patches you find and add them together in one add_patches call, with correct
+   load_order (patches load AFTER the mods they patch).
 4. If a patch is NEEDED but doesn't exist, use flag_user_knowledge to alert the user.
 
 IMPORTANT:
@@ -124,6 +149,19 @@ IMPORTANT:
 - Focus on mods that edit the same game systems.
 - Call finalize_review when done."""
 
+    suffix = f"""This is Phase {phase.phase_number}/{total_phases}: "{phase.name}".
+{get_methodology_context(game.slug, phase.phase_number, scope="phase")}
+
+{phase.search_guidance}
+
+RULES:
+{phase.rules}
+
+THE MODLIST TO REVIEW:
+{modlist_summary}"""
+
+    return prefix, suffix
+
 
 def build_phase_user_msg(
     phase: ModBuildPhase,
@@ -144,6 +182,34 @@ def build_phase_user_msg(
     )
 
 
+def build_express_user_msg(
+    phase: ModBuildPhase,
+    playstyle: Playstyle,
+    game: Game,
+    game_version: str | None,
+    candidates: list[dict],
+    session: GenerationSession,
+) -> str:
+    """Build the user message of an express phase: the task plus its candidates."""
+    lines = []
+    for mod in candidates:
+        known = session.known_mods.get(mod["modId"]) or {}
+        facts = [f"{mod.get('endorsements', 0)} endorsements"]
+        if known.get("performance_impact"):
+            facts.append(f"impact: {known['performance_impact']}")
+        if known.get("vram_requirement_mb"):
+            facts.append(f"VRAM: {known['vram_requirement_mb']}MB")
+        lines.append(
+            f"- mod_id {mod['modId']}: {mod['name']} by {mod.get('author', 'Unknown')} "
+            f"({', '.join(facts)}) — {(mod.get('summary') or '')[:160]}"
+        )
+    return (
+        build_phase_user_msg(phase, playstyle, game, game_version)
+        + "\n\nCANDIDATES:\n" + "\n".join(lines)
+        + f"\n\nPick up to {phase.max_mods} of these with one select_mods call."
+    )
+
+
 def build_hardware_context(
     request: ModlistGenerateRequest,
     tier_info: dict,
@@ -213,7 +279,7 @@ YOUR TASK: Build a high-quality modlist by searching Nexus Mods. Follow these ru
 2. DON'T just pick the most popular mods. Use both "endorsements" and "updated" sort orders.
    Newer mods with fewer endorsements can be excellent — evaluate them on merit.
 
-3. Use get_mod_details to read about a mod BEFORE adding it. Check for:
+3. Use get_mods_details to read about mods BEFORE adding them, several per call. Check for:
    - Compatibility with the user's game version
    - Performance impact relative to the user's hardware
    - Whether it actually fits the requested playstyle
@@ -222,6 +288,7 @@ YOUR TASK: Build a high-quality modlist by searching Nexus Mods. Follow these ru
    Estimate sizes: texture packs 1-4GB, gameplay mods <100MB, overhauls 500MB-2GB.
 
 5. Set load_order correctly — essential framework mods first (SKSE, USSEP, etc.), then overhauls, then patches/tweaks last.
+   Add mods in batches with add_mods_to_modlist instead of one call per mod.
 
 6. Call finalize() when you're satisfied with the list. Aim for 15-30 mods depending on the playstyle."""
 
@@ -237,7 +304,7 @@ PROCESS (follow this order for each potential conflict):
    Mod authors often list required patches or link to them directly.
 2. SECOND: If the description doesn't mention a patch, use search_patches to search Nexus.
    Search with terms like "ModA ModB patch" or "ModA compatibility".
-3. If you find a patch mod, use add_patch to add it with the correct load_order (patches load AFTER the mods they patch).
+3. If you find patch mods, use add_patches to add them in one call with the correct load_order (patches load AFTER the mods they patch).
 4. If a patch is NEEDED but doesn't exist, use flag_user_knowledge to alert the user.
    This is important for future AI patch generation.
 
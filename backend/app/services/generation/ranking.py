@@ -0,0 +1,120 @@
+"""Local pre-ranking of search_nexus results before they reach the LLM.
+
+Raw Nexus searches return mods the model then spends turns discarding:
+ones already in the modlist, ones built for another game version, and
+heavy texture packs on a small VRAM budget. rank_search_results scores
+each hit locally and the handler returns only the best
+`nexus_search_top_n`, which keeps tool results short and points the
+model's get_mod_details calls at likely picks.
+
+The score blends the order Nexus returned (relevance to the requested
+sort), endorsements and how recently the mod was updated. Mods known to
+the curated `mods` table also carry their performance impact, VRAM need
+and version support: version-incompatible ones are dropped, heavy ones
+are ranked down.
+"""
+
+import math
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.mod import Mod
+
+from .session import GenerationSession
+from .version import is_version_compatible
+
+# Weights of the Nexus order, endorsement and recency components
+_WEIGHTS = (0.4, 0.35, 0.25)
+# Endorsements at which the popularity component saturates (log scale)
+_ENDORSEMENT_DECADES = 5
+# Mods not updated for this long get no recency credit
+_RECENCY_DAYS = 5 * 365
+_IMPACT_PENALTY = {"low": 0.0, "medium": 0.1, "high": 0.25}
+_OVER_VRAM_PENALTY = 0.5
+
+
+async def load_known_mods(db: AsyncSession, game_domain: str) -> dict[int, dict]:
+    """Curated facts about a game's mods, by Nexus mod ID."""
+    result = await db.execute(
+        select(Mod).where(
+            Mod.nexus_game_domain == game_domain,
+            Mod.nexus_mod_id.is_not(None),
+        )
+    )
+    return {
+        mod.nexus_mod_id: {
+            "performance_impact": mod.performance_impact,
+            "vram_requirement_mb": mod.vram_requirement_mb,
+            "game_version_support": mod.game_version_support or "all",
+        }
+        for mod in result.scalars().all()
+    }
+
+
+def _recency(updated_at: str | None, now: datetime) -> float:
+    try:
+        updated = datetime.fromisoformat(updated_at)
+    except (TypeError, ValueError):
+        return 0.0
+    if updated.tzinfo is None:
+        updated = updated.replace(tzinfo=timezone.utc)
+    return max(0.0, 1.0 - (now - updated).days / _RECENCY_DAYS)
+
+
+def score_result(
+    session: GenerationSession, mod: dict, position: float, now: datetime,
+) -> float:
+    """Score one hit; `position` is its place in the Nexus order (0 = first, 1 = last)."""
+    w_order, w_endorsed, w_recent = _WEIGHTS
+    endorsements = mod.get("endorsements") or 0
+    score = (
+        w_order * (1.0 - position)
+        + w_endorsed * min(1.0, math.log10(1 + endorsements) / _ENDORSEMENT_DECADES)
+        + w_recent * _recency(mod.get("updatedAt"), now)
+    )
+    known = session.known_mods.get(mod["modId"])
+    if known:
+        score -= _IMPACT_PENALTY.get(known["performance_impact"] or "", 0.0)
+        vram = known["vram_requirement_mb"]
+        if vram and session.vram_budget_mb and vram > session.vram_budget_mb:
+            score -= _OVER_VRAM_PENALTY
+    return score
+
+
+def rank_search_results(
+    session: GenerationSession,
+    results: list[dict],
+    top_n: int | None = None,
+    now: datetime | None = None,
+) -> tuple[list[dict], dict]:
+    """Order search hits best-first and keep the top `top_n`.
+
+    Recency is scored against `now` (default: the current time), so a
+    replayed generation can rank as it did when recorded.
+
+    Returns the kept hits and what was filtered out:
+    {"already_added": [mod IDs in the modlist], "incompatible": count}.
+    """
+    top_n = top_n if top_n is not None else get_settings().nexus_search_top_n
+    present = {e.get("nexus_mod_id") for e in session.modlist + session.patches}
+    now = now or datetime.now(timezone.utc)
+    filtered = {"already_added": [], "incompatible": 0}
+
+    scored: list[tuple[float, int, dict]] = []
+    for index, mod in enumerate(results):
+        mod_id = mod["modId"]
+        if mod_id in present:
+            filtered["already_added"].append(mod_id)
+            continue
+        known = session.known_mods.get(mod_id)
+        if known and not is_version_compatible(known["game_version_support"], session.game_version):
+            filtered["incompatible"] += 1
+            continue
+        position = index / max(1, len(results) - 1)
+        scored.append((score_result(session, mod, position, now), index, mod))
+
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [mod for _, _, mod in scored[:max(1, top_n)]], filtered
@@ -1,10 +1,16 @@
 """Session state and result types for the generation pipeline."""
 
 import re
+from datetime import datetime
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
+from app.services.mod_catalog import ModCatalog
 from app.services.nexus_client import NexusModsClient
 
+if TYPE_CHECKING:
+    from .prefetch import DetailPrefetcher
+
 
 @dataclass
 class GenerationSession:
@@ -18,6 +24,19 @@ class GenerationSession:
     author_cache: dict[int, str] = field(default_factory=dict)
     finalized: bool = False
     completed_phases: list[int] = field(default_factory=list)
+    # PhaseMetrics summaries of the completed phases, in phase order
+    phase_metrics: list[dict] = field(default_factory=list)
+    # Local search index consulted before live Nexus (None = always live)
+    catalog: ModCatalog | None = None
+    # Speculative detail fetches for the current discovery phase
+    prefetcher: "DetailPrefetcher | None" = None
+    # Search ranking context: the user's game version and VRAM budget,
+    # curated facts (impact, VRAM, version support) by Nexus mod ID, and
+    # the time recency is scored against (None = now)
+    game_version: str | None = None
+    vram_budget_mb: int | None = None
+    known_mods: dict[int, dict] = field(default_factory=dict)
+    ranking_now: datetime | None = None
 
     def to_snapshot(self) -> dict:
         """Serialize session state for pause/resume."""
@@ -29,8 +48,62 @@ class GenerationSession:
             "description_cache": {str(k): v for k, v in self.description_cache.items()},
             "author_cache": {str(k): v for k, v in self.author_cache.items()},
             "completed_phases": list(self.completed_phases),
+            "phase_metrics": list(self.phase_metrics),
         }
 
+    def fork(self) -> "GenerationSession":
+        """Working copy for one phase running alongside others.
+
+        The modlist, patches and flags are copied so concurrent phases don't
+        see each other's additions; Nexus client, catalog, description/
+        author caches and the ranking context are shared.
+        """
+        return GenerationSession(
+            game_domain=self.game_domain,
+            nexus=self.nexus,
+            modlist=list(self.modlist),
+            patches=list(self.patches),
+            knowledge_flags=list(self.knowledge_flags),
+            description_cache=self.description_cache,
+            author_cache=self.author_cache,
+            completed_phases=list(self.completed_phases),
+            catalog=self.catalog,
+            game_version=self.game_version,
+            vram_budget_mb=self.vram_budget_mb,
+            known_mods=self.known_mods,
+            ranking_now=self.ranking_now,
+        )
+
+    def merge(self, other: "GenerationSession", base: "GenerationSession") -> list[dict]:
+        """Append what `other` added on top of `base` (a fork's starting point).
+
+        Mods and patches whose nexus_mod_id is already present are skipped
+        and returned, so the same mod picked by two phases appears once.
+
+        Sibling phases each continue load_order from the same base, so the
+        merged entries are renumbered to follow what is already here, in
+        the order the phase gave them; patches continue after the mods.
+        Callers merge in phase-number order, which makes the result
+        independent of which phase finished first.
+        """
+        seen = {e.get("nexus_mod_id") for e in self.modlist + self.patches}
+        duplicates: list[dict] = []
+        for target, added, after in (
+            (self.modlist, other.modlist[len(base.modlist):], self.modlist),
+            (self.patches, other.patches[len(base.patches):], self.modlist + self.patches),
+        ):
+            load_order = max((e.get("load_order") or 0 for e in after), default=0)
+            for entry in sorted(added, key=lambda e: e.get("load_order") or 0):
+                mod_id = entry.get("nexus_mod_id")
+                if mod_id is not None and mod_id in seen:
+                    duplicates.append(entry)
+                    continue
+                seen.add(mod_id)
+                load_order += 1
+                target.append({**entry, "load_order": load_order})
+        self.knowledge_flags.extend(other.knowledge_flags[len(base.knowledge_flags):])
+        return duplicates
+
     @classmethod
     def from_snapshot(cls, snapshot: dict, nexus: NexusModsClient) -> "GenerationSession":
         """Reconstruct a session from a saved snapshot."""
@@ -43,6 +116,7 @@ class GenerationSession:
             description_cache={int(k): v for k, v in snapshot.get("description_cache", {}).items()},
             author_cache={int(k): v for k, v in snapshot.get("author_cache", {}).items()},
             completed_phases=snapshot.get("completed_phases", []),
+            phase_metrics=snapshot.get("phase_metrics", []),
         )
 
 
@@ -52,6 +126,8 @@ class GenerationResult:
     entries: list[dict]
     knowledge_flags: list[dict]
     llm_provider: str
+    # Per-phase and total token/latency/tool-call accounting (phased pipeline)
+    metrics: dict | None = None
 
 
 def strip_html(html: str) -> str:
@@ -2,8 +2,40 @@
 
 PHASE1_TOOLS: Used during discovery phases (search + add mods).
 PHASE2_TOOLS: Used during the final compatibility patches phase.
+EXPRESS_TOOLS: The single structured answer of an express-mode phase.
+EXPRESS_TOOL_CHOICE: Forces that answer to be a select_mods call.
+
+The bulk tools (get_mods_details, add_mods_to_modlist, add_patches) take
+up to BULK_MAX_ITEMS items per call, so one turn can cover a whole phase.
 """
 
+BULK_MAX_ITEMS = 10
+
+_MOD_ENTRY_PROPERTIES = {
+    "mod_id": {"type": "integer", "description": "Nexus mod ID"},
+    "name": {"type": "string"},
+    "author": {"type": "string"},
+    "summary": {"type": "string", "description": "Short summary of the mod"},
+    "reason": {"type": "string", "description": "Why this mod fits the user's playstyle"},
+    "load_order": {"type": "integer", "description": "Position in load order"},
+    "estimated_size_mb": {"type": "integer", "description": "Estimated download size in MB"},
+}
+_MOD_ENTRY_REQUIRED = ["mod_id", "name", "reason", "load_order"]
+
+_PATCH_ENTRY_PROPERTIES = {
+    "mod_id": {"type": "integer", "description": "Nexus mod ID of the patch"},
+    "name": {"type": "string"},
+    "author": {"type": "string"},
+    "patches_mods": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Names of the mods this patches",
+    },
+    "reason": {"type": "string"},
+    "load_order": {"type": "integer"},
+}
+_PATCH_ENTRY_REQUIRED = ["mod_id", "name", "patches_mods", "reason", "load_order"]
+
 PHASE1_TOOLS = [
     {
         "type": "function",
@@ -12,7 +44,9 @@ PHASE1_TOOLS = [
             "description": (
                 "Search Nexus Mods for mods matching a query. "
                 "Use varied, specific search terms for different mod categories. "
-                "Try different sort orders to discover hidden gems beyond the most popular."
+                "Try different sort orders to discover hidden gems beyond the most popular. "
+                "Results come best-first for the user's game version and hardware; mods "
+                "already in the modlist are listed only by ID in already_in_modlist."
             ),
             "parameters": {
                 "type": "object",
@@ -42,23 +76,62 @@ PHASE1_TOOLS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_mods_details",
+            "description": (
+                "Get full details and descriptions for several mods in one call. "
+                "Prefer this over get_mod_details when reading more than one candidate."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "mod_ids": {
+                        "type": "array",
+                        "items": {"type": "integer"},
+                        "maxItems": BULK_MAX_ITEMS,
+                        "description": "Nexus mod IDs",
+                    },
+                },
+                "required": ["mod_ids"],
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
             "name": "add_to_modlist",
             "description": "Add a mod to the modlist. Only add mods you've reviewed and believe fit the user's playstyle and hardware.",
+            "parameters": {
+                "type": "object",
+                "properties": _MOD_ENTRY_PROPERTIES,
+                "required": _MOD_ENTRY_REQUIRED,
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "add_mods_to_modlist",
+            "description": (
+                "Add several reviewed mods to the modlist in one call. "
+                "Returns a status per mod; fix and resend only the ones that failed."
+            ),
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "mod_id": {"type": "integer", "description": "Nexus mod ID"},
-                    "name": {"type": "string"},
-                    "author": {"type": "string"},
-                    "summary": {"type": "string", "description": "Short summary of the mod"},
-                    "reason": {"type": "string", "description": "Why this mod fits the user's playstyle"},
-                    "load_order": {"type": "integer", "description": "Position in load order"},
-                    "estimated_size_mb": {"type": "integer", "description": "Estimated download size in MB"},
+                    "mods": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": _MOD_ENTRY_PROPERTIES,
+                            "required": _MOD_ENTRY_REQUIRED,
+                        },
+                        "maxItems": BULK_MAX_ITEMS,
+                    },
                 },
-                "required": ["mod_id", "name", "reason", "load_order"],
+                "required": ["mods"],
             },
         },
     },
@@ -109,21 +182,35 @@ PHASE2_TOOLS = [
         "function": {
             "name": "add_patch",
             "description": "Add a compatibility patch mod to the modlist.",
+            "parameters": {
+                "type": "object",
+                "properties": _PATCH_ENTRY_PROPERTIES,
+                "required": _PATCH_ENTRY_REQUIRED,
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "add_patches",
+            "description": (
+                "Add several compatibility patches in one call. "
+                "Returns a status per patch; fix and resend only the ones that failed."
+            ),
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "mod_id": {"type": "integer", "description": "Nexus mod ID of the patch"},
-                    "name": {"type": "string"},
-                    "author": {"type": "string"},
-                    "patches_mods": {
+                    "patches": {
                         "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Names of the mods this patches",
+                        "items": {
+                            "type": "object",
+                            "properties": _PATCH_ENTRY_PROPERTIES,
+                            "required": _PATCH_ENTRY_REQUIRED,
+                        },
+                        "maxItems": BULK_MAX_ITEMS,
                     },
-                    "reason": {"type": "string"},
-                    "load_order": {"type": "integer"},
                 },
-                "required": ["mod_id", "name", "patches_mods", "reason", "load_order"],
+                "required": ["patches"],
             },
         },
     },
@@ -159,3 +246,33 @@ PHASE2_TOOLS = [
         },
     },
 ]
+
+EXPRESS_TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "select_mods",
+            "description": "Pick this phase's mods from the candidate list, in load order.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "mods": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "mod_id": {"type": "integer", "description": "Candidate's Nexus mod ID"},
+                                "reason": {"type": "string", "description": "Why this mod fits the user's playstyle"},
+                                "load_order": {"type": "integer", "description": "Position in load order"},
+                            },
+                            "required": ["mod_id", "reason", "load_order"],
+                        },
+                    },
+                },
+                "required": ["mods"],
+            },
+        },
+    },
+]
+
+EXPRESS_TOOL_CHOICE = {"type": "function", "function": {"name": "select_mods"}}
@@ -0,0 +1,298 @@
+"""Local full-text catalog of Nexus mods.
+
+`search_nexus` asks the catalog first and only goes to live Nexus when the
+game's catalog has never been synced, is older than
+`nexus_catalog_max_age_hours`, has fewer than
+`nexus_catalog_min_results` matches for the query, or has no match with
+every query term in its name. The catalog only holds the most endorsed
+mods, so summary-only or fuzzy matches there usually mean the mod being
+asked for is a newer or smaller one that only live search will find.
+
+The catalog is filled by a background job (run_catalog_sync_loop) that
+pages through the game's mods with NexusModsClient.iter_search:
+the first sync walks the listing by endorsements, later syncs walk it by
+updatedAt and stop at the newest mod already ingested.
+
+On Postgres, matching uses the tsvector and pg_trgm indexes created by
+migration 006 (and by the seed's _apply_migrations on deploy); on other
+databases (the sqlite test DB) a case-insensitive
+substring match stands in.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, case, func, literal_column, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.database import async_session
+from app.models.game import Game
+from app.models.nexus_catalog import NexusCatalogMod, NexusCatalogState
+from app.services.nexus_client import NexusModsClient
+
+logger = logging.getLogger(__name__)
+
+# Must match the expression index in migration 006 and run_seed exactly
+_FTS_DOCUMENT = "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(summary, ''))"
+
+
+def _terms(query: str) -> list[str]:
+    """Lowercased word tokens of a search query."""
+    return re.findall(r"\w+", query.lower())
+
+
+def _name_matches(row: NexusCatalogMod, terms: list[str]) -> bool:
+    name = row.name.lower()
+    return all(t in name for t in terms)
+
+
+def _to_node(row: NexusCatalogMod) -> dict:
+    """Shape a catalog row like a Nexus search node."""
+    return {
+        "modId": row.nexus_mod_id,
+        "name": row.name,
+        "summary": row.summary or "",
+        "author": row.author or "Unknown",
+        "version": row.version or "",
+        "endorsements": row.endorsements or 0,
+        "modCategory": {"name": row.category or ""},
+        "updatedAt": row.nexus_updated_at or "",
+    }
+
+
+class ModCatalog:
+    """Searches and refreshes the nexus_catalog_mods table."""
+
+    _instance: "ModCatalog | None" = None
+
+    def __init__(self, session_factory: async_sessionmaker | None = None):
+        self._session_factory = session_factory if session_factory is not None else async_session
+        self._trigram: bool | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def get_instance(cls) -> "ModCatalog":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    # ── Search ──
+
+    async def search(
+        self,
+        game_domain: str,
+        query: str,
+        sort_by: str = "endorsements",
+        limit: int = 20,
+    ) -> list[dict] | None:
+        """Search the local catalog. Returns None when live Nexus should be used."""
+        terms = _terms(query)
+        if not terms:
+            return None
+        settings = get_settings()
+        try:
+            async with self._session_factory() as db:
+                state = await db.get(NexusCatalogState, game_domain)
+                if not self._is_fresh(state):
+                    self.misses += 1
+                    return None
+                if db.get_bind().dialect.name == "postgresql":
+                    rows = await self._search_postgres(db, game_domain, terms, sort_by, limit)
+                else:
+                    rows = await self._search_portable(db, game_domain, terms, sort_by, limit)
+        except Exception as e:
+            logger.warning("Catalog search failed for %s %r: %s", game_domain, query, e)
+            self.misses += 1
+            return None
+
+        if len(rows) < settings.nexus_catalog_min_results or not any(
+            _name_matches(r, terms) for r in rows
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        logger.debug("Catalog hit: game=%s query=%r → %d results", game_domain, query, len(rows))
+        return [_to_node(r) for r in rows]
+
+    def _is_fresh(self, state: NexusCatalogState | None) -> bool:
+        if state is None or not state.mod_count or state.last_synced_at is None:
+            return False
+        max_age = timedelta(hours=get_settings().nexus_catalog_max_age_hours)
+        return datetime.utcnow() - state.last_synced_at < max_age
+
+    @staticmethod
+    def _order_by(terms: list[str], sort_by: str) -> list:
+        # Name matches outrank mods that only mention the terms in their summary
+        name_match = and_(*(
+            func.lower(NexusCatalogMod.name).contains(t, autoescape=True) for t in terms
+        ))
+        secondary = (
+            NexusCatalogMod.nexus_updated_at.desc() if sort_by == "updated"
+            else NexusCatalogMod.endorsements.desc()
+        )
+        return [case((name_match, 1), else_=0).desc(), secondary]
+
+    async def _search_portable(
+        self, db: AsyncSession, game_domain: str, terms: list[str], sort_by: str, limit: int,
+    ) -> list[NexusCatalogMod]:
+        conditions = [
+            or_(
+                func.lower(NexusCatalogMod.name).contains(t, autoescape=True),
+                func.lower(NexusCatalogMod.summary).contains(t, autoescape=True),
+            )
+            for t in terms
+        ]
+        result = await db.execute(
+            select(NexusCatalogMod)
+            .where(NexusCatalogMod.game_domain == game_domain, *conditions)
+            .order_by(*self._order_by(terms, sort_by))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def _search_postgres(
+        self, db: AsyncSession, game_domain: str, terms: list[str], sort_by: str, limit: int,
+    ) -> list[NexusCatalogMod]:
+        # Prefix match each term so "texture" also finds "textures"
+        tsquery = func.to_tsquery("simple", " & ".join(f"{t}:*" for t in terms))
+        match = literal_column(_FTS_DOCUMENT).op("@@")(tsquery)
+        if await self._has_trigram(db):
+            match = or_(match, NexusCatalogMod.name.op("%")(" ".join(terms)))
+        result = await db.execute(
+            select(NexusCatalogMod)
+            .where(NexusCatalogMod.game_domain == game_domain, match)
+            .order_by(*self._order_by(terms, sort_by))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def _has_trigram(self, db: AsyncSession) -> bool:
+        """pg_trgm may be unavailable on managed databases — detect it once."""
+        if self._trigram is None:
+            result = await db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+            self._trigram = result.scalar() is not None
+        return self._trigram
+
+    # ── Ingestion ──
+
+    async def sync(self, nexus: NexusModsClient, game_domain: str, full: bool = False) -> int:
+        """Ingest the game's mods from Nexus. Returns the number of rows written.
+
+        The first sync (or full=True) walks the listing by endorsements so the
+        most relevant mods land first if `nexus_catalog_max_pages` cuts it
+        short. Later syncs walk by updatedAt and stop at the high-water mark.
+        The mark only advances once a sync finishes, so an interrupted sync
+        is picked up again next time.
+        """
+        settings = get_settings()
+        page_size = settings.nexus_catalog_page_size
+        async with self._session_factory() as db:
+            state = await db.get(NexusCatalogState, game_domain)
+            if state is None:
+                state = NexusCatalogState(game_domain=game_domain, mod_count=0)
+                db.add(state)
+            full = full or state.high_water_updated_at is None
+            high_water = None if full else state.high_water_updated_at
+            newest = state.high_water_updated_at or ""
+
+            written = 0
+            # Incremental syncs stop at an unpredictable page, so don't read ahead
+            pager = nexus.iter_search(
+                game_domain,
+                sort_by="endorsements" if full else "updated",
+                page_size=page_size,
+                prefetch=1 if full else 0,
+                max_results=page_size * settings.nexus_catalog_max_pages,
+            )
+            async for nodes in pager.pages():
+                changed = [
+                    n for n in nodes
+                    if high_water is None or (n.get("updatedAt") or "") > high_water
+                ]
+                await self._upsert(db, game_domain, changed)
+                await db.commit()
+                written += len(changed)
+                newest = max([newest] + [n.get("updatedAt") or "" for n in changed])
+                if len(changed) < len(nodes):
+                    break
+
+            now = datetime.utcnow()
+            count = await db.execute(
+                select(func.count()).select_from(NexusCatalogMod)
+                .where(NexusCatalogMod.game_domain == game_domain)
+            )
+            state.mod_count = count.scalar() or 0
+            state.high_water_updated_at = newest or None
+            state.last_synced_at = now
+            if full:
+                state.last_full_sync_at = now
+            await db.commit()
+
+        logger.info(
+            "Catalog %s sync for %s: %d mod(s) written, %d indexed",
+            "full" if full else "incremental", game_domain, written, state.mod_count,
+        )
+        return written
+
+    @staticmethod
+    async def _upsert(db: AsyncSession, game_domain: str, nodes: list[dict]) -> None:
+        nodes = [n for n in nodes if n.get("modId") is not None]
+        if not nodes:
+            return
+        result = await db.execute(
+            select(NexusCatalogMod).where(
+                NexusCatalogMod.game_domain == game_domain,
+                NexusCatalogMod.nexus_mod_id.in_([n["modId"] for n in nodes]),
+            )
+        )
+        existing = {row.nexus_mod_id: row for row in result.scalars().all()}
+        now = datetime.utcnow()
+        for node in nodes:
+            row = existing.get(node["modId"])
+            if row is None:
+                row = NexusCatalogMod(game_domain=game_domain, nexus_mod_id=node["modId"])
+                db.add(row)
+                existing[node["modId"]] = row
+            row.name = (node.get("name") or "")[:255]
+            row.summary = node.get("summary")
+            row.author = node.get("author")
+            row.version = (node.get("version") or "")[:100] or None
+            row.endorsements = node.get("endorsements") or 0
+            row.category = ((node.get("modCategory") or {}).get("name") or "")[:100] or None
+            row.nexus_updated_at = node.get("updatedAt")
+            row.indexed_at = now
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+async def run_catalog_sync_loop() -> None:
+    """Periodically refresh the catalog for every game using the server's Nexus key."""
+    settings = get_settings()
+    if not settings.nexus_catalog_enabled or not settings.nexus_api_key:
+        logger.info("Catalog sync disabled (no server Nexus key or nexus_catalog_enabled=false)")
+        return
+    await asyncio.sleep(120)  # Let the app finish starting up
+    catalog = ModCatalog.get_instance()
+    nexus = NexusModsClient(api_key=settings.nexus_api_key)
+    while True:
+        try:
+            async with async_session() as db:
+                domains = (await db.execute(select(Game.nexus_domain))).scalars().all()
+            for domain in domains:
+                try:
+                    await catalog.sync(nexus, domain)
+                except Exception:
+                    logger.exception("Catalog sync failed for %s", domain)
+        except Exception:
+            logger.exception("Catalog sync cycle failed")
+        await asyncio.sleep(settings.nexus_catalog_sync_interval_hours * 3600)
@@ -0,0 +1,277 @@
+"""Process-wide response cache and request coalescing for Nexus Mods queries.
+
+Search results and mod pages are public data, so one cache is shared by
+every generation regardless of which user's API key fetched the entry.
+Entries expire after `nexus_cache_ttl_seconds` and the cache evicts least
+recently used entries once the estimated payload size exceeds
+`nexus_cache_max_bytes`.
+
+Keys:
+    ("search", game_domain, query, sort_by, offset)
+    ("mod", game_domain, mod_id)
+
+Successful API-key validations are cached separately (KeyValidationCache),
+keyed by key fingerprint with a short TTL, so starting or resuming a
+generation doesn't pay a validate.json round trip every time.
+
+On a cache miss, SingleFlight makes sure concurrent callers asking for the
+same key with the same API key share one network request instead of each
+spending rate-limit budget on an identical query. Callers with different
+API keys never share a fetch, so one key's 401 or 429 can't reach another.
+
+Cached values and coalesced results are copied on the way in and out, so a
+caller that sorts, trims or annotates what it got never changes what other
+callers (and other users) see.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+from app.config import get_settings
+from app.services.nexus_pool import key_fingerprint
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def search_key(game_domain: str, query: str, sort_by: str, offset: int) -> tuple:
+    """Cache key for one page of search results (query is case-insensitive)."""
+    return ("search", game_domain, " ".join(query.lower().split()), sort_by, offset)
+
+
+def mod_key(game_domain: str, mod_id: int) -> tuple:
+    """Cache key for a single mod's details."""
+    return ("mod", game_domain, int(mod_id))
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate in-memory cost of a cached value by its JSON length."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    size: int
+    expires_at: float
+    updated_at: str | None = None
+
+
+class NexusResponseCache:
+    """Byte-bounded LRU cache with TTL expiry and hit/miss counters."""
+
+    _instance: "NexusResponseCache | None" = None
+
+    def __init__(self, max_bytes: int | None = None, ttl_seconds: float | None = None):
+        settings = get_settings()
+        self.max_bytes = max_bytes if max_bytes is not None else settings.nexus_cache_max_bytes
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.nexus_cache_ttl_seconds
+        self._entries: OrderedDict[tuple, _CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def get_instance(cls) -> "NexusResponseCache":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def get(self, key: tuple) -> Any | None:
+        """Return the cached value, or None on a miss or expired entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry.value)
+
+    def set(self, key: tuple, value: Any, updated_at: str | None = None) -> None:
+        """Store a value. Values larger than the whole budget are not cached."""
+        if self.max_bytes <= 0:
+            return
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _CacheEntry(
+            value=copy.deepcopy(value),
+            size=size,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            updated_at=updated_at,
+        )
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: tuple) -> bool:
+        """Drop a single entry. Returns True if something was removed."""
+        if key in self._entries:
+            self._remove(key)
+            self.invalidations += 1
+            return True
+        return False
+
+    def note_updated_at(self, game_domain: str, mod_id: int, updated_at: str | None) -> None:
+        """Drop a cached mod-detail entry if Nexus reports a newer `updatedAt`.
+
+        Called with the `updatedAt` seen in fresh search results, so a mod
+        updated since its details were cached is re-fetched on next access.
+        """
+        if not updated_at:
+            return
+        key = mod_key(game_domain, mod_id)
+        entry = self._entries.get(key)
+        if entry is not None and entry.updated_at and entry.updated_at != updated_at:
+            logger.debug("Mod %s/%s changed on Nexus — invalidating cached details", game_domain, mod_id)
+            self.invalidate(key)
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Counters for logging and diagnostics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class SingleFlight:
+    """Coalesce concurrent identical requests into one in-flight call.
+
+    The first caller for a key starts the request as its own task; callers
+    arriving while it runs await the same task. The result — or exception —
+    is delivered to every waiter, and the key is forgotten as soon as the
+    task finishes, so a failure never poisons later calls. Cancelling one
+    waiter does not cancel the shared request for the others.
+    """
+
+    _instance: "SingleFlight | None" = None
+
+    def __init__(self):
+        self._inflight: dict[tuple, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    @classmethod
+    def get_instance(cls) -> "SingleFlight":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    async def do(self, key: tuple, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+            self.started += 1
+            return await asyncio.shield(task)
+        self.coalesced += 1
+        logger.debug("Coalesced in-flight Nexus request %s", key)
+        # Waiters get their own copy; the starter keeps the original
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _forget(self, key: tuple, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved; waiters re-raise it themselves
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def drain(self) -> None:
+        """Wait for every in-flight request (their waiters may be gone)."""
+        while self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
+class KeyValidationCache:
+    """Short-lived cache of successful Nexus key validations.
+
+    Only successes are cached — an invalid key is always re-checked, so a
+    user who fixes their key is never stuck behind a cached failure.
+    Entries are dropped when the user's saved key changes.
+    """
+
+    _instance: "KeyValidationCache | None" = None
+
+    def __init__(self, ttl_seconds: float | None = None):
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else get_settings().nexus_validation_ttl_seconds
+        )
+        self._entries: dict[str, tuple[float, dict]] = {}
+
+    @classmethod
+    def get_instance(cls) -> "KeyValidationCache":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def get(self, api_key: str) -> dict | None:
+        fingerprint = key_fingerprint(api_key)
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            return None
+        expires_at, user_info = entry
+        if expires_at <= time.monotonic():
+            del self._entries[fingerprint]
+            return None
+        return user_info
+
+    def set(self, api_key: str, user_info: dict) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[key_fingerprint(api_key)] = (time.monotonic() + self.ttl_seconds, user_info)
+
+    def invalidate(self, api_key: str | None) -> None:
+        if api_key:
+            self._entries.pop(key_fingerprint(api_key), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
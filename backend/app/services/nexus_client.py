@@ -2,6 +2,18 @@ import httpx
 import asyncio
 import logging
 
+from app.config import get_settings
+from app.services.nexus_cache import (
+    KeyValidationCache,
+    NexusResponseCache,
+    SingleFlight,
+    mod_key,
+    search_key,
+)
+from app.services.nexus_pager import NexusSearchPager
+from app.services.nexus_pool import NexusClientPool, key_fingerprint
+from app.services.nexus_rate_limiter import NexusRateLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,9 +38,42 @@ class NexusModsClient:
         "name": [{"name": {"direction": "ASC"}}],
     }
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        pool: NexusClientPool | None = None,
+        cache: NexusResponseCache | None = None,
+        inflight: SingleFlight | None = None,
+        rate_limiter: NexusRateLimiter | None = None,
+        validations: KeyValidationCache | None = None,
+    ):
         self.api_key = api_key or ""
-        self._semaphore = asyncio.Semaphore(10)  # Max concurrent requests
+        # Connections, cached responses and rate limiting are process-wide,
+        # not per instance — every client for the same key shares them
+        self._pool = pool if pool is not None else NexusClientPool.get_instance()
+        self.cache = cache if cache is not None else NexusResponseCache.get_instance()
+        self.inflight = inflight if inflight is not None else SingleFlight.get_instance()
+        self.validations = validations if validations is not None else KeyValidationCache.get_instance()
+        self.rate_limiter = (
+            rate_limiter if rate_limiter is not None else NexusRateLimiter.for_key(self.api_key)
+        )
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared, keep-alive HTTP client for this API key."""
+        return self._pool.get_client(self.api_key)
+
+    def _observe(self, response: httpx.Response) -> None:
+        """Feed rate-limit headers (and 429s) back into the shared limiter."""
+        if response.status_code == 429:
+            self.rate_limiter.note_rate_limited(response.headers)
+        else:
+            self.rate_limiter.update_from_headers(response.headers)
+
+    def _flight_key(self, cache_key: tuple) -> tuple:
+        """Coalescing key: the cached entry is shared, but a fetch's 401/429
+        belongs to the key that made it, so only same-key callers share one."""
+        return (*cache_key, key_fingerprint(self.api_key))
 
     def _headers(self) -> dict:
         return {
@@ -36,58 +81,82 @@ class NexusModsClient:
             "Content-Type": "application/json",
         }
 
-    async def _query(self, query: str, variables: dict | None = None) -> dict:
+    async def _query(
+        self, query: str, variables: dict | None = None, allow_partial: bool = False,
+    ) -> dict:
         """Execute a GraphQL query and return the parsed response.
 
-        Raises NexusAPIError if the response contains GraphQL-level errors.
+        Raises NexusAPIError if the response contains GraphQL-level errors,
+        unless allow_partial is set and some data came back (batched alias
+        queries, where one missing mod should not fail the whole batch).
         Raises httpx.HTTPStatusError for HTTP-level errors.
         """
-        async with self._semaphore:
-            async with httpx.AsyncClient() as client:
-                payload = {"query": query, "variables": variables or {}}
-                response = await client.post(
-                    self.BASE_URL,
-                    headers=self._headers(),
-                    json=payload,
-                    timeout=30.0,
+        async with self.rate_limiter.slot():
+            payload = {"query": query, "variables": variables or {}}
+            response = await self.http.post(
+                self.BASE_URL,
+                headers=self._headers(),
+                json=payload,
+                timeout=30.0,
+            )
+            self._observe(response)
+            response.raise_for_status()
+            result = response.json()
+
+            # Check for GraphQL-level errors
+            if result.get("errors") and allow_partial and result.get("data"):
+                logger.warning(
+                    "Nexus GraphQL partial errors: %s | query: %s",
+                    result["errors"],
+                    query.strip()[:200],
+                )
+            elif result.get("errors"):
+                logger.error(
+                    "Nexus GraphQL errors: %s | query: %s | variables: %s",
+                    result["errors"],
+                    query.strip()[:200],
+                    variables,
+                )
+                raise NexusAPIError(result["errors"])
+
+            # Warn if data is None (unexpected for a successful query)
+            if result.get("data") is None:
+                logger.warning(
+                    "Nexus returned null data without errors | query: %s | variables: %s",
+                    query.strip()[:200],
+                    variables,
                 )
-                response.raise_for_status()
-                result = response.json()
-
-                # Check for GraphQL-level errors
-                if result.get("errors"):
-                    logger.error(
-                        "Nexus GraphQL errors: %s | query: %s | variables: %s",
-                        result["errors"],
-                        query.strip()[:200],
-                        variables,
-                    )
-                    raise NexusAPIError(result["errors"])
-
-                # Warn if data is None (unexpected for a successful query)
-                if result.get("data") is None:
-                    logger.warning(
-                        "Nexus returned null data without errors | query: %s | variables: %s",
-                        query.strip()[:200],
-                        variables,
-                    )
-
-                return result
-
-    async def validate_key(self) -> dict:
+
+            return result
+
+    async def validate_key(self, use_cache: bool = True) -> dict:
         """Validate the API key against the Nexus v1 endpoint.
 
-        Returns user info dict on success, raises on failure.
+        Returns user info dict on success, raises on failure. Successful
+        results are reused for `nexus_validation_ttl_seconds`; pass
+        use_cache=False to force a fresh check (the result still refreshes
+        the cache).
         """
-        async with self._semaphore:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.nexusmods.com/v1/users/validate.json",
-                    headers={"apikey": self.api_key},
-                    timeout=15.0,
-                )
-                response.raise_for_status()
-                return response.json()
+        if use_cache:
+            cached = self.validations.get(self.api_key)
+            if cached is not None:
+                return cached
+        user_info = await self.inflight.do(
+            ("validate", key_fingerprint(self.api_key)), self._fetch_validation,
+        )
+        self.validations.set(self.api_key, user_info)
+        return user_info
+
+    async def _fetch_validation(self) -> dict:
+        async with self.rate_limiter.slot():
+            response = await self.http.get(
+                "https://api.nexusmods.com/v1/users/validate.json",
+                headers={"apikey": self.api_key},
+                timeout=15.0,
+            )
+            self._observe(response)
+            response.raise_for_status()
+            return response.json()
 
     # Verified working query — uses typed variables ($filter: ModsFilter)
     # instead of interpolating scalar variables into inline filter objects.
@@ -133,23 +202,79 @@ class NexusModsClient:
             sort_by: Sort order — "endorsements" (default), "updated", or "name"
             offset: Pagination offset
         """
+        cache_key = search_key(game_domain, search_term, sort_by, offset)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug(
+                "Nexus search cache hit: game=%s query=%r sort=%s",
+                game_domain, search_term, sort_by,
+            )
+            return cached
+
+        # Identical concurrent searches share one request
+        return await self.inflight.do(
+            self._flight_key(cache_key),
+            lambda: self._fetch_search(cache_key, game_domain, search_term, sort_by, offset),
+        )
+
+    async def search_mods_page(
+        self,
+        game_domain: str,
+        search_term: str = "",
+        sort_by: str = "endorsements",
+        offset: int = 0,
+        count: int = 20,
+    ) -> tuple[list[dict], int]:
+        """Fetch one uncached page of search results plus the total match count.
+
+        An empty search_term lists every mod for the game. Bulk consumers
+        (catalog ingestion) use this directly so they don't churn the
+        shared response cache.
+        """
         sort_var = self._SORT_MAP.get(sort_by, self._SORT_MAP["endorsements"])
 
+        filters = {"gameDomainName": [{"value": game_domain, "op": "EQUALS"}]}
+        if search_term:
+            filters["name"] = [{"value": search_term, "op": "WILDCARD"}]
         variables = {
-            "filter": {
-                "gameDomainName": [{"value": game_domain, "op": "EQUALS"}],
-                "name": [{"value": search_term, "op": "WILDCARD"}],
-            },
+            "filter": filters,
             "sort": sort_var,
             "offset": offset,
-            "count": 20,
+            "count": count,
         }
 
         result = await self._query(self._SEARCH_QUERY, variables)
         data = result.get("data") or {}
         mods_data = data.get("mods") or {}
-        nodes = mods_data.get("nodes") or []
-        total = mods_data.get("totalCount", 0)
+        return mods_data.get("nodes") or [], mods_data.get("totalCount", 0)
+
+    def iter_search(
+        self,
+        game_domain: str,
+        search_term: str = "",
+        sort_by: str = "endorsements",
+        page_size: int = 50,
+        prefetch: int = 1,
+        max_results: int | None = None,
+    ) -> NexusSearchPager:
+        """Stream search results page by page (see NexusSearchPager)."""
+        return NexusSearchPager(
+            self, game_domain, search_term,
+            sort_by=sort_by, page_size=page_size, prefetch=prefetch, max_results=max_results,
+        )
+
+    async def _fetch_search(
+        self,
+        cache_key: tuple,
+        game_domain: str,
+        search_term: str,
+        sort_by: str,
+        offset: int,
+    ) -> list[dict]:
+        """Run the search query against Nexus and populate the cache."""
+        nodes, total = await self.search_mods_page(
+            game_domain, search_term, sort_by=sort_by, offset=offset,
+        )
 
         if not nodes:
             logger.info(
@@ -162,17 +287,16 @@ class NexusModsClient:
                 game_domain, search_term, len(nodes), total,
             )
 
-        return nodes
+        self.cache.set(cache_key, nodes)
+        if get_settings().nexus_cache_check_updated_at:
+            for node in nodes:
+                if node.get("modId") is not None:
+                    self.cache.note_updated_at(game_domain, node["modId"], node.get("updatedAt"))
 
-    async def get_mod_details(self, game_domain: str, mod_id: int) -> dict | None:
-        """Get full mod details including description HTML.
+        return nodes
 
-        The description field contains the mod author's full page content,
-        which often includes compatibility notes, patch links, and requirements.
-        """
-        query = """
-        query GetModDetails($gameDomain: String!, $modId: Int!) {
-            mod(gameDomainName: $gameDomain, modId: $modId) {
+    # Fields returned for a single mod — shared by the single and batched queries
+    _MOD_DETAIL_FIELDS = """
                 modId
                 name
                 summary
@@ -183,35 +307,123 @@ class NexusModsClient:
                 modCategory { name }
                 createdAt
                 updatedAt
-            }
-        }
+    """
+
+    async def get_mod_details(self, game_domain: str, mod_id: int) -> dict | None:
+        """Get full mod details including description HTML.
+
+        The description field contains the mod author's full page content,
+        which often includes compatibility notes, patch links, and requirements.
+        Results are served from the shared response cache when fresh.
+        """
+        cache_key = mod_key(game_domain, mod_id)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self.inflight.do(
+            self._flight_key(cache_key),
+            lambda: self._fetch_mod_details(cache_key, game_domain, mod_id),
+        )
+
+    async def _fetch_mod_details(self, cache_key: tuple, game_domain: str, mod_id: int) -> dict | None:
+        """Fetch one mod's details from Nexus and populate the cache."""
+        query = f"""
+        query GetModDetails($gameDomain: String!, $modId: Int!) {{
+            mod(gameDomainName: $gameDomain, modId: $modId) {{{self._MOD_DETAIL_FIELDS}}}
+        }}
         """
         result = await self._query(query, {
             "gameDomain": game_domain,
             "modId": mod_id,
         })
         data = result.get("data") or {}
-        return data.get("mod")
+        mod = data.get("mod")
+        if mod:
+            self.cache.set(cache_key, mod, updated_at=mod.get("updatedAt"))
+        return mod
 
-    async def get_mod_files(self, game_domain: str, mod_id: int) -> list[dict]:
-        """Get available files for a mod."""
-        query = """
-        query GetModFiles($gameDomain: String!, $modId: Int!) {
-            modFiles(
-                filter: {
-                    gameDomainName: { value: $gameDomain }
-                    modId: { value: $modId }
-                }
-            ) {
-                nodes {
+    async def get_mods_details_batch(
+        self, game_domain: str, mod_ids: list[int],
+    ) -> dict[int, dict | None]:
+        """Get details for many mods using aliased `mod(...)` selections.
+
+        Cached mods are served locally; the rest are fetched in chunks of
+        `nexus_batch_size` aliases per GraphQL request, and every fetched
+        mod is written back to the per-mod cache so later get_mod_details
+        calls hit. Returns {mod_id: details or None if not found}.
+        """
+        results: dict[int, dict | None] = {}
+        missing: list[int] = []
+        for mod_id in dict.fromkeys(int(m) for m in mod_ids):
+            cached = self.cache.get(mod_key(game_domain, mod_id))
+            if cached is not None:
+                results[mod_id] = cached
+            else:
+                missing.append(mod_id)
+
+        if not missing:
+            return results
+
+        size = max(1, get_settings().nexus_batch_size)
+        chunks = [missing[i:i + size] for i in range(0, len(missing), size)]
+        logger.debug(
+            "Nexus batch details: game=%s %d cached, %d to fetch in %d request(s)",
+            game_domain, len(results), len(missing), len(chunks),
+        )
+        for part in await asyncio.gather(
+            *(self._fetch_mods_batch(game_domain, chunk) for chunk in chunks)
+        ):
+            results.update(part)
+        return results
+
+    async def _fetch_mods_batch(self, game_domain: str, mod_ids: list[int]) -> dict[int, dict | None]:
+        """Fetch one chunk of mods in a single aliased GraphQL request."""
+        var_defs = ", ".join(f"$id{i}: Int!" for i in range(len(mod_ids)))
+        selections = "\n".join(
+            f"m{i}: mod(gameDomainName: $gameDomain, modId: $id{i}) {{{self._MOD_DETAIL_FIELDS}}}"
+            for i in range(len(mod_ids))
+        )
+        query = f"""
+        query GetModDetailsBatch($gameDomain: String!, {var_defs}) {{
+            {selections}
+        }}
+        """
+        variables: dict = {"gameDomain": game_domain}
+        variables.update({f"id{i}": mod_id for i, mod_id in enumerate(mod_ids)})
+
+        result = await self._query(query, variables, allow_partial=True)
+        data = result.get("data") or {}
+        fetched: dict[int, dict | None] = {}
+        for i, mod_id in enumerate(mod_ids):
+            mod = data.get(f"m{i}")
+            if mod:
+                self.cache.set(mod_key(game_domain, mod_id), mod, updated_at=mod.get("updatedAt"))
+            fetched[mod_id] = mod
+        return fetched
+
+    # Fields returned for each file — shared by the single and batched queries
+    _MOD_FILE_FIELDS = """
                     fileId
                     name
                     version
                     sizeInBytes
                     isPrimary
-                }
-            }
-        }
+    """
+
+    async def get_mod_files(self, game_domain: str, mod_id: int) -> list[dict]:
+        """Get available files for a mod."""
+        query = f"""
+        query GetModFiles($gameDomain: String!, $modId: Int!) {{
+            modFiles(
+                filter: {{
+                    gameDomainName: {{ value: $gameDomain }}
+                    modId: {{ value: $modId }}
+                }}
+            ) {{
+                nodes {{{self._MOD_FILE_FIELDS}}}
+            }}
+        }}
         """
         result = await self._query(query, {
             "gameDomain": game_domain,
@@ -220,27 +432,78 @@ class NexusModsClient:
         data = result.get("data") or {}
         return (data.get("modFiles") or {}).get("nodes") or []
 
+    async def get_mods_files_batch(
+        self, game_domain: str, mod_ids: list[int],
+    ) -> dict[int, list[dict] | None]:
+        """Get the file lists for many mods using aliased `modFiles(...)` selections.
+
+        Sends `nexus_batch_size` aliases per request. Mods with no files map
+        to an empty list; mods whose selection errored map to None, so
+        callers can tell "no files" from "unknown".
+        """
+        unique_ids = list(dict.fromkeys(int(m) for m in mod_ids))
+        if not unique_ids:
+            return {}
+        size = max(1, get_settings().nexus_batch_size)
+        chunks = [unique_ids[i:i + size] for i in range(0, len(unique_ids), size)]
+        results: dict[int, list[dict] | None] = {}
+        for part in await asyncio.gather(
+            *(self._fetch_files_batch(game_domain, chunk) for chunk in chunks)
+        ):
+            results.update(part)
+        return results
+
+    async def _fetch_files_batch(self, game_domain: str, mod_ids: list[int]) -> dict[int, list[dict] | None]:
+        """Fetch one chunk of file lists in a single aliased GraphQL request."""
+        var_defs = ", ".join(f"$id{i}: Int!" for i in range(len(mod_ids)))
+        selections = "\n".join(
+            f"""f{i}: modFiles(
+                filter: {{
+                    gameDomainName: {{ value: $gameDomain }}
+                    modId: {{ value: $id{i} }}
+                }}
+            ) {{
+                nodes {{{self._MOD_FILE_FIELDS}}}
+            }}"""
+            for i in range(len(mod_ids))
+        )
+        query = f"""
+        query GetModFilesBatch($gameDomain: String!, {var_defs}) {{
+            {selections}
+        }}
+        """
+        variables: dict = {"gameDomain": game_domain}
+        variables.update({f"id{i}": mod_id for i, mod_id in enumerate(mod_ids)})
+
+        result = await self._query(query, variables, allow_partial=True)
+        data = result.get("data") or {}
+        # An errored alias comes back null; a mod without files has no nodes
+        return {
+            mod_id: None if data.get(f"f{i}") is None else data[f"f{i}"].get("nodes") or []
+            for i, mod_id in enumerate(mod_ids)
+        }
+
     async def get_download_link(self, game_domain: str, mod_id: int, file_id: int) -> str | None:
         """Get download link for a mod file. Requires Nexus Premium for direct links."""
         # Note: Free users get redirected to the Nexus download page
         # Premium users get direct CDN links via the v1 REST API
         # For v2 GraphQL, download links may need the v1 endpoint as fallback
         v1_url = f"https://api.nexusmods.com/v1/games/{game_domain}/mods/{mod_id}/files/{file_id}/download_link.json"
-        async with self._semaphore:
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.get(
-                        v1_url,
-                        headers={"apikey": self.api_key},
-                        timeout=30.0,
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data:
-                            return data[0].get("URI")
-                    elif response.status_code == 403:
-                        # Free user - return manual download URL
-                        return f"https://www.nexusmods.com/{game_domain}/mods/{mod_id}?tab=files&file_id={file_id}"
-                except httpx.HTTPError:
-                    pass
+        async with self.rate_limiter.slot():
+            try:
+                response = await self.http.get(
+                    v1_url,
+                    headers={"apikey": self.api_key},
+                    timeout=30.0,
+                )
+                self._observe(response)
+                if response.status_code == 200:
+                    data = response.json()
+                    if data:
+                        return data[0].get("URI")
+                elif response.status_code == 403:
+                    # Free user - return manual download URL
+                    return f"https://www.nexusmods.com/{game_domain}/mods/{mod_id}?tab=files&file_id={file_id}"
+            except httpx.HTTPError:
+                pass
         return None
@@ -0,0 +1,130 @@
+"""Streaming pagination over Nexus mod search results.
+
+NexusSearchPager walks a search (or a whole game's listing, with an empty
+search term) page by page so bulk consumers such as catalog ingestion can
+process thousands of mods in constant memory:
+
+    pager = nexus.iter_search("skyrimspecialedition", sort_by="updated")
+    async for mod in pager:
+        ...
+        if done:
+            break           # pending prefetches are cancelled
+    pager.total_count       # known after the first page
+
+While the caller processes one page, up to `prefetch` following pages are
+already being fetched. Every request goes through the client's shared rate
+limiter, and prefetching pauses while the key's budget is constrained.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, AsyncIterator
+
+if TYPE_CHECKING:
+    from app.services.nexus_client import NexusModsClient
+
+logger = logging.getLogger(__name__)
+
+
+class NexusSearchPager:
+    """Async iterator over search result nodes, fetched page by page."""
+
+    def __init__(
+        self,
+        nexus: "NexusModsClient",
+        game_domain: str,
+        search_term: str = "",
+        sort_by: str = "endorsements",
+        page_size: int = 50,
+        prefetch: int = 1,
+        max_results: int | None = None,
+    ):
+        self.nexus = nexus
+        self.game_domain = game_domain
+        self.search_term = search_term
+        self.sort_by = sort_by
+        self.page_size = max(1, page_size)
+        self.prefetch = max(0, prefetch)
+        self.max_results = max_results
+        self.total_count: int | None = None
+        self.pages_fetched = 0
+
+    def __aiter__(self) -> AsyncIterator[dict]:
+        return self._iter_nodes()
+
+    async def _iter_nodes(self) -> AsyncIterator[dict]:
+        pages = self.pages()
+        try:
+            async for page in pages:
+                for node in page:
+                    yield node
+        finally:
+            await pages.aclose()
+
+    def _limit(self) -> int | None:
+        """Offset past which no page is requested (None until totalCount is known)."""
+        if self.total_count is None:
+            return self.max_results
+        if self.max_results is None:
+            return self.total_count
+        return min(self.total_count, self.max_results)
+
+    async def _fetch(self, offset: int) -> list[dict]:
+        nodes, total = await self.nexus.search_mods_page(
+            self.game_domain,
+            self.search_term,
+            sort_by=self.sort_by,
+            offset=offset,
+            count=self.page_size,
+        )
+        self.total_count = total
+        self.pages_fetched += 1
+        return nodes
+
+    async def pages(self) -> AsyncIterator[list[dict]]:
+        """Yield result pages in order; stopping early cancels pending fetches."""
+        pending: deque[asyncio.Task] = deque()
+        next_offset = 0
+
+        def can_fetch() -> bool:
+            limit = self._limit()
+            return limit is None or next_offset < limit
+
+        def start_fetch() -> None:
+            nonlocal next_offset
+            pending.append(asyncio.ensure_future(self._fetch(next_offset)))
+            next_offset += self.page_size
+
+        offset = 0
+        try:
+            start_fetch()
+            while pending:
+                nodes = await pending.popleft()
+                limit = self._limit()
+                if limit is not None:
+                    nodes = nodes[:max(0, limit - offset)]
+                if not nodes:
+                    break
+                full_page = len(nodes) == self.page_size
+                # Read ahead while the caller works on this page, unless the
+                # key's budget is tight
+                if full_page and not self.nexus.rate_limiter.is_constrained():
+                    while len(pending) < self.prefetch and can_fetch():
+                        start_fetch()
+                yield nodes
+                if not full_page:
+                    break
+                offset += self.page_size
+                if not pending and can_fetch():
+                    start_fetch()
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # read-ahead nobody awaited — don't warn about it
+            logger.debug(
+                "Pager %s %r: %d page(s) fetched, total=%s",
+                self.game_domain, self.search_term, self.pages_fetched, self.total_count,
+            )
@@ -0,0 +1,125 @@
+"""Process-wide pool of long-lived HTTP clients for the Nexus Mods API.
+
+NexusModsClient instances are short-lived (one per generation, resume or
+export), but the TCP/TLS connections behind them should not be. The pool
+hands out one httpx.AsyncClient per Nexus API key, so every call made with
+that key reuses the same keep-alive (and, when available, HTTP/2)
+connections. Clients are closed from the FastAPI lifespan on shutdown.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import time
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Return a stable, non-reversible identifier for an API key.
+
+    Used as the dict key for per-key registries so raw keys are never
+    held as lookup keys or written to logs.
+    """
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class NexusClientPool:
+    """Registry of shared httpx.AsyncClient instances keyed by Nexus API key.
+
+    Clients that have not been used for `nexus_pool_idle_seconds` are closed
+    and dropped the next time the pool is accessed, which bounds the number
+    of open pools when many users generate over the lifetime of a process.
+    """
+
+    _instance: "NexusClientPool | None" = None
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        # transport override is for tests (httpx.MockTransport)
+        self._transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._last_used: dict[str, float] = {}
+        # Background closes of evicted clients; held so they aren't collected mid-close
+        self._closing: set[asyncio.Task] = set()
+
+    @classmethod
+    def get_instance(cls) -> "NexusClientPool":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def _build_client(self) -> httpx.AsyncClient:
+        settings = get_settings()
+        limits = httpx.Limits(
+            max_connections=settings.nexus_pool_max_connections,
+            max_keepalive_connections=settings.nexus_pool_max_keepalive,
+            keepalive_expiry=settings.nexus_pool_keepalive_expiry,
+        )
+        if self._transport is not None:
+            return httpx.AsyncClient(transport=self._transport)
+
+        http2 = settings.nexus_http2 and _http2_available()
+        if settings.nexus_http2 and not http2:
+            logger.info("h2 package not installed — Nexus client pool using HTTP/1.1")
+        return httpx.AsyncClient(http2=http2, limits=limits)
+
+    def get_client(self, api_key: str) -> httpx.AsyncClient:
+        """Return the shared client for this API key, creating it if needed."""
+        self._evict_idle()
+        fingerprint = key_fingerprint(api_key)
+        client = self._clients.get(fingerprint)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            self._clients[fingerprint] = client
+            logger.debug("Opened Nexus HTTP client for key %s", fingerprint)
+        self._last_used[fingerprint] = time.monotonic()
+        return client
+
+    def _evict_idle(self) -> None:
+        """Close clients that have been idle longer than the configured window."""
+        idle_limit = get_settings().nexus_pool_idle_seconds
+        now = time.monotonic()
+        stale = [
+            fp for fp, last in self._last_used.items()
+            if now - last > idle_limit
+        ]
+        for fp in stale:
+            client = self._clients.pop(fp, None)
+            self._last_used.pop(fp, None)
+            if client is not None and not client.is_closed:
+                # Idle clients have no in-flight requests, so closing in the
+                # background is safe; we don't want get_client() to be async.
+                try:
+                    task = asyncio.get_running_loop().create_task(client.aclose())
+                except RuntimeError:
+                    pass
+                else:
+                    self._closing.add(task)
+                    task.add_done_callback(self._closing.discard)
+            logger.debug("Evicted idle Nexus HTTP client for key %s", fp)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    async def close(self) -> None:
+        """Close every pooled client. Called on application shutdown."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._last_used.clear()
+        for client in clients:
+            if not client.is_closed:
+                await client.aclose()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if clients:
+            logger.info("Closed %d pooled Nexus HTTP client(s)", len(clients))
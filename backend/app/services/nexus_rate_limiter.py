@@ -0,0 +1,227 @@
+"""Adaptive, per-API-key rate limiter for Nexus Mods requests.
+
+Every NexusModsClient built for the same key shares one limiter, so the
+concurrency and request rate against a user's key stay bounded no matter
+how many generations, resumes or exports are running.
+
+The limiter paces requests with a token bucket and adapts the refill rate
+to the budget Nexus reports in its response headers:
+
+    X-RL-Hourly-Limit / X-RL-Hourly-Remaining / X-RL-Hourly-Reset
+    X-RL-Daily-Limit  / X-RL-Daily-Remaining  / X-RL-Daily-Reset
+
+When the remaining budget drops below `nexus_rate_reserve`, the remaining
+requests are spread evenly until the reset time instead of being spent at
+full speed and then absorbing 429s. A 429 (or an exhausted budget) blocks
+the key until `Retry-After` / the reset time for every caller at once.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Mapping
+
+from app.config import get_settings
+from app.services.nexus_pool import key_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_int(value: str | None) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_timestamp(value: str | None) -> float | None:
+    """Parse a reset timestamp header into epoch seconds.
+
+    Nexus has used both ISO 8601 and "YYYY-MM-DD HH:MM:SS +0000" formats.
+    """
+    if not value:
+        return None
+    for parse in (
+        datetime.fromisoformat,
+        lambda v: datetime.strptime(v, "%Y-%m-%d %H:%M:%S %z"),
+        parsedate_to_datetime,
+    ):
+        try:
+            return parse(value.strip()).timestamp()
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (ValueError, TypeError):
+        return None
+
+
+class NexusRateLimiter:
+    """Token-bucket limiter with header-driven pacing for one Nexus API key."""
+
+    _limiters: dict[str, "NexusRateLimiter"] = {}
+
+    def __init__(
+        self,
+        max_rate: float | None = None,
+        burst: int | None = None,
+        max_concurrency: int | None = None,
+        reserve: int | None = None,
+    ):
+        settings = get_settings()
+        self.max_rate = max_rate if max_rate is not None else settings.nexus_rate_per_second
+        self.burst = burst if burst is not None else settings.nexus_rate_burst
+        self.reserve = reserve if reserve is not None else settings.nexus_rate_reserve
+        concurrency = max_concurrency if max_concurrency is not None else settings.nexus_max_concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lock = asyncio.Lock()
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0  # monotonic
+
+        # Latest budget reported by Nexus (None until the first response)
+        self.hourly_limit: int | None = None
+        self.hourly_remaining: int | None = None
+        self.hourly_reset_at: float | None = None  # epoch seconds
+        self.daily_limit: int | None = None
+        self.daily_remaining: int | None = None
+        self.daily_reset_at: float | None = None
+        self.rate_limited_count = 0
+
+    @classmethod
+    def for_key(cls, api_key: str) -> "NexusRateLimiter":
+        """Return the process-wide limiter for this API key."""
+        fingerprint = key_fingerprint(api_key)
+        limiter = cls._limiters.get(fingerprint)
+        if limiter is None:
+            limiter = cls()
+            cls._limiters[fingerprint] = limiter
+        return limiter
+
+    # ── Pacing ──
+
+    def _current_rate(self) -> float:
+        """Requests/second allowed right now, slowed when the budget runs low."""
+        rate = self.max_rate
+        now = time.time()
+        for remaining, reset_at in (
+            (self.hourly_remaining, self.hourly_reset_at),
+            (self.daily_remaining, self.daily_reset_at),
+        ):
+            if remaining is None or reset_at is None or remaining > self.reserve:
+                continue
+            seconds_left = max(1.0, reset_at - now)
+            rate = min(rate, max(remaining, 1) / seconds_left)
+        return max(rate, 1e-3)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self._current_rate())
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent (cooldown over and a token available)."""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self._current_rate()
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Concurrency slot plus a paced token — wrap every Nexus request in this."""
+        async with self._semaphore:
+            await self.acquire()
+            yield
+
+    def block_for(self, seconds: float) -> None:
+        """Hold every request on this key for at least `seconds`."""
+        until = time.monotonic() + max(0.0, seconds)
+        if until > self._blocked_until:
+            self._blocked_until = until
+
+    def cooldown_remaining(self) -> float:
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    # ── Response feedback ──
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Record the budget Nexus reported on a response."""
+        hourly = _parse_int(headers.get("x-rl-hourly-remaining"))
+        daily = _parse_int(headers.get("x-rl-daily-remaining"))
+        if hourly is None and daily is None:
+            return
+        self.hourly_limit = _parse_int(headers.get("x-rl-hourly-limit")) or self.hourly_limit
+        self.daily_limit = _parse_int(headers.get("x-rl-daily-limit")) or self.daily_limit
+        self.hourly_remaining = hourly if hourly is not None else self.hourly_remaining
+        self.daily_remaining = daily if daily is not None else self.daily_remaining
+        self.hourly_reset_at = _parse_timestamp(headers.get("x-rl-hourly-reset")) or self.hourly_reset_at
+        self.daily_reset_at = _parse_timestamp(headers.get("x-rl-daily-reset")) or self.daily_reset_at
+
+        # Budget spent: nothing to pace, just wait for the earliest reset
+        if self.hourly_remaining == 0 or self.daily_remaining == 0:
+            resets = [
+                r for r, rem in (
+                    (self.hourly_reset_at, self.hourly_remaining),
+                    (self.daily_reset_at, self.daily_remaining),
+                )
+                if rem == 0 and r is not None
+            ]
+            if resets:
+                self.block_for(max(resets) - time.time())
+
+    def note_rate_limited(self, headers: Mapping[str, str]) -> float:
+        """Handle a 429: block the key per Retry-After. Returns the delay applied."""
+        self.rate_limited_count += 1
+        self.update_from_headers(headers)
+        delay = parse_retry_after(headers.get("retry-after"))
+        if delay is None:
+            delay = self.cooldown_remaining()
+        if delay:
+            self.block_for(delay)
+        logger.warning("Nexus rate limit hit — pausing key for %.1fs", delay or 0.0)
+        return delay or 0.0
+
+    def is_constrained(self) -> bool:
+        """True when the key is cooling down or pacing to protect its budget.
+
+        Optional work (speculative prefetch, cache warming) should skip
+        itself while this is true.
+        """
+        if self.cooldown_remaining() > 0:
+            return True
+        return any(
+            remaining is not None and remaining <= self.reserve
+            for remaining in (self.hourly_remaining, self.daily_remaining)
+        )
+
+    def snapshot(self) -> dict:
+        """Budget summary for events and diagnostics."""
+        return {
+            "hourly_remaining": self.hourly_remaining,
+            "hourly_limit": self.hourly_limit,
+            "daily_remaining": self.daily_remaining,
+            "daily_limit": self.daily_limit,
+            "cooldown_seconds": round(self.cooldown_remaining(), 1),
+            "rate_per_second": round(self._current_rate(), 3),
+        }
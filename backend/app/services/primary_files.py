@@ -0,0 +1,108 @@
+"""Primary-file resolution for modlist export.
+
+The MO2 plugin needs a concrete file_id per mod. Resolved files are stored
+in the nexus_primary_files table so exporting a popular modlist again
+makes no Nexus calls at all; rows older than `nexus_primary_file_ttl_hours`
+are re-resolved with one batched modFiles request per chunk of mods.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.nexus_primary_file import NexusPrimaryFile
+from app.services.nexus_client import NexusModsClient
+
+logger = logging.getLogger(__name__)
+
+
+def pick_primary_file(files: list[dict]) -> dict | None:
+    """Return the file flagged isPrimary, else the first listed file."""
+    if not files:
+        return None
+    return next((f for f in files if f.get("isPrimary")), files[0])
+
+
+async def _upsert_rows(db: AsyncSession, values: list[dict]) -> None:
+    """Insert or refresh resolved rows; concurrent exports of a mod can race."""
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(NexusPrimaryFile).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["game_domain", "nexus_mod_id"],
+        set_={c: stmt.excluded[c] for c in ("file_id", "file_name", "size_bytes", "resolved_at")},
+    )
+    await db.execute(stmt)
+    await db.commit()
+
+
+async def resolve_primary_files(
+    db: AsyncSession,
+    nexus: NexusModsClient,
+    game_domain: str,
+    mod_ids: list[int],
+) -> dict[int, int | None]:
+    """Map each Nexus mod ID to its primary file_id.
+
+    Fresh rows are served from the DB. Missing or stale mods are resolved
+    in batch; if Nexus is unreachable or errors on a mod, its stale row
+    is kept and still returned rather than dropping a file_id the export
+    already knew about.
+    """
+    unique_ids = list(dict.fromkeys(m for m in mod_ids if m))
+    if not unique_ids:
+        return {}
+
+    result = await db.execute(
+        select(NexusPrimaryFile).where(
+            NexusPrimaryFile.game_domain == game_domain,
+            NexusPrimaryFile.nexus_mod_id.in_(unique_ids),
+        ).execution_options(populate_existing=True)
+    )
+    rows = {row.nexus_mod_id: row for row in result.scalars().all()}
+    file_ids = {mod_id: row.file_id for mod_id, row in rows.items()}
+
+    cutoff = datetime.utcnow() - timedelta(hours=get_settings().nexus_primary_file_ttl_hours)
+    to_fetch = [
+        mod_id for mod_id in unique_ids
+        if mod_id not in rows or rows[mod_id].resolved_at < cutoff
+    ]
+
+    if to_fetch:
+        try:
+            files_by_mod = await nexus.get_mods_files_batch(game_domain, to_fetch)
+        except Exception as e:
+            logger.warning(
+                "Primary file resolution failed for %d mod(s) on %s: %s",
+                len(to_fetch), game_domain, e,
+            )
+            files_by_mod = {}
+
+        now = datetime.utcnow()
+        values = []
+        for mod_id, files in files_by_mod.items():
+            if files is None:
+                continue  # errored on Nexus — keep whatever we had
+            primary = pick_primary_file(files)
+            values.append({
+                "game_domain": game_domain,
+                "nexus_mod_id": mod_id,
+                "file_id": primary.get("fileId") if primary else None,
+                "file_name": primary.get("name") if primary else None,
+                "size_bytes": primary.get("sizeInBytes") if primary else None,
+                "resolved_at": now,
+            })
+            file_ids[mod_id] = values[-1]["file_id"]
+
+        if values:
+            await _upsert_rows(db, values)
+
+        logger.info(
+            "Resolved primary files on %s: %d cached, %d fetched",
+            game_domain, len(unique_ids) - len(to_fetch), len(values),
+        )
+
+    return {mod_id: file_ids.get(mod_id) for mod_id in unique_ids}
@@ -7,6 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.database import Base, get_db
+from app.llm.client_pool import LLMClientPool
+from app.llm.latency import LatencyTracker
+from app.llm.scoreboard import ProviderScoreboard
 from app.main import app
 
 
@@ -32,6 +35,14 @@ async def setup_db():
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest.fixture(autouse=True)
+def fresh_provider_health(monkeypatch):
+    """LLM clients and provider health are process-wide; don't leak them between tests."""
+    monkeypatch.setattr(LatencyTracker, "_instance", LatencyTracker())
+    monkeypatch.setattr(ProviderScoreboard, "_instance", ProviderScoreboard())
+    monkeypatch.setattr(LLMClientPool, "_instance", LLMClientPool())
+
+
 @pytest_asyncio.fixture
 async def db_session():
     async with TestSessionLocal() as session:
@@ -52,3 +63,30 @@ async def client(db_session):
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory for services that open their own DB sessions."""
+    return TestSessionLocal
+
+
+@pytest.fixture
+def fake_nexus():
+    """Offline Nexus API stand-in seeded with a small Skyrim SE catalog."""
+    from tests.fake_nexus import FakeNexus, make_mod
+
+    return FakeNexus([
+        make_mod(1, "SkyUI", summary="Elegant, PC-friendly interface", endorsements=90000,
+                 category="User Interface", updatedAt="2025-06-01T00:00:00Z"),
+        make_mod(2, "Skyrim 2020 Parallax", summary="Texture overhaul with parallax",
+                 endorsements=40000, category="Models and Textures", updatedAt="2025-09-01T00:00:00Z"),
+        make_mod(3, "Noble Skyrim Textures", summary="HD texture overhaul for architecture",
+                 endorsements=35000, category="Models and Textures", updatedAt="2025-03-01T00:00:00Z"),
+        make_mod(4, "Ordinator - Perks of Skyrim", summary="Perk overhaul",
+                 endorsements=60000, category="Gameplay", updatedAt="2025-11-01T00:00:00Z"),
+        make_mod(5, "Immersive Armors", summary="Adds new armor sets",
+                 endorsements=50000, category="Armour", updatedAt="2025-02-01T00:00:00Z"),
+        make_mod(6, "SkyUI Patch for Ordinator", summary="Compatibility patch",
+                 endorsements=500, category="Patches", updatedAt="2025-12-01T00:00:00Z"),
+    ])
@@ -0,0 +1,121 @@
+"""In-process stand-in for the Nexus Mods API.
+
+Serves the GraphQL queries NexusModsClient sends (SearchMods, GetModDetails,
+GetModDetailsBatch, GetModFilesBatch) and the v1 validate endpoint from an
+in-memory mod list, through httpx.MockTransport — no network access.
+"""
+
+import json
+import re
+
+import httpx
+
+from app.services.nexus_cache import KeyValidationCache, NexusResponseCache, SingleFlight
+from app.services.nexus_client import NexusModsClient
+from app.services.nexus_pool import NexusClientPool
+from app.services.nexus_rate_limiter import NexusRateLimiter
+
+GAME_DOMAIN = "skyrimspecialedition"
+
+
+def make_mod(mod_id: int, name: str, **fields) -> dict:
+    """A mod as Nexus would return it, with defaults for unset fields."""
+    mod = {
+        "modId": mod_id,
+        "name": name,
+        "summary": fields.pop("summary", f"{name} for Skyrim"),
+        "description": fields.pop("description", f"<p>{name} description</p>"),
+        "author": fields.pop("author", "Modder"),
+        "version": fields.pop("version", "1.0"),
+        "endorsements": fields.pop("endorsements", 100),
+        "modCategory": {"name": fields.pop("category", "Gameplay")},
+        "updatedAt": fields.pop("updatedAt", "2026-01-01T00:00:00Z"),
+        "createdAt": "2025-01-01T00:00:00Z",
+    }
+    mod.update(fields)
+    return mod
+
+
+class FakeNexus:
+    """Mutable fake Nexus backend. Edit `mods` between calls to simulate updates."""
+
+    def __init__(self, mods: list[dict] | None = None, game_domain: str = GAME_DOMAIN):
+        self.game_domain = game_domain
+        self.mods: dict[int, dict] = {m["modId"]: m for m in (mods or [])}
+        self.requests: list[dict] = []
+
+    def add(self, mod: dict) -> None:
+        self.mods[mod["modId"]] = mod
+
+    def count(self, operation: str) -> int:
+        """Number of requests made for a GraphQL operation name (or "validate")."""
+        return sum(1 for r in self.requests if r["operation"] == operation)
+
+    # ── Transport ──
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        headers = {"x-rl-hourly-remaining": "500", "x-rl-daily-remaining": "20000"}
+        if request.url.path.endswith("validate.json"):
+            self.requests.append({"operation": "validate"})
+            return httpx.Response(200, headers=headers, json={"name": "tester", "is_premium": True})
+
+        body = json.loads(request.content)
+        query, variables = body["query"], body.get("variables") or {}
+        operation = re.search(r"query\s+(\w+)", query).group(1)
+        self.requests.append({"operation": operation, "variables": variables})
+
+        if operation == "SearchMods":
+            data = {"mods": self._search(variables)}
+        elif operation == "GetModDetails":
+            data = {"mod": self.mods.get(variables["modId"])}
+        elif operation == "GetModDetailsBatch":
+            data = {
+                f"m{k[2:]}": self.mods.get(v)
+                for k, v in variables.items() if k.startswith("id")
+            }
+        elif operation == "GetModFilesBatch":
+            data = {
+                f"f{k[2:]}": {"nodes": [{
+                    "fileId": v * 10, "name": "main", "version": "1.0",
+                    "sizeInBytes": 1024, "isPrimary": True,
+                }]}
+                for k, v in variables.items() if k.startswith("id")
+            }
+        else:
+            return httpx.Response(400, json={"errors": [{"message": f"unsupported {operation}"}]})
+        return httpx.Response(200, headers=headers, json={"data": data})
+
+    def _search(self, variables: dict) -> dict:
+        filters = variables.get("filter") or {}
+        domain = filters["gameDomainName"][0]["value"]
+        nodes = list(self.mods.values()) if domain == self.game_domain else []
+        for name_filter in filters.get("name", []):
+            term = name_filter["value"].lower()
+            nodes = [m for m in nodes if term in m["name"].lower()]
+
+        sort = (variables.get("sort") or [{}])[0]
+        if "updatedAt" in sort:
+            nodes.sort(key=lambda m: m["updatedAt"], reverse=True)
+        elif "name" in sort:
+            nodes.sort(key=lambda m: m["name"])
+        else:
+            nodes.sort(key=lambda m: m["endorsements"], reverse=True)
+
+        offset = variables.get("offset") or 0
+        count = variables.get("count") or 20
+        fields = ("modId", "name", "summary", "author", "version", "endorsements", "modCategory", "updatedAt")
+        page = [{k: m[k] for k in fields} for m in nodes[offset:offset + count]]
+        return {"nodes": page, "totalCount": len(nodes)}
+
+    # ── Clients ──
+
+    def client(self, api_key: str = "fake-key") -> NexusModsClient:
+        """A NexusModsClient wired to this fake with isolated caches and limiter."""
+        return NexusModsClient(
+            api_key,
+            pool=NexusClientPool(transport=httpx.MockTransport(self.handler)),
+            cache=NexusResponseCache(),
+            inflight=SingleFlight(),
+            rate_limiter=NexusRateLimiter(max_rate=1000, burst=1000),
+            validations=KeyValidationCache(),
+        )
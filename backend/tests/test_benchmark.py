@@ -0,0 +1,164 @@
+"""Tests for the record/replay cassettes and the offline benchmark runner."""
+
+import json
+import re
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.benchmark.cassette import Cassette, CassetteMiss, CassetteProvider, CassetteTransport
+from app.benchmark.run_benchmark import run_scenario
+from app.config import get_settings
+from app.llm.provider import LLMProvider, ToolCallRunner
+
+
+class _SearchThenAddProvider(LLMProvider):
+    """Per discovery phase: search, add a hit chosen by phase number, then stop."""
+
+    provider_id = "scripted"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        return "ok"
+
+    async def complete_turn(self, messages, tools, runner, on_text=None, on_usage=None, tool_choice=None):
+        self.calls += 1
+        if on_usage:
+            on_usage({"input_tokens": 100, "output_tokens": 10, "cached_tokens": 0, "cache_write_tokens": 0})
+        tool_names = {t["function"]["name"] for t in tools}
+        turn = sum(1 for m in messages if m["role"] == "assistant")
+        if "search_nexus" not in tool_names or turn >= 2:
+            return {"role": "assistant", "content": "Done with this phase."}
+        if turn == 0:
+            call = ("search_nexus", {"query": "s"})
+        else:
+            hits = json.loads(messages[-1]["content"])["results"]
+            phase = int(re.search(r"Phase (\d+)/", messages[1]["content"]).group(1))
+            hit = hits[phase % len(hits)]
+            call = ("add_to_modlist", {
+                "mod_id": hit["mod_id"], "name": hit["name"], "reason": "bench", "load_order": phase,
+            })
+        runner.submit(call[0], call[1])
+        return {"role": "assistant", "tool_calls": [{
+            "id": f"call-{turn}", "type": "function",
+            "function": {"name": call[0], "arguments": json.dumps(call[1])},
+        }]}
+
+    def get_model_name(self) -> str:
+        return "scripted-model"
+
+
+class TestCassette:
+    @pytest.mark.asyncio
+    async def test_transport_records_and_replays(self, tmp_path, fake_nexus):
+        path = tmp_path / "nexus.json"
+        recorder = Cassette(path, "record")
+        async with httpx.AsyncClient(
+            transport=CassetteTransport(recorder, inner=httpx.MockTransport(fake_nexus.handler)),
+        ) as http:
+            recorded = await http.get("https://api.nexusmods.com/v1/users/validate.json", headers={"apikey": "secret"})
+        recorder.save()
+        assert "secret" not in path.read_text()
+
+        player = Cassette(path, "replay")
+        async with httpx.AsyncClient(transport=CassetteTransport(player)) as http:
+            replayed = await http.get("https://api.nexusmods.com/v1/users/validate.json")
+            missing = await http.get("https://api.nexusmods.com/v1/other.json")
+
+        assert replayed.json() == recorded.json()
+        assert replayed.headers["x-rl-hourly-remaining"] == "500"
+        assert missing.status_code == 404
+        assert player.misses["nexus"] == 1
+
+    @pytest.mark.asyncio
+    async def test_provider_replays_turn_and_tool_calls(self, tmp_path):
+        path = tmp_path / "llm.json"
+        messages = [{"role": "system", "content": "Phase 1/2"}, {"role": "user", "content": "go"}]
+        tools = [{"type": "function", "function": {"name": "search_nexus"}}]
+        recorder = Cassette(path, "record")
+        recorded = await CassetteProvider(recorder, _SearchThenAddProvider()).complete_turn(
+            messages, tools, ToolCallRunner({}),
+        )
+        recorder.save()
+
+        player = CassetteProvider(Cassette(path, "replay"))
+        runner = ToolCallRunner({"search_nexus": _echo})
+        usage: list[dict] = []
+        replayed = await player.complete_turn(messages, tools, runner, on_usage=usage.append)
+
+        assert replayed == recorded
+        assert await runner.results() == ["s"]
+        assert usage[0]["input_tokens"] == 100
+        with pytest.raises(CassetteMiss):
+            await player.complete_turn([{"role": "user", "content": "other"}], tools, ToolCallRunner({}))
+
+
+async def _echo(query: str) -> str:
+    return query
+
+
+async def _record_skyrim(path, fake_nexus, monkeypatch) -> dict:
+    """Record the skyrim scenario through the scripted provider and the fake Nexus backend."""
+    from app.benchmark import run_benchmark
+
+    # The fake backend answers instantly; don't pace requests to 5/s
+    monkeypatch.setattr(get_settings(), "nexus_rate_per_second", 1000.0)
+    recorder = Cassette(path, "record")
+    transport_inner = httpx.MockTransport(fake_nexus.handler)
+    original = run_benchmark.CassetteTransport
+    monkeypatch.setattr(
+        run_benchmark, "CassetteTransport",
+        lambda cassette, latency_scale=0.0: original(cassette, inner=transport_inner),
+    )
+    recorded = await run_scenario(
+        "skyrim", recorder, [CassetteProvider(recorder, _SearchThenAddProvider())], "key",
+    )
+    monkeypatch.setattr(run_benchmark, "CassetteTransport", original)
+    recorder.save()
+    return recorded
+
+
+class TestBenchmark:
+    @pytest.mark.asyncio
+    async def test_replay_matches_recording_offline(self, tmp_path, fake_nexus, monkeypatch):
+        path = tmp_path / "skyrim.json"
+        recorded = await _record_skyrim(path, fake_nexus, monkeypatch)
+        requests_made = len(fake_nexus.requests)
+
+        player = Cassette(path, "replay")
+        replayed = await run_scenario("skyrim", player, [CassetteProvider(player)], "replay")
+
+        assert recorded["status"] == replayed["status"] == "complete"
+        assert replayed["mods"] == recorded["mods"] > 0
+        assert replayed["tool_calls"] == recorded["tool_calls"]
+        assert replayed["input_tokens"] == recorded["input_tokens"]
+        assert replayed["cassette_misses"]["llm"] == 0
+        assert len(fake_nexus.requests) == requests_made  # nothing went to the backend
+
+    @pytest.mark.asyncio
+    async def test_replay_ranks_as_of_recording_time(self, tmp_path, fake_nexus, monkeypatch):
+        from app.services.generation import ranking
+
+        # Ordinator, freshly updated, outranks SkyUI now; once both are
+        # years old SkyUI's endorsements win
+        today = datetime.now(timezone.utc)
+        fake_nexus.mods[4]["updatedAt"] = today.isoformat()
+        fake_nexus.mods[1]["updatedAt"] = (today - timedelta(days=1640)).isoformat()
+        path = tmp_path / "skyrim.json"
+        recorded = await _record_skyrim(path, fake_nexus, monkeypatch)
+        assert "recorded_at" in json.loads(path.read_text())["meta"]
+
+        class _Later(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + timedelta(days=4 * 365)
+
+        monkeypatch.setattr(ranking, "datetime", _Later)
+        player = Cassette(path, "replay")
+        replayed = await run_scenario("skyrim", player, [CassetteProvider(player)], "replay")
+
+        assert replayed["cassette_misses"]["llm"] == 0
+        assert replayed["mods"] == recorded["mods"]
@@ -0,0 +1,102 @@
+"""Tests for the bulk discovery and patch tools (several items per call)."""
+
+import json
+
+import pytest
+
+from app.llm.history import _mod_ids
+from app.services.generation.handlers import build_phase1_handlers, build_phase2_handlers
+from app.services.generation.prefetch import DetailPrefetcher
+from app.services.generation.session import GenerationSession
+from app.services.generation.tools import BULK_MAX_ITEMS
+from tests.fake_nexus import GAME_DOMAIN
+
+
+def _session(fake_nexus) -> GenerationSession:
+    session = GenerationSession(game_domain=GAME_DOMAIN, nexus=fake_nexus.client())
+    session.prefetcher = DetailPrefetcher(top_k=0)
+    return session
+
+
+def _mod(mod_id: int, **fields) -> dict:
+    return {"mod_id": mod_id, "name": f"Mod {mod_id}", "reason": "fits", "load_order": mod_id, **fields}
+
+
+class TestGetModsDetails:
+    @pytest.mark.asyncio
+    async def test_one_batch_request_with_per_item_errors(self, fake_nexus):
+        session = _session(fake_nexus)
+        handlers = build_phase1_handlers(session)
+
+        result = json.loads(await handlers["get_mods_details"]([1, 4, 4, 999, "x"]))
+
+        assert fake_nexus.count("GetModDetailsBatch") == 1
+        assert [(r["mod_id"], r.get("error")) for r in result["results"]] == [
+            (1, None), (4, None), (4, "duplicate in this call"), (999, "not found"), ("x", "expected a mod ID"),
+        ]
+        assert result["results"][0]["name"] == "SkyUI"
+        assert {1, 4} <= set(session.description_cache)
+
+
+class TestAddModsToModlist:
+    @pytest.mark.asyncio
+    async def test_adds_valid_entries_and_reports_the_rest(self, fake_nexus):
+        session = _session(fake_nexus)
+        session.modlist.append({"nexus_mod_id": 1, "name": "SkyUI"})
+        handlers = build_phase1_handlers(session)
+
+        result = json.loads(await handlers["add_mods_to_modlist"]([
+            _mod(2), _mod(1), _mod(3), _mod(3), _mod(5, load_order="first"), {"mod_id": 6}, "SkyUI",
+        ]))
+
+        assert [(r["mod_id"], r["status"], r.get("error")) for r in result["results"]] == [
+            (2, "added", None),
+            (1, "error", "already in the modlist"),
+            (3, "added", None),
+            (3, "error", "duplicate in this call"),
+            (5, "error", "load_order must be an integer"),
+            (6, "error", "missing name, reason, load_order"),
+            ("SkyUI", "error", "expected an object"),
+        ]
+        assert result["added"] == 2
+        assert result["current_count"] == 3
+        assert [e["nexus_mod_id"] for e in session.modlist] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_items_over_the_limit_are_rejected(self, fake_nexus):
+        session = _session(fake_nexus)
+        handlers = build_phase1_handlers(session)
+
+        result = json.loads(await handlers["add_mods_to_modlist"](
+            [_mod(m) for m in range(1, BULK_MAX_ITEMS + 3)]
+        ))
+
+        assert result["added"] == BULK_MAX_ITEMS
+        assert [r["status"] for r in result["results"][BULK_MAX_ITEMS:]] == ["error", "error"]
+        assert "per-call limit" in result["results"][-1]["error"]
+
+
+class TestAddPatches:
+    @pytest.mark.asyncio
+    async def test_adds_patches_with_validation(self, fake_nexus):
+        session = _session(fake_nexus)
+        handlers = build_phase2_handlers(session)
+
+        result = json.loads(await handlers["add_patches"]([
+            _mod(7, patches_mods=["SkyUI", "Ordinator"]),
+            _mod(8),
+            _mod(9, patches_mods=[1, 2]),
+        ]))
+
+        assert [(r["mod_id"], r["status"], r.get("error")) for r in result["results"]] == [
+            (7, "patch_added", None),
+            (8, "error", "missing patches_mods"),
+            (9, "error", "patches_mods must be a list of mod names"),
+        ]
+        assert [(p["nexus_mod_id"], p["is_patch"]) for p in session.patches] == [(7, True)]
+
+
+def test_history_sees_mod_ids_in_bulk_arguments():
+    assert _mod_ids({"mods": [_mod(2), _mod(3)]}) == {2, 3}
+    assert _mod_ids({"mod_ids": [1, 4]}) == {1, 4}
+    assert _mod_ids({"patches": [_mod(7, patches_mods=["SkyUI"])]}) == {7}
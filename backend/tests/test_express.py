@@ -0,0 +1,182 @@
+"""Tests for express generation: local candidates and one select_mods call per phase."""
+
+import json
+import re
+
+import pytest
+import pytest_asyncio
+
+from app.config import get_settings
+from app.llm.provider import LLMProvider
+from app.models.game import Game
+from app.models.mod_build_phase import ModBuildPhase
+from app.models.playstyle import Playstyle
+from app.schemas.modlist import ModlistGenerateRequest
+from app.services.generation import pipeline
+from app.services.generation.exceptions import ExpressSelectionError
+from app.services.generation.express import gather_candidates, parse_selection, validate_selection
+from app.services.generation.session import GenerationSession
+from app.services.generation.tools import EXPRESS_TOOL_CHOICE
+from tests.fake_nexus import GAME_DOMAIN, make_mod
+
+
+def _select(picks: list[int]) -> dict:
+    mods = [{"mod_id": m, "reason": "fits", "load_order": i + 1} for i, m in enumerate(picks)]
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{
+            "id": "call_1",
+            "type": "function",
+            "function": {"name": "select_mods", "arguments": json.dumps({"mods": mods})},
+        }],
+    }
+
+
+class _ExpressProvider(LLMProvider):
+    """Answers select_mods with scripted picks; the agentic loop adds `loop_picks`."""
+
+    provider_id = "scripted"
+
+    def __init__(self, picks: dict[int, list[int]], loop_picks: dict[int, list[int]] | None = None):
+        self.picks = picks
+        self.loop_picks = loop_picks or {}
+        self.express_calls: list[int] = []
+        self.tool_choices: list[dict | None] = []
+        self.loop_calls: list[int] = []
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        return ""
+
+    async def complete_turn(self, messages, tools, runner, on_text=None, on_usage=None, tool_choice=None):
+        number = int(re.search(r"Phase (\d+)/", messages[1]["content"]).group(1))
+        self.express_calls.append(number)
+        self.tool_choices.append(tool_choice)
+        if on_usage:
+            on_usage({"input_tokens": 100, "output_tokens": 20, "cached_tokens": 0})
+        message = _select(self.picks.get(number, []))
+        for call in message["tool_calls"]:
+            runner.submit(call["function"]["name"], json.loads(call["function"]["arguments"]))
+        return message
+
+    async def generate_with_tools(
+        self, messages, tools, tool_handlers, max_iterations=15, on_text=None, on_usage=None, on_turn=None,
+    ):
+        number = int(re.search(r"Phase (\d+)/", messages[0]["content"] + messages[1]["content"]).group(1))
+        self.loop_calls.append(number)
+        for mod_id in self.loop_picks.get(number, []):
+            await tool_handlers["add_to_modlist"](mod_id=mod_id, name=f"Mod {mod_id}", reason="loop", load_order=1)
+        return messages
+
+    def get_model_name(self) -> str:
+        return "scripted-model"
+
+
+def _phase(**fields) -> ModBuildPhase:
+    defaults = dict(phase_number=1, name="Essentials", description="", search_guidance="",
+                    rules="", example_mods="", max_mods=3)
+    return ModBuildPhase(**{**defaults, **fields})
+
+
+class TestSelection:
+    def test_parses_tool_call_and_json_text(self):
+        assert parse_selection(_select([1])) == {"mods": [{"mod_id": 1, "reason": "fits", "load_order": 1}]}
+        text = {"role": "assistant", "content": 'Here: {"mods": [{"mod_id": 4}]}'}
+        assert parse_selection(text) == {"mods": [{"mod_id": 4}]}
+        assert parse_selection({"role": "assistant", "content": "no idea"}) is None
+
+    def test_valid_selection_becomes_entries_in_load_order(self):
+        candidates = [make_mod(1, "SkyUI"), make_mod(4, "Ordinator")]
+        entries = validate_selection({"mods": [
+            {"mod_id": 4, "reason": "perks", "load_order": 2},
+            {"mod_id": 1, "reason": "ui", "load_order": 1},
+        ]}, candidates, max_mods=3)
+        assert [(e["nexus_mod_id"], e["name"], e["load_order"]) for e in entries] == [
+            (1, "SkyUI", 1), (4, "Ordinator", 2),
+        ]
+
+    @pytest.mark.parametrize("selection", [
+        None,
+        {"mods": []},
+        {"mods": [{"mod_id": 99, "reason": "", "load_order": 1}]},
+        {"mods": [{"mod_id": 1, "reason": "", "load_order": 1}] * 2},
+        {"mods": [{"mod_id": 1, "reason": ""}]},
+        {"mods": [{"mod_id": m, "reason": "", "load_order": m} for m in (1, 2, 3, 4)]},
+    ])
+    def test_invalid_selection_rejected(self, selection):
+        candidates = [make_mod(m, f"Mod {m}") for m in (1, 2, 3, 4)]
+        with pytest.raises(ExpressSelectionError):
+            validate_selection(selection, candidates, max_mods=3)
+
+
+class TestGatherCandidates:
+    @pytest.mark.asyncio
+    async def test_searches_examples_and_topics_without_modlist_mods(self, fake_nexus):
+        session = GenerationSession(game_domain=GAME_DOMAIN, nexus=fake_nexus.client())
+        session.modlist.append({"nexus_mod_id": 1, "name": "SkyUI"})
+        phase = _phase(example_mods="SkyUI, Ordinator", search_guidance="Focus on: textures.")
+
+        candidates = await gather_candidates(session, phase, max_queries=3)
+
+        assert {m["modId"] for m in candidates} == {3, 4, 6}  # SkyUI itself is already added
+        assert fake_nexus.count("SearchMods") == 3
+
+
+@pytest_asyncio.fixture
+async def express_request(db_session):
+    game = Game(name="Skyrim Special Edition", slug="skyrimse", nexus_domain=GAME_DOMAIN)
+    db_session.add(game)
+    await db_session.flush()
+    playstyle = Playstyle(game_id=game.id, name="Vanilla+", slug="vanilla-plus")
+    db_session.add(playstyle)
+    for number, name, examples in [(1, "Essentials", "SkyUI"), (2, "Gameplay", "Ordinator"), (3, "Patches", "")]:
+        db_session.add(ModBuildPhase(
+            game_id=game.id, phase_number=number, name=name, description=name,
+            search_guidance="", rules="", example_mods=examples, max_mods=3,
+        ))
+    await db_session.commit()
+    return ModlistGenerateRequest(game_id=game.id, playstyle_id=playstyle.id, mode="express")
+
+
+class TestExpressPipeline:
+    @pytest.fixture(autouse=True)
+    def _no_phase_cache(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "phase_cache_enabled", False)
+
+    @pytest.mark.asyncio
+    async def test_one_call_per_discovery_phase(self, db_session, express_request, fake_nexus, monkeypatch):
+        provider = _ExpressProvider({1: [1], 2: [4]})
+        monkeypatch.setattr(pipeline, "NexusModsClient", lambda api_key=None: fake_nexus.client())
+        events: list[dict] = []
+
+        result = await pipeline.generate_modlist(
+            db_session, express_request, event_callback=events.append,
+            nexus_api_key="key", providers=[provider],
+        )
+
+        assert provider.express_calls == [1, 2]
+        assert provider.tool_choices == [EXPRESS_TOOL_CHOICE] * 2
+        assert provider.loop_calls == [3]  # patch review stays agentic
+        assert [e["nexus_mod_id"] for e in result.entries] == [1, 4]
+        assert [e["number"] for e in events if e["type"] == "express_selection"] == [1, 2]
+        by_phase = {m["number"]: m for m in result.metrics["phases"]}
+        assert by_phase[1]["llm_calls"] == 1
+        assert by_phase[1]["input_tokens"] == 100
+
+    @pytest.mark.asyncio
+    async def test_invalid_answer_falls_back_to_agentic_loop(
+        self, db_session, express_request, fake_nexus, monkeypatch,
+    ):
+        provider = _ExpressProvider({1: [1], 2: [99]}, loop_picks={2: [5]})
+        monkeypatch.setattr(pipeline, "NexusModsClient", lambda api_key=None: fake_nexus.client())
+        events: list[dict] = []
+
+        result = await pipeline.generate_modlist(
+            db_session, express_request, event_callback=events.append,
+            nexus_api_key="key", providers=[provider],
+        )
+
+        assert provider.loop_calls == [2, 3]
+        fallback = [e for e in events if e["type"] == "express_fallback"]
+        assert [(e["number"], e["reason"]) for e in fallback] == [(2, "mod 99 is not a candidate")]
+        assert [e["nexus_mod_id"] for e in result.entries] == [1, 5]
@@ -0,0 +1,61 @@
+"""Tests for per-phase generation metrics."""
+
+import asyncio
+
+import pytest
+
+from app.llm.provider import read_only
+from app.services.generation.metrics import PhaseMetrics, total_metrics
+
+
+class TestPhaseMetrics:
+    @pytest.mark.asyncio
+    async def test_wrapped_handlers_count_and_keep_read_only(self):
+        metrics = PhaseMetrics(1, "Essentials")
+
+        @read_only
+        async def search_nexus(query: str) -> str:
+            await asyncio.sleep(0.01)
+            return "[]"
+
+        async def add_to_modlist(mod_id: int) -> str:
+            return "ok"
+
+        wrapped = metrics.wrap_handlers({"search_nexus": search_nexus, "add_to_modlist": add_to_modlist})
+        await wrapped["search_nexus"](query="ui")
+        await wrapped["search_nexus"](query="sound")
+        await wrapped["add_to_modlist"](mod_id=1)
+
+        assert getattr(wrapped["search_nexus"], "read_only", False)
+        assert not getattr(wrapped["add_to_modlist"], "read_only", False)
+        summary = metrics.summary("groq")
+        assert summary["tool_calls"] == {"add_to_modlist": 1, "search_nexus": 2}
+        assert summary["tool_seconds_by_name"]["search_nexus"] >= 0.02
+
+    def test_usage_and_turns_accumulate(self):
+        metrics = PhaseMetrics(2, "UI")
+        metrics.on_usage({"input_tokens": 100, "output_tokens": 20, "cached_tokens": 80})
+        metrics.on_usage({"input_tokens": 50, "output_tokens": 10, "cached_tokens": None})
+        metrics.on_turn({"llm_seconds": 1.5, "tool_wait_seconds": 0.25, "tool_calls": 2})
+        metrics.on_turn({"llm_seconds": 3.0, "tool_wait_seconds": 0.0, "tool_calls": 0})
+
+        summary = metrics.summary("claude")
+
+        assert (summary["input_tokens"], summary["output_tokens"], summary["cached_tokens"]) == (150, 30, 80)
+        assert summary["llm_calls"] == 2
+        assert summary["iterations"] == 2
+        assert summary["llm_seconds"] == 4.5
+        assert summary["max_turn_seconds"] == 3.0
+        assert summary["tool_wait_seconds"] == 0.25
+
+    def test_totals(self):
+        phases = [
+            {"input_tokens": 10, "output_tokens": 1, "cached_tokens": 0, "llm_calls": 1, "iterations": 1,
+             "llm_seconds": 1.0, "tool_seconds": 0.5, "tool_wait_seconds": 0.1, "tool_calls": {"a": 1}},
+            {"input_tokens": 5, "output_tokens": 2, "cached_tokens": 3, "llm_calls": 2, "iterations": 2,
+             "llm_seconds": 2.0, "tool_seconds": 0.5, "tool_wait_seconds": 0.0, "tool_calls": {"a": 2, "b": 1}},
+        ]
+        totals = total_metrics(phases)
+        assert totals["input_tokens"] == 15
+        assert totals["llm_seconds"] == 3.0
+        assert totals["tool_calls"] == {"a": 3, "b": 1}
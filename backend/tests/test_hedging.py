@@ -0,0 +1,160 @@
+"""Tests for hedged LLM turns across providers."""
+
+import asyncio
+
+import pytest
+
+from app.config import get_settings
+from app.llm.hedging import HedgeBudget, HedgedProvider
+from app.llm.latency import LatencyTracker
+from app.llm.provider import LLMProvider, read_only
+
+
+class _TimedProvider(LLMProvider):
+    """Answers every turn after `delay` seconds, optionally with one tool call."""
+
+    def __init__(self, name: str, delay: float, tool: str | None = None, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.tool = tool
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        return ""
+
+    async def complete_turn(self, messages, tools, runner, on_text=None, on_usage=None, tool_choice=None):
+        self.calls += 1
+        msg = {"role": "assistant", "content": f"{self.name} answer"}
+        if self.tool:
+            msg["tool_calls"] = [{
+                "id": f"{self.name}-1", "type": "function",
+                "function": {"name": self.tool, "arguments": "{}"},
+            }]
+            runner.submit(self.tool, {})
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        if on_text:
+            on_text(msg["content"])
+        return msg
+
+    def get_model_name(self) -> str:
+        return self.name
+
+
+@pytest.fixture(autouse=True)
+def short_delays(monkeypatch):
+    monkeypatch.setattr(get_settings(), "llm_hedge_default_delay_seconds", 0.05)
+    monkeypatch.setattr(get_settings(), "llm_hedge_min_delay_seconds", 0.01)
+
+
+class TestLatencyTracker:
+    def test_p95_needs_min_samples(self):
+        tracker = LatencyTracker(min_samples=5)
+        for s in (1, 2, 3, 4):
+            tracker.record("m", s)
+        assert tracker.percentile("m") is None
+        tracker.record("m", 5)
+        assert tracker.percentile("m") == 5
+
+    def test_p95_over_window(self):
+        tracker = LatencyTracker(window=20)
+        for s in range(1, 41):
+            tracker.record("m", float(s))
+        # Only the last 20 samples (21..40) count
+        assert tracker.percentile("m") == 39.0
+        assert tracker.percentile("m", 50) == 30.0
+
+
+class TestHedgedProvider:
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        primary = _TimedProvider("slow", delay=5)
+        backup = _TimedProvider("fast", delay=0.01)
+        events: list[dict] = []
+        hedged = HedgedProvider(primary, [backup], HedgeBudget(1), on_event=events.append)
+        texts: list[str] = []
+
+        msg, _ = await hedged.run_turn([{"role": "user", "content": "go"}], [], {}, texts.append)
+
+        assert msg["content"] == "fast answer"
+        await asyncio.sleep(0)
+        assert primary.cancelled == 1
+        assert texts == ["fast answer"]
+        assert events[0]["winner"] == "fast"
+        assert events[0]["budget_remaining"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        primary = _TimedProvider("quick", delay=0.001)
+        backup = _TimedProvider("backup", delay=0.001)
+        budget = HedgeBudget(3)
+        hedged = HedgedProvider(primary, [backup], budget)
+
+        msg, _ = await hedged.run_turn([{"role": "user", "content": "go"}], [], {})
+
+        assert msg["content"] == "quick answer"
+        assert backup.calls == 0
+        assert budget.remaining == 3
+
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_waits_for_primary(self):
+        primary = _TimedProvider("slow", delay=0.1)
+        backup = _TimedProvider("fast", delay=0.001)
+        hedged = HedgedProvider(primary, [backup], HedgeBudget(0))
+
+        msg, _ = await hedged.run_turn([{"role": "user", "content": "go"}], [], {})
+
+        assert msg["content"] == "slow answer"
+        assert backup.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_primary_failure_after_hedge_uses_hedge(self):
+        primary = _TimedProvider("broken", delay=0.1, fail=True)
+        backup = _TimedProvider("fast", delay=0.2)
+        hedged = HedgedProvider(primary, [backup], HedgeBudget(1))
+
+        msg, _ = await hedged.run_turn([{"role": "user", "content": "go"}], [], {})
+
+        assert msg["content"] == "fast answer"
+
+    @pytest.mark.asyncio
+    async def test_loser_never_runs_mutating_calls(self):
+        applied: list[str] = []
+
+        async def add_to_modlist() -> str:
+            applied.append("add")
+            return "ok"
+
+        @read_only
+        async def search_nexus() -> str:
+            return "[]"
+
+        primary = _TimedProvider("slow", delay=5, tool="add_to_modlist")
+        backup = _TimedProvider("fast", delay=0.01, tool="search_nexus")
+        hedged = HedgedProvider(primary, [backup], HedgeBudget(1))
+
+        msgs = await hedged.generate_with_tools(
+            [{"role": "user", "content": "go"}], [],
+            {"add_to_modlist": add_to_modlist, "search_nexus": search_nexus},
+            max_iterations=1,
+        )
+
+        assert msgs[-1] == {"role": "tool", "tool_call_id": "fast-1", "content": "[]"}
+        await asyncio.sleep(0.01)
+        assert applied == []
+
+    @pytest.mark.asyncio
+    async def test_delay_follows_primary_p95(self):
+        primary = _TimedProvider("m", delay=0)
+        hedged = HedgedProvider(primary, [], HedgeBudget(1))
+        assert hedged.hedge_delay() == 0.05  # default until samples exist
+        for s in (0.2, 0.3, 0.4, 0.5, 0.6):
+            LatencyTracker.get_instance().record("m", s)
+        assert hedged.hedge_delay() == 0.6
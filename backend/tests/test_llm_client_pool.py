@@ -0,0 +1,110 @@
+"""Tests for the shared LLM SDK client pool."""
+
+import pytest
+
+from app.config import get_settings
+from app.llm import client_pool as client_pool_module
+from app.llm.client_pool import LLMClientPool, client_key
+from app.llm.provider import LLMProviderFactory
+
+
+class TestLLMClientPool:
+    def test_same_provider_and_key_reuse_client(self):
+        first = LLMProviderFactory.create_from_request("groq", "key-a")
+        second = LLMProviderFactory.create_from_request("groq", "key-a")
+        assert first.client is second.client
+        assert len(LLMClientPool.get_instance()) == 1
+
+    def test_key_and_base_url_separate_clients(self):
+        pool = LLMClientPool()
+        a, _ = pool.openai("custom", "http://a/v1", "key-a")
+        b, _ = pool.openai("custom", "http://b/v1", "key-a")
+        c, _ = pool.openai("custom", "http://a/v1", "key-b")
+        assert len({id(a), id(b), id(c)}) == 3
+
+    def test_key_hides_api_key(self):
+        key = client_key("openai", "groq", None, "super-secret-key")
+        assert "secret" not in key
+
+    @pytest.mark.asyncio
+    async def test_idle_clients_evicted_and_touch_keeps_alive(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(client_pool_module.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(get_settings(), "llm_pool_idle_seconds", 60)
+        pool = LLMClientPool()
+        idle, _ = pool.openai("groq", "http://a/v1", "key-a")
+        busy, busy_key = pool.openai("groq", "http://a/v1", "key-b")
+
+        now[0] += 50
+        pool.touch(busy_key)
+        now[0] += 20
+        pool.openai("groq", "http://a/v1", "key-c")
+
+        assert len(pool) == 2
+        assert pool.openai("groq", "http://a/v1", "key-b")[0] is busy
+        assert pool.openai("groq", "http://a/v1", "key-a")[0] is not idle
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_evicted_client_closed_in_tracked_task(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(client_pool_module.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(get_settings(), "llm_pool_idle_seconds", 60)
+        pool = LLMClientPool()
+        first, _ = pool.openai("groq", "http://a/v1", "key-a")
+        now[0] += 61
+        pool.openai("groq", "http://a/v1", "key-b")
+
+        assert len(pool._closing) == 1
+        await pool.close()
+        assert first.is_closed()
+        assert not pool._closing
+
+    @pytest.mark.asyncio
+    async def test_size_cap_retires_least_recently_used(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "llm_pool_max_clients", 2)
+        pool = LLMClientPool()
+        first, _ = pool.anthropic("anthropic", "key-a")
+        pool.anthropic("anthropic", "key-b")
+        pool.anthropic("anthropic", "key-c")
+        assert len(pool) == 2
+        assert not pool._closing and not first.is_closed()
+        # Asking for the retired key again reuses the client
+        assert pool.anthropic("anthropic", "key-a")[0] is first
+        await pool.close()
+        assert first.is_closed()
+
+    @pytest.mark.asyncio
+    async def test_client_mid_turn_is_not_closed_over_the_cap(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(client_pool_module.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(get_settings(), "llm_pool_idle_seconds", 60)
+        monkeypatch.setattr(get_settings(), "llm_pool_max_clients", 1)
+        pool = LLMClientPool()
+        streaming, key = pool.openai("groq", "http://a/v1", "key-a")
+
+        with pool.in_use(key):
+            pool.openai("groq", "http://a/v1", "key-b")
+            now[0] += 120
+            pool.openai("groq", "http://a/v1", "key-c")
+            assert len(pool) == 1
+            # Only the idle client is closed; the streaming one waits
+            assert len(pool._closing) == 1 and key in pool._retiring
+            assert not streaming.is_closed()
+
+        now[0] += 30
+        pool.openai("groq", "http://a/v1", "key-d")
+        assert not streaming.is_closed() and key in pool._retiring
+        now[0] += 31
+        pool.openai("groq", "http://a/v1", "key-e")
+        assert key not in pool._retiring
+        await pool.close()
+        assert streaming.is_closed()
+
+    @pytest.mark.asyncio
+    async def test_close_closes_all_clients(self):
+        pool = LLMClientPool()
+        client, _ = pool.openai("groq", "http://a/v1", "key-a")
+        await pool.close()
+        assert client.is_closed()
+        assert len(pool) == 0
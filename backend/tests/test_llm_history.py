@@ -0,0 +1,105 @@
+"""Tests for tool-loop history compaction."""
+
+import json
+
+from app.llm.history import ToolHistory, compact_tool_result, estimate_tokens
+
+
+def _search_payload(ids: list[int]) -> str:
+    return json.dumps({
+        "results": [
+            {"mod_id": i, "name": f"Mod {i}", "summary": "x" * 200, "endorsements": 100}
+            for i in ids
+        ],
+        "count": len(ids),
+    })
+
+
+def _details_payload(mod_id: int) -> str:
+    return json.dumps({"mod_id": mod_id, "name": f"Mod {mod_id}", "description": "d" * 3000})
+
+
+def _openai_call(call_id: str, name: str, args: dict) -> dict:
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(args)}}
+
+
+def _openai_conversation() -> list[dict]:
+    return [
+        {"role": "system", "content": "system"},
+        {"role": "user", "content": "go"},
+        {"role": "assistant", "tool_calls": [_openai_call("c1", "search_nexus", {"query": "ui"})]},
+        {"role": "tool", "tool_call_id": "c1", "content": _search_payload([1, 2, 3])},
+        {"role": "assistant", "tool_calls": [_openai_call("c2", "get_mod_details", {"mod_id": 2})]},
+        {"role": "tool", "tool_call_id": "c2", "content": _details_payload(2)},
+    ]
+
+
+class TestCompactToolResult:
+    def test_search_keeps_used_ids(self):
+        compacted = json.loads(compact_tool_result(_search_payload([1, 2, 3]), {2}))
+        assert compacted["used"] == [{"mod_id": 2, "name": "Mod 2"}]
+        assert compacted["other_mod_ids"] == [1, 3]
+
+    def test_long_fields_are_trimmed(self):
+        compacted = json.loads(compact_tool_result(_details_payload(5), set()))
+        assert compacted["mod_id"] == 5
+        assert len(compacted["description"]) < 200
+
+    def test_bulk_outcomes_survive_compaction(self):
+        payload = json.dumps({
+            "results": [
+                {"mod_id": 1, "status": "added", "name": "SkyUI"},
+                {"mod_id": 2, "status": "error", "error": "load_order must be an integer"},
+            ],
+            "added": 1,
+            "current_count": 4,
+        })
+        compacted = json.loads(compact_tool_result(payload, set()))
+        assert compacted["outcomes"] == json.loads(payload)["results"]
+        assert compacted["added"] == 1
+        assert compacted["other_mod_ids"] == []
+
+    def test_small_results_unchanged(self):
+        payload = json.dumps({"status": "added", "name": "SkyUI"})
+        assert compact_tool_result(payload, set()) == payload
+        assert compact_tool_result("not json", set()) == "not json"
+
+
+class TestToolHistory:
+    def test_openai_compacts_acted_on_results_only(self):
+        messages = _openai_conversation()
+        ToolHistory(messages, token_budget=100_000, keep_turns=1).compact()
+
+        assert json.loads(messages[3]["content"])["used"] == [{"mod_id": 2, "name": "Mod 2"}]
+        # The latest result hasn't been seen by the model yet
+        assert messages[5]["content"] == _details_payload(2)
+        # Pairing is untouched
+        assert [m.get("tool_call_id") for m in messages if m["role"] == "tool"] == ["c1", "c2"]
+
+    def test_keep_turns_delays_compaction(self):
+        messages = _openai_conversation()
+        ToolHistory(messages, token_budget=100_000, keep_turns=2).compact()
+        assert messages[3]["content"] == _search_payload([1, 2, 3])
+
+    def test_over_budget_trims_old_assistant_text(self):
+        messages = _openai_conversation()
+        messages[2]["content"] = "thinking " * 200
+        tokens = ToolHistory(messages, token_budget=10, keep_turns=5).compact()
+        assert "compacted" in messages[3]["content"]
+        assert len(messages[2]["content"]) < 400
+        assert tokens == estimate_tokens(messages)
+
+    def test_history_stays_flat_over_many_turns(self):
+        messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "go"}]
+        history = ToolHistory(messages, token_budget=100_000, keep_turns=1)
+        raw = list(messages)
+        for turn in range(30):
+            call = {"role": "assistant", "tool_calls": [
+                _openai_call(f"c{turn}", "search_nexus", {"query": str(turn)}),
+            ]}
+            result = {"role": "tool", "tool_call_id": f"c{turn}", "content": _search_payload(list(range(15)))}
+            messages += [call, dict(result)]
+            raw += [call, result]
+            history.compact()
+        # Stale searches cost a few dozen tokens each instead of a full payload
+        assert estimate_tokens(messages) * 5 < estimate_tokens(raw)
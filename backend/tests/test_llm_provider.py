@@ -0,0 +1,439 @@
+"""Tests for the LLM tool-calling loop and the shared tool executor.
+
+The OpenAI SDK client is replaced with a scripted stand-in — no network.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.llm.provider import (
+    AnthropicProvider,
+    OpenAICompatibleProvider,
+    ToolCallRunner,
+    execute_tool_calls,
+    read_only,
+)
+
+
+def _tracking_handlers(log: list, delay: float = 0.02):
+    """Read-only lookup and mutating add handlers that record start/end order."""
+    in_flight = 0
+    peak = 0
+
+    @read_only
+    async def lookup(key: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        log.append(("start", key))
+        await asyncio.sleep(delay)
+        log.append(("end", key))
+        in_flight -= 1
+        return f"looked up {key}"
+
+    async def add(key: str) -> str:
+        log.append(("add", key))
+        return f"added {key}"
+
+    return {"lookup": lookup, "add": add}, lambda: peak
+
+
+class TestExecuteToolCalls:
+    @pytest.mark.asyncio
+    async def test_read_only_calls_run_concurrently_in_order(self):
+        log: list = []
+        handlers, peak = _tracking_handlers(log)
+        calls = [("lookup", {"key": str(i)}) for i in range(4)]
+
+        results = await execute_tool_calls(calls, handlers, max_concurrency=4)
+
+        assert results == [f"looked up {i}" for i in range(4)]
+        assert peak() == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        handlers, peak = _tracking_handlers([])
+        await execute_tool_calls([("lookup", {"key": str(i)}) for i in range(6)], handlers, max_concurrency=2)
+        assert peak() == 2
+
+    @pytest.mark.asyncio
+    async def test_mutating_call_is_a_barrier(self):
+        log: list = []
+        handlers, _ = _tracking_handlers(log)
+        calls = [
+            ("lookup", {"key": "a"}),
+            ("lookup", {"key": "b"}),
+            ("add", {"key": "a"}),
+            ("lookup", {"key": "c"}),
+        ]
+
+        results = await execute_tool_calls(calls, handlers)
+
+        add_at = log.index(("add", "a"))
+        assert {("end", "a"), ("end", "b")} <= set(log[:add_at])
+        assert log.index(("start", "c")) > add_at
+        assert results[2] == "added a"
+
+    @pytest.mark.asyncio
+    async def test_errors_and_unknown_tools_become_results(self):
+        @read_only
+        async def broken() -> str:
+            raise RuntimeError("boom")
+
+        results = await execute_tool_calls([("broken", {}), ("missing", {})], {"broken": broken})
+        assert json.loads(results[0]) == {"error": "boom"}
+        assert "Unknown tool" in json.loads(results[1])["error"]
+
+
+def _tool_call(call_id: str, name: str, args: dict):
+    return SimpleNamespace(
+        id=call_id, function=SimpleNamespace(name=name, arguments=json.dumps(args)),
+    )
+
+
+def _completion(content=None, tool_calls=None, usage=None):
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+class _ScriptedCompletions:
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.requests: list[dict] = []
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        return self.responses.pop(0)
+
+
+class TestOpenAICompatibleToolLoop:
+    @pytest.mark.asyncio
+    async def test_tool_results_follow_tool_call_ids(self):
+        provider = OpenAICompatibleProvider(base_url="http://localhost", api_key="x", model="m", stream=False)
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=_ScriptedCompletions([
+            _completion(tool_calls=[
+                _tool_call("c1", "lookup", {"key": "slow"}),
+                _tool_call("c2", "lookup", {"key": "fast"}),
+                _tool_call("c3", "add", {"key": "fast"}),
+            ]),
+            _completion(content="done"),
+            _completion(content="really done"),
+        ])))
+
+        @read_only
+        async def lookup(key: str) -> str:
+            await asyncio.sleep(0.03 if key == "slow" else 0)
+            return key
+
+        async def add(key: str) -> str:
+            return f"added {key}"
+
+        turns: list[dict] = []
+        messages = await provider.generate_with_tools(
+            messages=[{"role": "user", "content": "go"}],
+            tools=[],
+            tool_handlers={"lookup": lookup, "add": add},
+            on_turn=turns.append,
+        )
+
+        tool_msgs = [m for m in messages if m["role"] == "tool"]
+        assert [(m["tool_call_id"], m["content"]) for m in tool_msgs] == [
+            ("c1", "slow"), ("c2", "fast"), ("c3", "added fast"),
+        ]
+        assert [t["tool_calls"] for t in turns] == [3, 0, 0]
+        assert turns[0]["tool_wait_seconds"] >= 0.02
+
+    @pytest.mark.asyncio
+    async def test_system_prefix_first_and_cached_tokens_reported(self):
+        provider = OpenAICompatibleProvider(base_url="http://localhost", api_key="x", model="m", stream=False)
+        usage = SimpleNamespace(
+            prompt_tokens=1200, completion_tokens=30,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+        )
+        completions = _ScriptedCompletions([_completion(content="a", usage=usage), _completion(content="b")])
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        reported: list[dict] = []
+
+        await provider.generate_with_tools(
+            messages=[
+                {"role": "system", "content": "STATIC"},
+                {"role": "system", "content": "PHASE"},
+                {"role": "user", "content": "go"},
+            ],
+            tools=[],
+            tool_handlers={},
+            on_usage=reported.append,
+        )
+
+        sent = completions.requests[0]["messages"]
+        assert sent[0] == {"role": "system", "content": "STATIC\n\nPHASE"}
+        assert [m["role"] for m in sent[:2]] == ["system", "user"]
+        assert reported == [{"input_tokens": 1200, "output_tokens": 30, "cached_tokens": 1024, "cache_write_tokens": 0}]
+
+
+class _ScriptedMessages:
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.requests: list[dict] = []
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        return self.responses.pop(0)
+
+
+class TestAnthropicPromptCaching:
+    @pytest.mark.asyncio
+    async def test_cache_breakpoints_and_usage(self):
+        provider = AnthropicProvider(api_key="x", model="claude", stream=False)
+        usage = SimpleNamespace(
+            input_tokens=50, output_tokens=10,
+            cache_read_input_tokens=3000, cache_creation_input_tokens=200,
+        )
+        text = SimpleNamespace(type="text", text="done")
+        messages_api = _ScriptedMessages([
+            SimpleNamespace(content=[text], usage=usage),
+            SimpleNamespace(content=[text], usage=usage),
+        ])
+        provider.client = SimpleNamespace(messages=messages_api)
+        reported: list[dict] = []
+        tools = [
+            {"type": "function", "function": {"name": name, "description": "", "parameters": {}}}
+            for name in ("search_nexus", "finalize")
+        ]
+
+        await provider.generate_with_tools(
+            messages=[
+                {"role": "system", "content": "STATIC"},
+                {"role": "system", "content": "PHASE"},
+                {"role": "user", "content": "go"},
+            ],
+            tools=tools,
+            tool_handlers={},
+            on_usage=reported.append,
+        )
+
+        request = messages_api.requests[0]
+        assert [b["text"] for b in request["system"]] == ["STATIC", "PHASE"]
+        assert all(b["cache_control"] == {"type": "ephemeral"} for b in request["system"])
+        assert "cache_control" not in request["tools"][0]
+        assert request["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert reported[0]["cached_tokens"] == 3000
+        assert reported[0]["input_tokens"] == 3250
+
+
+_FORCE_SELECT = {"type": "function", "function": {"name": "select_mods"}}
+
+
+class TestToolChoice:
+    @pytest.mark.asyncio
+    async def test_openai_sends_tool_choice_only_when_forced(self):
+        provider = OpenAICompatibleProvider(base_url="http://localhost", api_key="x", model="m", stream=False)
+        completions = _ScriptedCompletions([_completion(content="a"), _completion(content="b")])
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+        await provider.run_turn([{"role": "user", "content": "go"}], [], {}, tool_choice=_FORCE_SELECT)
+        await provider.run_turn([{"role": "user", "content": "go"}], [], {})
+
+        assert completions.requests[0]["tool_choice"] == _FORCE_SELECT
+        assert "tool_choice" not in completions.requests[1]
+
+    @pytest.mark.asyncio
+    async def test_anthropic_translates_tool_choice(self):
+        provider = AnthropicProvider(api_key="x", model="claude", stream=False)
+        text = SimpleNamespace(type="text", text="done")
+        messages_api = _ScriptedMessages([SimpleNamespace(content=[text], usage=None)])
+        provider.client = SimpleNamespace(messages=messages_api)
+
+        await provider.run_turn([{"role": "user", "content": "go"}], [], {}, tool_choice=_FORCE_SELECT)
+
+        assert messages_api.requests[0]["tool_choice"] == {"type": "tool", "name": "select_mods"}
+
+
+class _ChunkStream:
+    """Async iterator over scripted stream events, recording how far it got."""
+
+    def __init__(self, events: list, delay: float = 0.01):
+        self.events = list(events)
+        self.delay = delay
+        self.consumed = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed >= len(self.events):
+            raise StopAsyncIteration
+        await asyncio.sleep(self.delay)
+        self.consumed += 1
+        return self.events[self.consumed - 1]
+
+
+class _StreamingCreate:
+    def __init__(self, streams: list):
+        self.streams = list(streams)
+        self.requests: list[dict] = []
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        return self.streams.pop(0)
+
+
+def _chunk(content=None, tool_calls=None, usage=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=usage)
+
+
+def _tool_delta(index, call_id=None, name=None, arguments=None):
+    return SimpleNamespace(
+        index=index, id=call_id, function=SimpleNamespace(name=name, arguments=arguments),
+    )
+
+
+class TestStreaming:
+    @pytest.mark.asyncio
+    async def test_openai_tool_starts_before_stream_ends(self):
+        provider = OpenAICompatibleProvider(base_url="http://localhost", api_key="x", model="m", stream=True)
+        first = _ChunkStream([
+            _chunk(content="Let me search for UI mods.\n"),
+            _chunk(tool_calls=[_tool_delta(0, "c1", "lookup", '{"ke')]),
+            _chunk(tool_calls=[_tool_delta(0, arguments='y": "ui"}')]),
+            _chunk(tool_calls=[_tool_delta(1, "c2", "add", '{"key": "ui"}')]),
+            *[_chunk(content=".") for _ in range(5)],
+        ])
+        completions = _StreamingCreate([first, _ChunkStream([_chunk(content="done")]), _ChunkStream([_chunk(content="done")])])
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        started_at: list[int] = []
+        thinking: list[str] = []
+
+        @read_only
+        async def lookup(key: str) -> str:
+            started_at.append(first.consumed)
+            return f"found {key}"
+
+        async def add(key: str) -> str:
+            started_at.append(first.consumed)
+            return f"added {key}"
+
+        messages = await provider.generate_with_tools(
+            messages=[{"role": "user", "content": "go"}],
+            tools=[],
+            tool_handlers={"lookup": lookup, "add": add},
+            on_text=thinking.append,
+        )
+
+        assert completions.requests[0]["stream"] is True
+        # lookup ran as soon as the next call began; add waited for the full response
+        assert started_at == [4, 9]
+        assert thinking[0] == "Let me search for UI mods."
+        assistant = messages[1]
+        assert [tc["function"]["arguments"] for tc in assistant["tool_calls"]] == ['{"key": "ui"}', '{"key": "ui"}']
+        tool_msgs = [m for m in messages if m["role"] == "tool"]
+        assert [(m["tool_call_id"], m["content"]) for m in tool_msgs] == [("c1", "found ui"), ("c2", "added ui")]
+
+    @pytest.mark.asyncio
+    async def test_openai_usage_from_final_empty_chunk(self):
+        provider = OpenAICompatibleProvider(base_url="http://localhost", api_key="x", model="m", stream=True)
+        usage = SimpleNamespace(
+            prompt_tokens=1200, completion_tokens=30,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1000),
+        )
+        stream = _ChunkStream([
+            _chunk(content="Nothing to add."),
+            SimpleNamespace(choices=[], usage=usage),
+        ], delay=0)
+        completions = _StreamingCreate([stream])
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        reported: list[dict] = []
+
+        message = await provider.complete_turn(
+            [{"role": "user", "content": "go"}], [], ToolCallRunner({}), on_usage=reported.append,
+        )
+
+        assert completions.requests[0]["stream_options"] == {"include_usage": True}
+        assert message["content"] == "Nothing to add."
+        assert [(r["input_tokens"], r["output_tokens"], r["cached_tokens"]) for r in reported] == [(1200, 30, 1000)]
+
+    @pytest.mark.asyncio
+    async def test_anthropic_stream_assembles_blocks(self):
+        provider = AnthropicProvider(api_key="x", model="claude", stream=True)
+
+        def ev(type_, **kwargs):
+            return SimpleNamespace(type=type_, **kwargs)
+
+        usage = SimpleNamespace(input_tokens=10, cache_read_input_tokens=500, cache_creation_input_tokens=0)
+        stream = _ChunkStream([
+            ev("message_start", message=SimpleNamespace(usage=usage)),
+            ev("content_block_start", index=0, content_block=SimpleNamespace(type="text", text="")),
+            ev("content_block_delta", index=0, delta=SimpleNamespace(type="text_delta", text="Searching.")),
+            ev("content_block_stop", index=0),
+            ev("content_block_start", index=1, content_block=SimpleNamespace(type="tool_use", id="t1", name="lookup")),
+            ev("content_block_delta", index=1, delta=SimpleNamespace(type="input_json_delta", partial_json='{"key":')),
+            ev("content_block_delta", index=1, delta=SimpleNamespace(type="input_json_delta", partial_json=' "ui"}')),
+            ev("content_block_stop", index=1),
+            ev("message_delta", usage=SimpleNamespace(output_tokens=42)),
+            ev("message_stop"),
+        ])
+        done = [ev("content_block_start", index=0, content_block=SimpleNamespace(type="text", text="ok"))]
+        messages_api = _StreamingCreate([stream, _ChunkStream(done), _ChunkStream(done)])
+        provider.client = SimpleNamespace(messages=messages_api)
+        started_at: list[int] = []
+        reported: list[dict] = []
+
+        @read_only
+        async def lookup(key: str) -> str:
+            started_at.append(stream.consumed)
+            return f"found {key}"
+
+        msgs = await provider.generate_with_tools(
+            messages=[{"role": "user", "content": "go"}],
+            tools=[],
+            tool_handlers={"lookup": lookup},
+            on_usage=reported.append,
+        )
+
+        assert started_at == [8]
+        assert msgs[1]["content"] == "Searching."
+        assert msgs[1]["tool_calls"][0]["function"] == {"name": "lookup", "arguments": '{"key": "ui"}'}
+        assert msgs[2] == {"role": "tool", "tool_call_id": "t1", "content": "found ui"}
+        # The shared history is converted back to tool_use/tool_result blocks
+        followup = messages_api.requests[1]["messages"]
+        assert followup[1]["content"][1] == {"type": "tool_use", "id": "t1", "name": "lookup", "input": {"key": "ui"}}
+        assert followup[2] == {
+            "role": "user",
+            "content": [{"type": "tool_result", "tool_use_id": "t1", "content": "found ui"}],
+        }
+        assert reported[0]["cached_tokens"] == 500
+        assert reported[0]["output_tokens"] == 42
+
+    @pytest.mark.asyncio
+    async def test_interrupted_stream_never_runs_mutating_calls(self):
+        provider = OpenAICompatibleProvider(base_url="http://localhost", api_key="x", model="m", stream=True)
+
+        class _Broken(_ChunkStream):
+            async def __anext__(self):
+                if self.consumed == 2:
+                    raise ConnectionError("stream reset")
+                return await super().__anext__()
+
+        added: list[str] = []
+
+        async def add(key: str) -> str:
+            added.append(key)
+            return "added"
+
+        broken = _Broken([
+            _chunk(tool_calls=[_tool_delta(0, "c1", "add", '{"key": "a"}')]),
+            _chunk(tool_calls=[_tool_delta(1, "c2", "add", '{"key": "b"}')]),
+            _chunk(content="more"),
+        ])
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=_StreamingCreate([broken])))
+
+        with pytest.raises(ConnectionError):
+            await provider.generate_with_tools(
+                messages=[{"role": "user", "content": "go"}], tools=[], tool_handlers={"add": add},
+            )
+        await asyncio.sleep(0.01)
+        assert added == []
@@ -0,0 +1,102 @@
+"""Tests for next-phase cache warming."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.generation.lookahead import PhaseLookahead, extract_phase_queries
+from app.services.generation.session import GenerationSession
+from tests.fake_nexus import GAME_DOMAIN
+
+
+def _phase(example_mods: str = "", search_guidance: str = "", phase_number: int = 2):
+    return SimpleNamespace(
+        phase_number=phase_number, example_mods=example_mods, search_guidance=search_guidance,
+    )
+
+
+class TestExtractPhaseQueries:
+    def test_examples_and_focus_topics(self):
+        phase = _phase(
+            example_mods="SkyUI, Ordinator - Perks of Skyrim, SkyUI",
+            search_guidance=(
+                "Search for interface mods. Focus on: inventory management, "
+                "mod configuration menus (MCM), and map improvements. Every list needs these."
+            ),
+        )
+        examples, topics = extract_phase_queries(phase)
+        assert examples == ["SkyUI", "Ordinator - Perks of Skyrim"]
+        assert topics == ["inventory management", "mod configuration menus", "map improvements"]
+
+    def test_example_names_keep_conjunctions(self):
+        examples, _ = extract_phase_queries(_phase(example_mods="Lux and Lux Orbis"))
+        assert examples == ["Lux and Lux Orbis"]
+
+    def test_empty_phase(self):
+        assert extract_phase_queries(_phase(example_mods=None, search_guidance=None)) == ([], [])
+
+
+class TestPhaseLookahead:
+    @pytest.mark.asyncio
+    async def test_warm_fills_shared_cache(self, fake_nexus):
+        session = GenerationSession(game_domain=GAME_DOMAIN, nexus=fake_nexus.client())
+        lookahead = PhaseLookahead(max_queries=4)
+        lookahead.start(session, _phase(example_mods="SkyUI, Ordinator"))
+        await lookahead._task
+
+        searches = fake_nexus.count("SearchMods")
+        assert searches == 2
+        assert fake_nexus.count("GetModDetailsBatch") == 1
+
+        # Phase N+1 starts: its first search and detail lookups are served locally
+        await session.nexus.search_mods(GAME_DOMAIN, "SkyUI")
+        await session.nexus.get_mod_details(GAME_DOMAIN, 4)
+        assert fake_nexus.count("SearchMods") == searches
+        assert fake_nexus.count("GetModDetails") == 0
+
+    @pytest.mark.asyncio
+    async def test_constrained_budget_skips(self, fake_nexus):
+        session = GenerationSession(game_domain=GAME_DOMAIN, nexus=fake_nexus.client())
+        session.nexus.rate_limiter.block_for(60)
+        lookahead = PhaseLookahead()
+        lookahead.start(session, _phase(example_mods="SkyUI, Ordinator"))
+        stats = await lookahead._task
+        assert stats["skipped"] == 2
+        assert fake_nexus.requests == []
+
+    @pytest.mark.asyncio
+    async def test_same_phase_started_once(self, fake_nexus):
+        session = GenerationSession(game_domain=GAME_DOMAIN, nexus=fake_nexus.client())
+        lookahead = PhaseLookahead()
+        lookahead.start(session, _phase(example_mods="SkyUI"))
+        task = lookahead._task
+        lookahead.start(session, _phase(example_mods="SkyUI"))
+        assert lookahead._task is task
+        await task
+
+    @pytest.mark.asyncio
+    async def test_new_phase_cancels_previous_warmup(self, fake_nexus):
+        session = GenerationSession(game_domain=GAME_DOMAIN, nexus=fake_nexus.client())
+        lookahead = PhaseLookahead()
+        lookahead.start(session, _phase(example_mods="SkyUI, Ordinator", phase_number=2))
+        first = lookahead._task
+        lookahead.start(session, _phase(example_mods="SkyUI", phase_number=3))
+        second = lookahead._task
+
+        await asyncio.sleep(0)
+        assert first.cancelled()
+        lookahead.cancel()
+        await asyncio.sleep(0.01)
+        assert second.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_cancel(self, fake_nexus):
+        session = GenerationSession(game_domain=GAME_DOMAIN, nexus=fake_nexus.client())
+        lookahead = PhaseLookahead()
+        lookahead.start(session, _phase(example_mods="SkyUI, Ordinator"))
+        task = lookahead._task
+        lookahead.cancel()
+        await asyncio.sleep(0.01)
+        assert task.cancelled()
+        assert fake_nexus.requests == []
@@ -0,0 +1,132 @@
+"""Tests for the local mod catalog, end to end against the fake Nexus API."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.nexus_catalog import NexusCatalogState
+from app.services.generation.handlers import build_phase1_handlers
+from app.services.generation.session import GenerationSession
+from app.services.mod_catalog import ModCatalog
+from tests.fake_nexus import GAME_DOMAIN, make_mod
+
+
+@pytest.fixture
+def catalog(session_factory):
+    return ModCatalog(session_factory=session_factory)
+
+
+class TestSync:
+    @pytest.mark.asyncio
+    async def test_full_sync_pages_through_catalog(self, catalog, fake_nexus, monkeypatch):
+        from app.config import get_settings
+        monkeypatch.setattr(get_settings(), "nexus_catalog_page_size", 4)
+
+        written = await catalog.sync(fake_nexus.client(), GAME_DOMAIN)
+
+        assert written == 6
+        assert fake_nexus.count("SearchMods") == 2  # 4 + 2
+        async with catalog._session_factory() as db:
+            state = await db.get(NexusCatalogState, GAME_DOMAIN)
+        assert state.mod_count == 6
+        assert state.high_water_updated_at == "2025-12-01T00:00:00Z"
+        assert state.last_full_sync_at is not None
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_stops_at_high_water(self, catalog, fake_nexus, monkeypatch):
+        from app.config import get_settings
+        monkeypatch.setattr(get_settings(), "nexus_catalog_page_size", 2)
+        nexus = fake_nexus.client()
+        await catalog.sync(nexus, GAME_DOMAIN)
+        fake_nexus.requests.clear()
+
+        fake_nexus.add(make_mod(7, "Campfire", updatedAt="2026-02-01T00:00:00Z"))
+        fake_nexus.mods[5]["name"] = "Immersive Armors SE"
+        fake_nexus.mods[5]["updatedAt"] = "2026-01-15T00:00:00Z"
+
+        written = await catalog.sync(nexus, GAME_DOMAIN)
+
+        assert written == 2
+        assert fake_nexus.count("SearchMods") == 2  # [7, 5] then [6, 4] hits the mark
+        results = await catalog.search(GAME_DOMAIN, "immersive armors")
+        assert results[0]["name"] == "Immersive Armors SE"
+
+
+class TestSearch:
+    @pytest.mark.asyncio
+    async def test_unsynced_catalog_defers_to_live(self, catalog):
+        assert await catalog.search(GAME_DOMAIN, "skyui") is None
+        assert catalog.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_matches_name_and_summary(self, catalog, fake_nexus):
+        await catalog.sync(fake_nexus.client(), GAME_DOMAIN)
+
+        results = await catalog.search(GAME_DOMAIN, "skyrim texture")
+        assert [r["modId"] for r in results] == [3, 2]  # 2 only mentions textures in its summary
+        assert results[0]["modCategory"] == {"name": "Models and Textures"}
+
+    @pytest.mark.asyncio
+    async def test_name_matches_rank_first(self, catalog, fake_nexus):
+        await catalog.sync(fake_nexus.client(), GAME_DOMAIN)
+        fake_nexus.add(make_mod(8, "Interface Fixes", summary="Fixes for SkyUI menus", endorsements=99999))
+        await catalog.sync(fake_nexus.client(), GAME_DOMAIN, full=True)
+
+        results = await catalog.search(GAME_DOMAIN, "skyui")
+        assert [r["modId"] for r in results] == [1, 6, 8]
+
+    @pytest.mark.asyncio
+    async def test_stale_catalog_defers_to_live(self, catalog, fake_nexus):
+        await catalog.sync(fake_nexus.client(), GAME_DOMAIN)
+        async with catalog._session_factory() as db:
+            state = await db.get(NexusCatalogState, GAME_DOMAIN)
+            state.last_synced_at = datetime.utcnow() - timedelta(days=3)
+            await db.commit()
+
+        assert await catalog.search(GAME_DOMAIN, "skyui") is None
+
+    @pytest.mark.asyncio
+    async def test_no_match_defers_to_live(self, catalog, fake_nexus):
+        await catalog.sync(fake_nexus.client(), GAME_DOMAIN)
+        assert await catalog.search(GAME_DOMAIN, "dragon riding") is None
+
+    @pytest.mark.asyncio
+    async def test_summary_only_matches_defer_to_live(self, catalog, fake_nexus):
+        nexus = fake_nexus.client()
+        await catalog.sync(nexus, GAME_DOMAIN)
+        # A newer, less endorsed mod the catalog never ingested
+        fake_nexus.add(make_mod(9, "Parallax Texture Fixes", endorsements=3))
+        fake_nexus.requests.clear()
+        session = GenerationSession(game_domain=GAME_DOMAIN, nexus=nexus, catalog=catalog)
+
+        # Mod 2 mentions both terms, but only in its summary
+        result = json.loads(await build_phase1_handlers(session)["search_nexus"]("parallax texture"))
+
+        assert fake_nexus.count("SearchMods") == 1
+        assert 9 in [m["mod_id"] for m in result["results"]]
+
+
+class TestSearchHandler:
+    @pytest.mark.asyncio
+    async def test_search_nexus_answers_from_catalog(self, catalog, fake_nexus):
+        nexus = fake_nexus.client()
+        await catalog.sync(nexus, GAME_DOMAIN)
+        fake_nexus.requests.clear()
+        session = GenerationSession(game_domain=GAME_DOMAIN, nexus=nexus, catalog=catalog)
+
+        result = json.loads(await build_phase1_handlers(session)["search_nexus"]("ordinator"))
+
+        assert [m["mod_id"] for m in result["results"]] == [4, 6]
+        assert fake_nexus.requests == []
+        assert session.author_cache[4] == "Modder"
+
+    @pytest.mark.asyncio
+    async def test_search_nexus_falls_back_to_live_on_miss(self, catalog, fake_nexus):
+        nexus = fake_nexus.client()
+        session = GenerationSession(game_domain=GAME_DOMAIN, nexus=nexus, catalog=catalog)
+
+        result = json.loads(await build_phase1_handlers(session)["search_nexus"]("ordinator"))
+
+        assert [m["mod_id"] for m in result["results"]] == [4, 6]
+        assert fake_nexus.count("SearchMods") == 1
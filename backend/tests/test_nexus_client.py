@@ -0,0 +1,439 @@
+"""Tests for the Nexus Mods client and its shared connection pool.
+
+All HTTP traffic goes through httpx.MockTransport — no network access.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.services import nexus_pool as nexus_pool_module
+from app.services.nexus_cache import (
+    KeyValidationCache,
+    NexusResponseCache,
+    SingleFlight,
+    mod_key,
+    search_key,
+)
+from app.services.nexus_client import NexusAPIError, NexusModsClient
+from app.services.nexus_pool import NexusClientPool, key_fingerprint
+from app.services.nexus_rate_limiter import NexusRateLimiter
+
+
+def _graphql_handler(calls: list):
+    """Build a MockTransport handler that records requests and echoes a mod."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path.endswith("validate.json"):
+            return httpx.Response(200, json={"name": "tester", "is_premium": False})
+        body = json.loads(request.content)
+        mod_id = body["variables"].get("modId", 1)
+        if "GetModDetailsBatch" in body["query"]:
+            ids = {k: v for k, v in body["variables"].items() if k.startswith("id")}
+            return httpx.Response(200, json={"data": {
+                f"m{k[2:]}": ({"modId": v, "name": f"Mod {v}"} if v != 404 else None)
+                for k, v in ids.items()
+            }})
+        if "SearchMods" in body["query"]:
+            term = body["variables"]["filter"]["name"][0]["value"]
+            return httpx.Response(200, json={"data": {"mods": {
+                "nodes": [{"modId": 7, "name": term, "updatedAt": "2026-02-01T00:00:00Z"}],
+                "totalCount": 1,
+            }}})
+        return httpx.Response(200, json={
+            "data": {"mod": {
+                "modId": mod_id, "name": f"Mod {mod_id}",
+                "updatedAt": "2026-01-01T00:00:00Z",
+            }},
+        })
+    return handler
+
+
+def _client(calls: list, key: str = "key-a", pool: NexusClientPool | None = None) -> NexusModsClient:
+    """NexusModsClient over a mock transport with an isolated cache."""
+    if pool is None:
+        pool = NexusClientPool(transport=httpx.MockTransport(_graphql_handler(calls)))
+    return NexusModsClient(
+        key, pool=pool, cache=NexusResponseCache(), inflight=SingleFlight(),
+        rate_limiter=NexusRateLimiter(max_rate=1000, burst=1000),
+        validations=KeyValidationCache(ttl_seconds=60),
+    )
+
+
+# ---------------------------------------------------------------------------
+# NexusClientPool
+# ---------------------------------------------------------------------------
+
+
+class TestNexusClientPool:
+    def test_same_key_reuses_client(self):
+        pool = NexusClientPool(transport=httpx.MockTransport(_graphql_handler([])))
+        assert pool.get_client("key-a") is pool.get_client("key-a")
+        assert len(pool) == 1
+
+    def test_different_keys_get_different_clients(self):
+        pool = NexusClientPool(transport=httpx.MockTransport(_graphql_handler([])))
+        assert pool.get_client("key-a") is not pool.get_client("key-b")
+        assert len(pool) == 2
+
+    @pytest.mark.asyncio
+    async def test_close_closes_all_clients(self):
+        pool = NexusClientPool(transport=httpx.MockTransport(_graphql_handler([])))
+        client = pool.get_client("key-a")
+        await pool.close()
+        assert client.is_closed
+        assert len(pool) == 0
+
+    @pytest.mark.asyncio
+    async def test_closed_client_is_replaced(self):
+        pool = NexusClientPool(transport=httpx.MockTransport(_graphql_handler([])))
+        first = pool.get_client("key-a")
+        await first.aclose()
+        assert pool.get_client("key-a") is not first
+
+    @pytest.mark.asyncio
+    async def test_idle_client_closed_in_tracked_task(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(nexus_pool_module.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(get_settings(), "nexus_pool_idle_seconds", 60)
+        pool = NexusClientPool(transport=httpx.MockTransport(_graphql_handler([])))
+        idle = pool.get_client("key-a")
+
+        now[0] += 61
+        pool.get_client("key-b")
+
+        assert len(pool._closing) == 1
+        await pool.close()
+        assert idle.is_closed
+        assert not pool._closing
+
+    def test_fingerprint_hides_key(self):
+        fp = key_fingerprint("super-secret-key")
+        assert "secret" not in fp
+        assert fp == key_fingerprint("super-secret-key")
+
+
+# ---------------------------------------------------------------------------
+# NexusModsClient over the pool
+# ---------------------------------------------------------------------------
+
+
+class TestNexusModsClient:
+    @pytest.mark.asyncio
+    async def test_instances_share_pooled_client(self):
+        calls: list = []
+        pool = NexusClientPool(transport=httpx.MockTransport(_graphql_handler(calls)))
+        first = _client(calls, pool=pool)
+        second = _client(calls, pool=pool)
+
+        await first.get_mod_details("skyrimspecialedition", 1)
+        await second.get_mod_details("skyrimspecialedition", 2)
+
+        assert first.http is second.http
+        assert len(calls) == 2
+        assert calls[0].headers["apikey"] == "key-a"
+
+    @pytest.mark.asyncio
+    async def test_validate_key_uses_pool(self):
+        calls: list = []
+        pool = NexusClientPool(transport=httpx.MockTransport(_graphql_handler(calls)))
+        client = NexusModsClient("key-a", pool=pool, validations=KeyValidationCache())
+        info = await client.validate_key()
+        assert info["name"] == "tester"
+        assert len(pool) == 1
+
+    @pytest.mark.asyncio
+    async def test_graphql_errors_raise(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"errors": [{"message": "bad filter"}]})
+
+        pool = NexusClientPool(transport=httpx.MockTransport(handler))
+        with pytest.raises(NexusAPIError, match="bad filter"):
+            await NexusModsClient("key-a", pool=pool, cache=NexusResponseCache()).get_mod_details(
+                "skyrimspecialedition", 1,
+            )
+
+
+# ---------------------------------------------------------------------------
+# Key validation cache
+# ---------------------------------------------------------------------------
+
+
+class TestKeyValidationCache:
+    @pytest.mark.asyncio
+    async def test_repeat_validation_is_cached(self):
+        calls: list = []
+        client = _client(calls)
+        await client.validate_key()
+        info = await client.validate_key()
+        assert info["name"] == "tester"
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_forces_refresh(self):
+        calls: list = []
+        client = _client(calls)
+        await client.validate_key()
+        await client.validate_key(use_cache=False)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(401, json={"message": "Please provide a valid API Key"})
+
+        validations = KeyValidationCache(ttl_seconds=60)
+        client = NexusModsClient(
+            "bad-key",
+            pool=NexusClientPool(transport=httpx.MockTransport(handler)),
+            inflight=SingleFlight(),
+            validations=validations,
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.validate_key()
+        assert len(validations) == 0
+
+    def test_invalidate_and_expiry(self):
+        validations = KeyValidationCache(ttl_seconds=60)
+        validations.set("key-a", {"name": "tester"})
+        validations.invalidate("key-a")
+        assert validations.get("key-a") is None
+
+        validations.set("key-b", {"name": "tester"})
+        fingerprint = key_fingerprint("key-b")
+        validations._entries[fingerprint] = (time.monotonic() - 1, {"name": "tester"})
+        assert validations.get("key-b") is None
+
+
+# ---------------------------------------------------------------------------
+# NexusResponseCache
+# ---------------------------------------------------------------------------
+
+
+class TestNexusResponseCache:
+    def test_hit_and_miss_counters(self):
+        cache = NexusResponseCache(max_bytes=10_000, ttl_seconds=60)
+        assert cache.get(mod_key("skyrimspecialedition", 1)) is None
+        cache.set(mod_key("skyrimspecialedition", 1), {"modId": 1})
+        assert cache.get(mod_key("skyrimspecialedition", 1)) == {"modId": 1}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_ttl_expiry(self):
+        cache = NexusResponseCache(max_bytes=10_000, ttl_seconds=60)
+        key = mod_key("skyrimspecialedition", 1)
+        cache.set(key, {"modId": 1})
+        cache._entries[key].expires_at = time.monotonic() - 1
+        assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction_by_bytes(self):
+        cache = NexusResponseCache(max_bytes=100, ttl_seconds=60)
+        cache.set(mod_key("d", 1), {"text": "a" * 30})
+        cache.set(mod_key("d", 2), {"text": "b" * 30})
+        cache.get(mod_key("d", 1))  # touch 1 so 2 is least recently used
+        cache.set(mod_key("d", 3), {"text": "c" * 30})
+        assert cache.get(mod_key("d", 2)) is None
+        assert cache.get(mod_key("d", 1)) is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= 100
+
+    def test_search_key_normalizes_query(self):
+        assert search_key("d", "  SkyUI  ", "endorsements", 0) == search_key("d", "skyui", "endorsements", 0)
+
+    def test_updated_at_invalidates_details(self):
+        cache = NexusResponseCache(max_bytes=10_000, ttl_seconds=60)
+        key = mod_key("d", 1)
+        cache.set(key, {"modId": 1}, updated_at="2026-01-01T00:00:00Z")
+        cache.note_updated_at("d", 1, "2026-01-01T00:00:00Z")
+        assert cache.get(key) is not None
+        cache.note_updated_at("d", 1, "2026-03-01T00:00:00Z")
+        assert cache.get(key) is None
+
+    def test_mutating_a_returned_value_leaves_cache_intact(self):
+        cache = NexusResponseCache(max_bytes=10_000, ttl_seconds=60)
+        stored = {"nodes": [{"modId": 2}, {"modId": 1}]}
+        cache.set(("k",), stored)
+        stored["nodes"].append({"modId": 3})
+
+        first = cache.get(("k",))
+        first["nodes"].sort(key=lambda m: m["modId"])
+        first["nodes"][0]["impact"] = "low"
+
+        assert cache.get(("k",)) == {"nodes": [{"modId": 2}, {"modId": 1}]}
+
+    @pytest.mark.asyncio
+    async def test_client_serves_repeat_calls_from_cache(self):
+        calls: list = []
+        client = _client(calls)
+        await client.get_mod_details("skyrimspecialedition", 1)
+        await client.get_mod_details("skyrimspecialedition", 1)
+        await client.search_mods("skyrimspecialedition", "SkyUI")
+        await client.search_mods("skyrimspecialedition", "skyui")
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_invalidates_stale_details(self):
+        calls: list = []
+        client = _client(calls)
+        await client.get_mod_details("skyrimspecialedition", 7)
+        # Search reports mod 7 with a newer updatedAt than the cached details
+        await client.search_mods("skyrimspecialedition", "anything")
+        await client.get_mod_details("skyrimspecialedition", 7)
+        assert len(calls) == 3
+
+
+# ---------------------------------------------------------------------------
+# SingleFlight request coalescing
+# ---------------------------------------------------------------------------
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flight.do(("k",), fetch) for _ in range(5)))
+        assert results == [1, 1, 1, 1, 1]
+        assert flight.stats()["coalesced"] == 4
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_get_independent_copies(self):
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return [{"modId": 1}]
+
+        first, second = await asyncio.gather(flight.do(("k",), fetch), flight.do(("k",), fetch))
+        first[0]["modId"] = 99
+        assert second == [{"modId": 1}]
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_all_waiters_without_poisoning(self):
+        flight = SingleFlight()
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0.01)
+            if attempts == 1:
+                raise RuntimeError("boom")
+            return "ok"
+
+        results = await asyncio.gather(
+            *(flight.do(("k",), flaky) for _ in range(3)), return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await flight.do(("k",), flaky) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        flight = SingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.create_task(flight.do(("k",), slow))
+        second = asyncio.create_task(flight.do(("k",), slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
+
+    @pytest.mark.asyncio
+    async def test_client_coalesces_identical_detail_fetches(self):
+        calls: list = []
+        client = _client(calls)
+        await asyncio.gather(*(
+            client.get_mod_details("skyrimspecialedition", 12604) for _ in range(4)
+        ))
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_other_keys_error_is_not_shared(self):
+        calls: list = []
+        ok = _graphql_handler(calls)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.01)
+            if request.headers["apikey"] == "key-a":
+                return httpx.Response(429, json={"message": "rate limited"})
+            return ok(request)
+
+        pool = NexusClientPool(transport=httpx.MockTransport(handler))
+        cache, flight = NexusResponseCache(), SingleFlight()
+        a, b = (
+            NexusModsClient(key, pool=pool, cache=cache, inflight=flight,
+                            rate_limiter=NexusRateLimiter(max_rate=1000, burst=1000))
+            for key in ("key-a", "key-b")
+        )
+
+        failed, details = await asyncio.gather(
+            a.get_mod_details("skyrimspecialedition", 3),
+            b.get_mod_details("skyrimspecialedition", 3),
+            return_exceptions=True,
+        )
+
+        assert isinstance(failed, httpx.HTTPStatusError)
+        assert details["modId"] == 3
+        assert flight.stats()["coalesced"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Batched mod details
+# ---------------------------------------------------------------------------
+
+
+class TestModDetailsBatch:
+    @pytest.mark.asyncio
+    async def test_chunks_requests(self, monkeypatch):
+        from app.config import get_settings
+        monkeypatch.setattr(get_settings(), "nexus_batch_size", 4)
+        calls: list = []
+        client = _client(calls)
+
+        result = await client.get_mods_details_batch("skyrimspecialedition", list(range(1, 11)))
+
+        assert len(calls) == 3  # 4 + 4 + 2
+        assert sorted(result) == list(range(1, 11))
+        assert result[5]["name"] == "Mod 5"
+
+    @pytest.mark.asyncio
+    async def test_fans_out_to_per_mod_cache(self):
+        calls: list = []
+        client = _client(calls)
+        await client.get_mods_details_batch("skyrimspecialedition", [1, 2, 3])
+        await client.get_mod_details("skyrimspecialedition", 2)
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_serves_cached_and_dedupes(self):
+        calls: list = []
+        client = _client(calls)
+        await client.get_mod_details("skyrimspecialedition", 1)
+        result = await client.get_mods_details_batch("skyrimspecialedition", [1, 1, 2])
+        assert len(calls) == 2
+        body = json.loads(calls[1].content)
+        assert body["variables"] == {"gameDomain": "skyrimspecialedition", "id0": 2}
+        assert set(result) == {1, 2}
+
+    @pytest.mark.asyncio
+    async def test_missing_mod_maps_to_none(self):
+        client = _client([])
+        result = await client.get_mods_details_batch("skyrimspecialedition", [3, 404])
+        assert result[404] is None
+        assert result[3]["modId"] == 3
@@ -0,0 +1,69 @@
+"""Tests for streaming pagination over Nexus search results."""
+
+import asyncio
+
+import pytest
+
+from tests.fake_nexus import GAME_DOMAIN, FakeNexus, make_mod
+
+
+@pytest.fixture
+def big_nexus():
+    return FakeNexus([make_mod(i, f"Mod {i}", endorsements=1000 - i) for i in range(1, 24)])
+
+
+class TestNexusSearchPager:
+    @pytest.mark.asyncio
+    async def test_streams_every_node_in_order(self, big_nexus):
+        pager = big_nexus.client().iter_search(GAME_DOMAIN, page_size=5)
+        ids = [mod["modId"] async for mod in pager]
+        assert ids == list(range(1, 24))
+        assert pager.total_count == 23
+        assert pager.pages_fetched == 5
+
+    @pytest.mark.asyncio
+    async def test_search_term_filters(self, big_nexus):
+        pager = big_nexus.client().iter_search(GAME_DOMAIN, "mod 2", page_size=5)
+        ids = [mod["modId"] async for mod in pager]
+        assert ids == [2, 20, 21, 22, 23]
+        assert pager.total_count == 5
+
+    @pytest.mark.asyncio
+    async def test_max_results_bounds_requests(self, big_nexus):
+        pager = big_nexus.client().iter_search(GAME_DOMAIN, page_size=5, max_results=7)
+        ids = [mod["modId"] async for mod in pager]
+        assert ids == list(range(1, 8))
+        assert big_nexus.count("SearchMods") == 2
+
+    @pytest.mark.asyncio
+    async def test_prefetches_next_page(self, big_nexus):
+        pager = big_nexus.client().iter_search(GAME_DOMAIN, page_size=5, prefetch=2)
+        pages = pager.pages()
+        await pages.__anext__()
+        await asyncio.sleep(0.01)  # let read-ahead run while "processing" page 1
+        assert big_nexus.count("SearchMods") == 3
+        await pages.aclose()
+
+    @pytest.mark.asyncio
+    async def test_no_prefetch_fetches_on_demand(self, big_nexus):
+        pager = big_nexus.client().iter_search(GAME_DOMAIN, page_size=5, prefetch=0)
+        async for _page in pager.pages():
+            await asyncio.sleep(0.01)
+            break
+        assert big_nexus.count("SearchMods") == 1
+
+    @pytest.mark.asyncio
+    async def test_constrained_budget_disables_prefetch(self, big_nexus):
+        client = big_nexus.client()
+        client.rate_limiter.reserve = 1000  # the fake reports 500 remaining
+        pages = client.iter_search(GAME_DOMAIN, page_size=5, prefetch=3).pages()
+        await pages.__anext__()
+        await asyncio.sleep(0.01)
+        assert big_nexus.count("SearchMods") == 1
+        await pages.aclose()
+
+    @pytest.mark.asyncio
+    async def test_empty_results(self, big_nexus):
+        pager = big_nexus.client().iter_search(GAME_DOMAIN, "no such mod")
+        assert [mod async for mod in pager] == []
+        assert pager.total_count == 0
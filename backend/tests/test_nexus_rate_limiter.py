@@ -0,0 +1,141 @@
+"""Tests for the shared, header-driven Nexus rate limiter."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.services.generation.handlers import retry_nexus
+from app.services.nexus_cache import NexusResponseCache, SingleFlight
+from app.services.nexus_client import NexusModsClient
+from app.services.nexus_pool import NexusClientPool
+from app.services.nexus_rate_limiter import NexusRateLimiter, parse_retry_after
+
+
+def _reset_in(seconds: float) -> str:
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).isoformat()
+
+
+class TestHeaderParsing:
+    def test_records_budget(self):
+        limiter = NexusRateLimiter(max_rate=10, burst=10)
+        limiter.update_from_headers({
+            "x-rl-hourly-limit": "500",
+            "x-rl-hourly-remaining": "420",
+            "x-rl-hourly-reset": _reset_in(600),
+            "x-rl-daily-limit": "20000",
+            "x-rl-daily-remaining": "19000",
+        })
+        snap = limiter.snapshot()
+        assert snap["hourly_remaining"] == 420
+        assert snap["daily_limit"] == 20000
+        assert not limiter.is_constrained()
+
+    def test_nexus_reset_format(self):
+        limiter = NexusRateLimiter()
+        reset = (datetime.now(timezone.utc) + timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S +0000")
+        limiter.update_from_headers({"x-rl-hourly-remaining": "10", "x-rl-hourly-reset": reset})
+        assert limiter.hourly_reset_at == pytest.approx(time.time() + 3600, abs=5)
+
+    def test_retry_after_forms(self):
+        assert parse_retry_after("12") == 12.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("garbage") is None
+
+    def test_ignores_responses_without_budget(self):
+        limiter = NexusRateLimiter()
+        limiter.update_from_headers({"content-type": "application/json"})
+        assert limiter.hourly_remaining is None
+
+
+class TestPacing:
+    def test_low_budget_slows_rate(self):
+        limiter = NexusRateLimiter(max_rate=10, burst=10, reserve=50)
+        limiter.update_from_headers({
+            "x-rl-hourly-remaining": "30",
+            "x-rl-hourly-reset": _reset_in(300),
+        })
+        # 30 requests spread over ~300 seconds
+        assert limiter.snapshot()["rate_per_second"] == pytest.approx(0.1, abs=0.01)
+        assert limiter.is_constrained()
+
+    def test_exhausted_budget_blocks_until_reset(self):
+        limiter = NexusRateLimiter()
+        limiter.update_from_headers({
+            "x-rl-hourly-remaining": "0",
+            "x-rl-hourly-reset": _reset_in(120),
+        })
+        assert limiter.cooldown_remaining() == pytest.approx(120, abs=2)
+
+    def test_429_blocks_for_retry_after(self):
+        limiter = NexusRateLimiter()
+        assert limiter.note_rate_limited({"retry-after": "30"}) == 30
+        assert limiter.cooldown_remaining() == pytest.approx(30, abs=1)
+        assert limiter.rate_limited_count == 1
+
+    @pytest.mark.asyncio
+    async def test_burst_then_paced(self):
+        limiter = NexusRateLimiter(max_rate=50, burst=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        # Two tokens from the burst, then two more at 50/s
+        assert time.monotonic() - start >= 0.03
+
+    def test_shared_per_key(self):
+        assert NexusRateLimiter.for_key("key-x") is NexusRateLimiter.for_key("key-x")
+        assert NexusRateLimiter.for_key("key-x") is not NexusRateLimiter.for_key("key-y")
+
+
+class TestClientIntegration:
+    @pytest.mark.asyncio
+    async def test_client_feeds_headers_and_429(self):
+        responses = [
+            httpx.Response(429, headers={"retry-after": "7"}),
+            httpx.Response(200, headers={"x-rl-hourly-remaining": "99"}, json={
+                "data": {"mod": {"modId": 1, "name": "Mod 1"}},
+            }),
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return responses.pop(0)
+
+        limiter = NexusRateLimiter(max_rate=1000, burst=1000)
+        client = NexusModsClient(
+            "key-a",
+            pool=NexusClientPool(transport=httpx.MockTransport(handler)),
+            cache=NexusResponseCache(),
+            inflight=SingleFlight(),
+            rate_limiter=limiter,
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_mod_details("skyrimspecialedition", 1)
+        assert limiter.cooldown_remaining() == pytest.approx(7, abs=1)
+
+        limiter._blocked_until = 0.0
+        await client.get_mod_details("skyrimspecialedition", 1)
+        assert limiter.hourly_remaining == 99
+
+    @pytest.mark.asyncio
+    async def test_retry_uses_limiter_delay(self):
+        limiter = NexusRateLimiter(max_rate=1000, burst=1000)
+        events: list[dict] = []
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                limiter.note_rate_limited({"retry-after": "0.05"})
+                request = httpx.Request("POST", "https://api.nexusmods.com/v2/graphql")
+                raise httpx.HTTPStatusError(
+                    "429", request=request, response=httpx.Response(429, request=request),
+                )
+            await limiter.acquire()
+            return "ok"
+
+        assert await retry_nexus(call, event_callback=events.append, limiter=limiter) == "ok"
+        retrying = next(e for e in events if e["type"] == "retrying")
+        assert retrying["wait_seconds"] <= 0.1
+        assert any(e["type"] == "nexus_budget" for e in events)
@@ -0,0 +1,252 @@
+"""Tests for the dependency-aware phase scheduler in the generation pipeline.
+
+LLM providers are scripted stand-ins that add fixed mods per phase; Nexus
+is the in-process fake.
+"""
+
+import asyncio
+import re
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from app.llm.provider import LLMProvider
+from app.models.game import Game
+from app.models.mod_build_phase import ModBuildPhase
+from app.models.playstyle import Playstyle
+from app.schemas.modlist import ModlistGenerateRequest
+from app.services.generation import GenerationSession, PauseGeneration, pipeline
+from app.services.generation.pipeline import resolve_phase_dependencies
+
+
+def _phase(number: int, depends_on=None):
+    return SimpleNamespace(phase_number=number, depends_on=depends_on)
+
+
+class TestResolvePhaseDependencies:
+    def test_null_means_previous_phase(self):
+        deps = resolve_phase_dependencies([_phase(1), _phase(2), _phase(3)])
+        assert deps == {1: set(), 2: {1}, 3: {1, 2}}
+
+    def test_patch_phase_waits_for_everything(self):
+        deps = resolve_phase_dependencies([_phase(1, []), _phase(2, [1]), _phase(3, [1]), _phase(4, [])])
+        assert deps[2] == deps[3] == {1}
+        assert deps[4] == {1, 2, 3}
+
+    def test_forward_and_unknown_references_dropped(self):
+        deps = resolve_phase_dependencies([_phase(1, [2]), _phase(2, [1, 9]), _phase(3)])
+        assert deps[1] == set()
+        assert deps[2] == {1}
+
+
+class TestSessionMerge:
+    def test_merge_skips_cross_phase_duplicates(self, fake_nexus):
+        root = GenerationSession(game_domain="skyrimspecialedition", nexus=fake_nexus.client())
+        root.modlist.append({"nexus_mod_id": 1, "name": "SkyUI"})
+        base = root.fork()
+        child = base.fork()
+        child.modlist += [{"nexus_mod_id": 1, "name": "SkyUI"}, {"nexus_mod_id": 4, "name": "Ordinator"}]
+
+        duplicates = root.merge(child, base)
+
+        assert [m["nexus_mod_id"] for m in root.modlist] == [1, 4]
+        assert [d["name"] for d in duplicates] == ["SkyUI"]
+
+
+class _ScriptedPhaseProvider(LLMProvider):
+    """Adds the mods scripted for each phase, after a short 'thinking' delay."""
+
+    provider_id = "scripted"
+
+    def __init__(
+        self, picks: dict[int, list[int]], fail_on: set[int] = frozenset(), delay: float = 0.02,
+        finalize: bool = False,
+    ):
+        self.picks = picks
+        self.fail_on = fail_on
+        self.delay = delay
+        self.finalize = finalize
+        self.prompts: dict[int, str] = {}
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate(self, system_prompt: str, user_prompt: str) -> str:
+        return ""
+
+    async def complete_turn(self, messages, tools, runner, on_text=None, on_usage=None, tool_choice=None):
+        return {"role": "assistant", "content": "done"}
+
+    async def generate_with_tools(
+        self, messages, tools, tool_handlers, max_iterations=15, on_text=None, on_usage=None, on_turn=None,
+    ):
+        system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+        number = int(re.search(r"Phase (\d+)/", system).group(1))
+        self.prompts[number] = system
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if number in self.fail_on:
+                raise RuntimeError("scripted failure")
+            for mod_id in self.picks.get(number, []):
+                await tool_handlers["add_to_modlist"](
+                    mod_id=mod_id, name=f"Mod {mod_id}", reason="test", load_order=1,
+                )
+            if self.finalize and "finalize" in tool_handlers:
+                await tool_handlers["finalize"]()
+        finally:
+            self.in_flight -= 1
+        return messages
+
+    def get_model_name(self) -> str:
+        return "scripted-model"
+
+
+@pytest_asyncio.fixture
+async def game_with_phases(db_session):
+    game = Game(name="Skyrim Special Edition", slug="skyrimse", nexus_domain="skyrimspecialedition")
+    db_session.add(game)
+    await db_session.flush()
+    playstyle = Playstyle(game_id=game.id, name="Vanilla+", slug="vanilla-plus")
+    db_session.add(playstyle)
+    for number, name, depends_on in [
+        (1, "Essentials", []),
+        (2, "UI", [1]),
+        (3, "Audio", [1]),
+        (4, "Patches", None),
+    ]:
+        db_session.add(ModBuildPhase(
+            game_id=game.id, phase_number=number, name=name, description=name,
+            search_guidance="", rules="", example_mods="", max_mods=3, depends_on=depends_on,
+        ))
+    await db_session.commit()
+    return ModlistGenerateRequest(game_id=game.id, playstyle_id=playstyle.id)
+
+
+def _patch_pipeline(monkeypatch, fake_nexus, provider):
+    monkeypatch.setattr(pipeline, "NexusModsClient", lambda api_key=None: fake_nexus.client())
+    monkeypatch.setattr(pipeline, "_build_provider_list", lambda request: [provider])
+
+
+class TestPhaseScheduler:
+    @pytest.mark.asyncio
+    async def test_independent_phases_run_concurrently(self, db_session, game_with_phases, fake_nexus, monkeypatch):
+        provider = _ScriptedPhaseProvider({1: [1], 2: [2, 4], 3: [3, 4]})
+        _patch_pipeline(monkeypatch, fake_nexus, provider)
+
+        result = await pipeline.generate_modlist(db_session, game_with_phases, nexus_api_key="key")
+
+        assert provider.peak == 2
+        # Merged in phase order; mod 4 picked by phases 2 and 3 appears once
+        assert [e["nexus_mod_id"] for e in result.entries] == [1, 2, 4, 3]
+        # Every phase numbered its picks from 1; the merge makes them unique
+        assert [e["load_order"] for e in result.entries] == [1, 2, 3, 4]
+        # Each phase sees its dependencies' mods, not a sibling's
+        assert "Mod 1" in provider.prompts[3]
+        assert "Mod 2" not in provider.prompts[3]
+        assert all(f"Mod {i}" in provider.prompts[4] for i in (1, 2, 3, 4))
+
+    @pytest.mark.asyncio
+    async def test_failed_phase_pauses_after_siblings_finish(self, db_session, game_with_phases, fake_nexus, monkeypatch):
+        provider = _ScriptedPhaseProvider({1: [1], 2: [2], 3: [3]}, fail_on={2})
+        _patch_pipeline(monkeypatch, fake_nexus, provider)
+
+        with pytest.raises(PauseGeneration) as exc_info:
+            await pipeline.generate_modlist(db_session, game_with_phases, nexus_api_key="key")
+
+        pause = exc_info.value
+        assert pause.phase_number == 2
+        assert pause.session_snapshot["completed_phases"] == [1, 3]
+        assert [m["nexus_mod_id"] for m in pause.session_snapshot["modlist"]] == [1, 3]
+        assert 4 not in provider.prompts
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_phases(self, db_session, game_with_phases, fake_nexus, monkeypatch):
+        provider = _ScriptedPhaseProvider({2: [2]})
+        _patch_pipeline(monkeypatch, fake_nexus, provider)
+        session = GenerationSession(game_domain="skyrimspecialedition", nexus=fake_nexus.client())
+        session.modlist += [{"nexus_mod_id": 1, "name": "Mod 1"}, {"nexus_mod_id": 3, "name": "Mod 3"}]
+        session.completed_phases = [1, 3]
+
+        result = await pipeline.generate_modlist(
+            db_session, game_with_phases, nexus_api_key="key",
+            resume_from_phase=2, resume_session=session,
+        )
+
+        assert sorted(provider.prompts) == [2, 4]
+        assert [e["nexus_mod_id"] for e in result.entries] == [1, 3, 2]
+
+    @pytest.mark.asyncio
+    async def test_phase_metrics_emitted_and_returned(self, db_session, game_with_phases, fake_nexus, monkeypatch):
+        provider = _ScriptedPhaseProvider({1: [1], 2: [2, 4], 3: [3]})
+        _patch_pipeline(monkeypatch, fake_nexus, provider)
+        events: list[dict] = []
+
+        result = await pipeline.generate_modlist(
+            db_session, game_with_phases, event_callback=events.append, nexus_api_key="key",
+        )
+
+        metrics = [e for e in events if e["type"] == "phase_metrics"]
+        assert sorted(m["number"] for m in metrics) == [1, 2, 3, 4]
+        by_phase = {m["number"]: m for m in result.metrics["phases"]}
+        assert by_phase[2]["tool_calls"] == {"add_to_modlist": 2}
+        assert by_phase[2]["provider"] == "scripted-model"
+        assert result.metrics["totals"]["tool_calls"] == {"add_to_modlist": 4}
+
+
+class TestPhaseCache:
+    @pytest.mark.asyncio
+    async def test_second_generation_replays_discovery_phases(
+        self, db_session, game_with_phases, fake_nexus, monkeypatch,
+    ):
+        _patch_pipeline(monkeypatch, fake_nexus, _ScriptedPhaseProvider({1: [1], 2: [2, 4], 3: [3]}, finalize=True))
+        first = await pipeline.generate_modlist(db_session, game_with_phases, nexus_api_key="key")
+
+        provider = _ScriptedPhaseProvider({}, finalize=True)
+        _patch_pipeline(monkeypatch, fake_nexus, provider)
+        events: list[dict] = []
+        second = await pipeline.generate_modlist(
+            db_session, game_with_phases, event_callback=events.append, nexus_api_key="key",
+        )
+
+        # Only the patch phase went to the LLM
+        assert sorted(provider.prompts) == [4]
+        assert [e["nexus_mod_id"] for e in second.entries] == [e["nexus_mod_id"] for e in first.entries]
+        cached = [e["number"] for e in events if e["type"] == "phase_complete" and e.get("cached")]
+        assert sorted(cached) == [1, 2, 3]
+        assert {m["number"]: m["provider"] for m in second.metrics["phases"]}[1] == "phase-cache"
+
+    @pytest.mark.asyncio
+    async def test_mod_updated_on_nexus_invalidates_entry(
+        self, db_session, game_with_phases, fake_nexus, monkeypatch,
+    ):
+        _patch_pipeline(monkeypatch, fake_nexus, _ScriptedPhaseProvider({1: [1], 2: [2], 3: [3]}, finalize=True))
+        await pipeline.generate_modlist(db_session, game_with_phases, nexus_api_key="key")
+        fake_nexus.mods[2]["updatedAt"] = "2026-09-01T00:00:00Z"
+
+        provider = _ScriptedPhaseProvider({2: [4]}, finalize=True)
+        _patch_pipeline(monkeypatch, fake_nexus, provider)
+        result = await pipeline.generate_modlist(db_session, game_with_phases, nexus_api_key="key")
+
+        assert sorted(provider.prompts) == [2, 4]
+        assert [e["nexus_mod_id"] for e in result.entries] == [1, 4, 3]
+
+    @pytest.mark.asyncio
+    async def test_hardware_tier_and_unfinalized_phases_not_shared(
+        self, db_session, game_with_phases, fake_nexus, monkeypatch,
+    ):
+        _patch_pipeline(monkeypatch, fake_nexus, _ScriptedPhaseProvider({1: [1], 2: [2], 3: [3]}))
+        await pipeline.generate_modlist(db_session, game_with_phases, nexus_api_key="key")
+
+        # Phases that never called finalize() weren't stored
+        provider = _ScriptedPhaseProvider({1: [1], 2: [2], 3: [3]}, finalize=True)
+        _patch_pipeline(monkeypatch, fake_nexus, provider)
+        await pipeline.generate_modlist(db_session, game_with_phases, nexus_api_key="key")
+        assert sorted(provider.prompts) == [1, 2, 3, 4]
+
+        provider = _ScriptedPhaseProvider({}, finalize=True)
+        _patch_pipeline(monkeypatch, fake_nexus, provider)
+        ultra = game_with_phases.model_copy(update={"gpu": "RTX 4090", "vram_mb": 24576, "ram_gb": 64, "cpu_cores": 16, "cpu_speed_ghz": 5.0})
+        await pipeline.generate_modlist(db_session, ultra, nexus_api_key="key")
+        assert sorted(provider.prompts) == [1, 2, 3, 4]
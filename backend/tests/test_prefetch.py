@@ -0,0 +1,85 @@
+"""Tests for speculative mod-detail prefetch in the discovery handlers."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.generation.handlers import build_phase1_handlers, finish_prefetch
+from app.services.generation.prefetch import DetailPrefetcher
+from app.services.generation.session import GenerationSession
+from tests.fake_nexus import GAME_DOMAIN
+
+
+def _session(fake_nexus, top_k: int = 3) -> GenerationSession:
+    session = GenerationSession(game_domain=GAME_DOMAIN, nexus=fake_nexus.client())
+    session.prefetcher = DetailPrefetcher(top_k=top_k)
+    return session
+
+
+class TestDetailPrefetch:
+    @pytest.mark.asyncio
+    async def test_search_prefetches_top_hits(self, fake_nexus):
+        session = _session(fake_nexus, top_k=2)
+        handlers = build_phase1_handlers(session)
+
+        await handlers["search_nexus"]("skyrim")
+        await asyncio.sleep(0.01)
+
+        batch = [r for r in fake_nexus.requests if r["operation"] == "GetModDetailsBatch"]
+        assert len(batch) == 1
+        assert sorted(v for k, v in batch[0]["variables"].items() if k.startswith("id")) == [2, 4]
+        assert set(session.description_cache) == {2, 4}
+
+    @pytest.mark.asyncio
+    async def test_details_after_prefetch_skip_nexus(self, fake_nexus):
+        session = _session(fake_nexus)
+        handlers = build_phase1_handlers(session)
+        await handlers["search_nexus"]("skyui")
+
+        # Asked for before the prefetch lands — waits for it instead of refetching
+        details = json.loads(await handlers["get_mod_details"](1))
+
+        assert details["name"] == "SkyUI"
+        assert fake_nexus.count("GetModDetails") == 0
+        assert session.prefetcher.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_report_waste_and_reset(self, fake_nexus):
+        session = _session(fake_nexus)
+        handlers = build_phase1_handlers(session)
+        await handlers["search_nexus"]("skyui")
+        await handlers["get_mod_details"](1)
+
+        events: list[dict] = []
+        finish_prefetch(session, events.append)
+
+        metrics = events[0]["_debug"]
+        assert metrics["requested"] == 2
+        assert metrics["hits"] == 1
+        assert metrics["wasted"] == 1
+        assert session.prefetcher is None
+
+    @pytest.mark.asyncio
+    async def test_constrained_budget_skips_prefetch(self, fake_nexus):
+        session = _session(fake_nexus)
+        session.nexus.rate_limiter.block_for(60)
+        session.prefetcher.schedule(session, [1, 2, 3])
+        assert session.prefetcher.stats()["skipped_constrained"] == 1
+        assert fake_nexus.requests == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_pending(self, fake_nexus):
+        session = _session(fake_nexus)
+        session.prefetcher.schedule(session, [1, 2, 3])
+        session.prefetcher.cancel()
+        await asyncio.sleep(0.01)
+        assert session.prefetcher.stats()["cancelled"] == 3
+        assert session.description_cache == {}
+
+    @pytest.mark.asyncio
+    async def test_disabled_with_zero_k(self, fake_nexus):
+        session = _session(fake_nexus, top_k=0)
+        await build_phase1_handlers(session)["search_nexus"]("skyui")
+        await asyncio.sleep(0.01)
+        assert fake_nexus.count("GetModDetailsBatch") == 0
@@ -0,0 +1,136 @@
+"""Tests for batched, DB-cached primary-file resolution used by modlist export."""
+
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from app.models.nexus_primary_file import NexusPrimaryFile
+from app.services.nexus_cache import NexusResponseCache, SingleFlight
+from app.services.nexus_client import NexusModsClient
+from app.services.nexus_pool import NexusClientPool
+from app.services.primary_files import _upsert_rows, pick_primary_file, resolve_primary_files
+
+
+def _files_client(calls: list, fail: bool = False, errored: tuple[int, ...] = ()) -> NexusModsClient:
+    """Client whose mock Nexus answers GetModFilesBatch with two files per mod.
+
+    Mods in `errored` come back as a null alias with a GraphQL error, like
+    a partial Nexus response.
+    """
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        if fail:
+            return httpx.Response(503)
+        variables = calls[-1]["variables"]
+        data = {}
+        for name, mod_id in variables.items():
+            if not name.startswith("id"):
+                continue
+            if mod_id in errored:
+                data[f"f{name[2:]}"] = None
+                continue
+            data[f"f{name[2:]}"] = {"nodes": [
+                {"fileId": mod_id * 10, "name": "optional", "isPrimary": False, "sizeInBytes": 1},
+                {"fileId": mod_id * 10 + 1, "name": "main", "isPrimary": True, "sizeInBytes": 2048},
+            ]}
+        errors = [{"message": "internal error", "path": [f"f{i}"]} for i in range(len(errored))]
+        return httpx.Response(200, json={"data": data, **({"errors": errors} if errored else {})})
+
+    pool = NexusClientPool(transport=httpx.MockTransport(handler))
+    return NexusModsClient("key", pool=pool, cache=NexusResponseCache(), inflight=SingleFlight())
+
+
+class TestPickPrimaryFile:
+    def test_prefers_primary(self):
+        files = [{"fileId": 1}, {"fileId": 2, "isPrimary": True}]
+        assert pick_primary_file(files)["fileId"] == 2
+
+    def test_falls_back_to_first(self):
+        assert pick_primary_file([{"fileId": 1}, {"fileId": 2}])["fileId"] == 1
+
+    def test_empty(self):
+        assert pick_primary_file([]) is None
+
+
+class TestResolvePrimaryFiles:
+    @pytest.mark.asyncio
+    async def test_batches_and_persists(self, db_session):
+        calls: list = []
+        result = await resolve_primary_files(
+            db_session, _files_client(calls), "skyrimspecialedition", [1, 2, 3],
+        )
+        assert result == {1: 11, 2: 21, 3: 31}
+        assert len(calls) == 1
+
+        rows = (await db_session.execute(select(NexusPrimaryFile))).scalars().all()
+        assert {r.nexus_mod_id: r.size_bytes for r in rows} == {1: 2048, 2: 2048, 3: 2048}
+
+    @pytest.mark.asyncio
+    async def test_repeat_export_makes_no_calls(self, db_session):
+        calls: list = []
+        client = _files_client(calls)
+        await resolve_primary_files(db_session, client, "skyrimspecialedition", [1, 2])
+        result = await resolve_primary_files(db_session, client, "skyrimspecialedition", [2, 1])
+        assert result == {2: 21, 1: 11}
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_rows_are_revalidated(self, db_session):
+        db_session.add(NexusPrimaryFile(
+            game_domain="skyrimspecialedition", nexus_mod_id=1, file_id=999,
+            resolved_at=datetime.utcnow() - timedelta(days=30),
+        ))
+        await db_session.commit()
+
+        calls: list = []
+        result = await resolve_primary_files(
+            db_session, _files_client(calls), "skyrimspecialedition", [1],
+        )
+        assert result == {1: 11}
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_rows_survive_nexus_outage(self, db_session):
+        db_session.add(NexusPrimaryFile(
+            game_domain="skyrimspecialedition", nexus_mod_id=1, file_id=999,
+            resolved_at=datetime.utcnow() - timedelta(days=30),
+        ))
+        await db_session.commit()
+
+        result = await resolve_primary_files(
+            db_session, _files_client([], fail=True), "skyrimspecialedition", [1, 2],
+        )
+        assert result == {1: 999, 2: None}
+
+    @pytest.mark.asyncio
+    async def test_errored_mods_keep_their_stale_row(self, db_session):
+        stale_at = datetime.utcnow() - timedelta(days=30)
+        db_session.add(NexusPrimaryFile(
+            game_domain="skyrimspecialedition", nexus_mod_id=1, file_id=999, resolved_at=stale_at,
+        ))
+        await db_session.commit()
+
+        result = await resolve_primary_files(
+            db_session, _files_client([], errored=(1, 3)), "skyrimspecialedition", [1, 2, 3],
+        )
+
+        assert result == {1: 999, 2: 21, 3: None}
+        rows = (await db_session.execute(select(NexusPrimaryFile))).scalars().all()
+        assert {r.nexus_mod_id: (r.file_id, r.resolved_at == stale_at) for r in rows} == {
+            1: (999, True), 2: (21, False),
+        }
+
+    @pytest.mark.asyncio
+    async def test_upsert_tolerates_a_row_written_concurrently(self, db_session):
+        row = {
+            "game_domain": "skyrimspecialedition", "nexus_mod_id": 1, "file_id": 11,
+            "file_name": "main", "size_bytes": 2048, "resolved_at": datetime.utcnow(),
+        }
+        await _upsert_rows(db_session, [row])
+        await _upsert_rows(db_session, [{**row, "file_id": 12}])
+
+        rows = (await db_session.execute(select(NexusPrimaryFile))).scalars().all()
+        assert [(r.nexus_mod_id, r.file_id) for r in rows] == [(1, 12)]
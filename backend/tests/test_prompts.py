@@ -0,0 +1,47 @@
+"""Tests for the phase prompt builders."""
+
+from types import SimpleNamespace
+
+from app.services.generation.prompts import build_patch_phase_prompt, build_phase_prompt
+
+GAME = SimpleNamespace(name="Skyrim Special Edition", slug="skyrimse")
+PLAYSTYLE = SimpleNamespace(name="Vanilla+")
+
+
+def _phase(number: int, name: str, playstyle_driven: bool = False):
+    return SimpleNamespace(
+        phase_number=number, name=name, description=f"{name} mods",
+        search_guidance=f"Search for {name}.", rules="Be careful.",
+        example_mods="SkyUI", is_playstyle_driven=playstyle_driven, max_mods=4,
+    )
+
+
+def _session(*names: str):
+    return SimpleNamespace(modlist=[
+        {"name": name, "nexus_mod_id": i, "reason": ""} for i, name in enumerate(names, 1)
+    ])
+
+
+def _build(phase, session):
+    return build_phase_prompt(
+        phase, GAME, PLAYSTYLE, "SE", "SE notes", "USER HARDWARE: ...", session, 10,
+    )
+
+
+class TestPromptPrefix:
+    def test_prefix_identical_across_phases(self):
+        prefix_a, suffix_a = _build(_phase(2, "UI & Interface"), _session())
+        prefix_b, suffix_b = _build(_phase(7, "Gameplay", playstyle_driven=True), _session("SkyUI"))
+
+        assert prefix_a == prefix_b
+        assert "Phase 2/10" in suffix_a and "Phase 7/10" in suffix_b
+        assert "SkyUI (Nexus ID: 1)" in suffix_b
+        assert "REFERENCE METHODOLOGY" in prefix_a
+
+    def test_patch_prompt_puts_modlist_in_suffix(self):
+        prefix, suffix = build_patch_phase_prompt(
+            _phase(10, "Compatibility Patches"), GAME, "SE", _session("SkyUI", "Ordinator"), 10,
+        )
+        assert "Ordinator" not in prefix
+        assert "Ordinator" in suffix
+        assert "finalize_review" in prefix
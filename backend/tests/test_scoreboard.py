@@ -0,0 +1,109 @@
+"""Tests for the process-wide LLM provider scoreboard."""
+
+import pytest
+
+from app.llm import scoreboard as scoreboard_module
+from app.llm.scoreboard import ProviderScoreboard, provider_key
+from app.llm.provider import LLMProviderFactory, OpenAICompatibleProvider
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(scoreboard_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def board(clock):
+    board = ProviderScoreboard()
+    board.alpha = 0.5
+    board.failure_threshold = 3
+    board.open_seconds = 60
+    board.rate_limit_cooldown = 30
+    board.default_latency = 10
+    return board
+
+
+def _provider(provider_id: str, model: str) -> OpenAICompatibleProvider:
+    provider = OpenAICompatibleProvider(base_url="http://x", api_key="k", model=model, stream=False)
+    provider.provider_id = provider_id
+    return provider
+
+
+class TestProviderScoreboard:
+    def test_ewma_latency(self, board):
+        board.record_success("groq:a", 2.0)
+        board.record_success("groq:a", 4.0)
+        assert board.snapshot()["groq:a"]["ewma_latency"] == 3.0
+
+    def test_circuit_opens_after_consecutive_failures(self, board):
+        for _ in range(2):
+            board.record_failure("groq:a", "timeout")
+        assert board.available("groq:a")
+        board.record_failure("groq:a", "timeout")
+        assert not board.available("groq:a")
+        assert board.snapshot()["groq:a"]["circuit"] == "open"
+        assert board.snapshot()["groq:a"]["errors"] == {"timeout": 3}
+
+    def test_half_open_admits_one_probe(self, board, clock):
+        for _ in range(3):
+            board.record_failure("groq:a", "connection")
+        clock.now += 61
+        assert board.available("groq:a", claim=True)
+        assert not board.available("groq:a")  # probe in flight
+
+        board.record_success("groq:a", 1.0)
+        assert board.snapshot()["groq:a"]["circuit"] == "closed"
+        assert board.available("groq:a")
+
+    def test_failed_probe_reopens(self, board, clock):
+        for _ in range(3):
+            board.record_failure("groq:a", "connection")
+        clock.now += 61
+        board.available("groq:a", claim=True)
+        board.record_failure("groq:a", "connection")
+        assert board.snapshot()["groq:a"]["circuit"] == "open"
+
+    def test_rate_limit_cools_down(self, board, clock):
+        board.record_failure("groq:a", "rate_limit")
+        assert not board.available("groq:a")
+        clock.now += 31
+        assert board.available("groq:a")
+
+    def test_key_errors_do_not_trip_breaker(self, board):
+        for _ in range(5):
+            board.record_failure("groq:a", "auth_error")
+        assert board.available("groq:a")
+        assert board.expected_latency("groq:a") == 10
+
+    def test_order_by_expected_latency(self, board):
+        slow, fast, unknown, broken = (
+            _provider("groq", "slow"), _provider("together", "fast"),
+            _provider("openai", "unknown"), _provider("mistral", "broken"),
+        )
+        board.record_success(provider_key(slow), 20.0)
+        board.record_success(provider_key(fast), 3.0)
+        for _ in range(3):
+            board.record_failure(provider_key(broken), "timeout")
+
+        ordered = board.order([broken, slow, unknown, fast])
+
+        assert ordered == [fast, unknown, slow, broken]
+
+    def test_errors_raise_expected_latency(self, board):
+        board.record_success("groq:a", 4.0)
+        board.record_failure("groq:a", "timeout")
+        assert board.expected_latency("groq:a") == pytest.approx(8.0)
+
+    def test_factory_sets_provider_id(self):
+        provider = LLMProviderFactory.create_from_request("custom-host", "k", base_url="http://x", model="m")
+        assert provider_key(provider) == "custom-host:m"
@@ -0,0 +1,86 @@
+"""Tests for local pre-ranking of search_nexus results."""
+
+import json
+
+import pytest
+
+from app.config import get_settings
+from app.models.mod import Mod
+from app.services.generation.handlers import build_phase1_handlers
+from app.services.generation.prefetch import DetailPrefetcher
+from app.services.generation.ranking import load_known_mods, rank_search_results
+from app.services.generation.session import GenerationSession
+from tests.fake_nexus import GAME_DOMAIN, make_mod
+
+
+def _session(fake_nexus, **fields) -> GenerationSession:
+    session = GenerationSession(game_domain=GAME_DOMAIN, nexus=fake_nexus.client(), **fields)
+    session.prefetcher = DetailPrefetcher(top_k=0)
+    return session
+
+
+def _known(impact=None, vram=None, support="all") -> dict:
+    return {"performance_impact": impact, "vram_requirement_mb": vram, "game_version_support": support}
+
+
+class TestRankSearchResults:
+    def test_popular_recent_mod_overtakes_stale_one_and_top_n(self, fake_nexus):
+        results = [
+            make_mod(12, "Middling", endorsements=3000, updatedAt="2024-01-01T00:00:00Z"),
+            make_mod(10, "Old Obscure", endorsements=20, updatedAt="2017-01-01T00:00:00Z"),
+            make_mod(11, "Popular", endorsements=80000, updatedAt="2026-08-01T00:00:00Z"),
+        ]
+        ranked, _ = rank_search_results(_session(fake_nexus), results, top_n=2)
+        assert [m["modId"] for m in ranked] == [12, 11]
+
+    def test_modlist_duplicates_and_incompatible_mods_dropped(self, fake_nexus):
+        session = _session(fake_nexus, game_version="SE", known_mods={11: _known(support="ae_required")})
+        session.modlist.append({"nexus_mod_id": 10, "name": "Already here"})
+        results = [make_mod(10, "Already here"), make_mod(11, "AE only"), make_mod(12, "Fine")]
+
+        ranked, filtered = rank_search_results(session, results, top_n=8)
+
+        assert [m["modId"] for m in ranked] == [12]
+        assert filtered == {"already_added": [10], "incompatible": 1}
+
+    def test_heavy_mods_ranked_down(self, fake_nexus):
+        session = _session(fake_nexus, vram_budget_mb=4096, known_mods={
+            10: _known(impact="high", vram=8192),
+            11: _known(impact="low", vram=256),
+        })
+        results = [
+            make_mod(10, "4K Everything", endorsements=90000),
+            make_mod(11, "Lean Textures", endorsements=5000),
+        ]
+        ranked, _ = rank_search_results(session, results, top_n=8)
+        assert [m["modId"] for m in ranked] == [11, 10]
+
+
+class TestSearchHandler:
+    @pytest.mark.asyncio
+    async def test_returns_ranked_top_n_with_known_facts(self, fake_nexus, monkeypatch):
+        monkeypatch.setattr(get_settings(), "nexus_search_top_n", 1)
+        session = _session(fake_nexus, known_mods={4: _known(impact="medium", vram=512)})
+        session.modlist.append({"nexus_mod_id": 2, "name": "Skyrim 2020 Parallax"})
+
+        result = json.loads(await build_phase1_handlers(session)["search_nexus"]("skyrim"))
+
+        assert result["count"] == 1
+        assert result["results"][0]["mod_id"] == 4
+        assert result["results"][0]["impact"] == "medium"
+        assert result["results"][0]["vram_mb"] == 512
+        assert result["already_in_modlist"] == [2]
+
+    @pytest.mark.asyncio
+    async def test_load_known_mods(self, db_session):
+        db_session.add_all([
+            Mod(name="SkyUI", nexus_mod_id=1, nexus_game_domain=GAME_DOMAIN,
+                performance_impact="low", vram_requirement_mb=0),
+            Mod(name="Other game", nexus_mod_id=2, nexus_game_domain="fallout4"),
+            Mod(name="Custom source", nexus_game_domain=GAME_DOMAIN),
+        ])
+        await db_session.commit()
+
+        known = await load_known_mods(db_session, GAME_DOMAIN)
+
+        assert known == {1: _known(impact="low", vram=0)}